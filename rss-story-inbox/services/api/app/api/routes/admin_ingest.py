@@ -1,26 +1,37 @@
+import asyncio
+import json
+import logging
 from datetime import date, datetime, time, timedelta, timezone
-from threading import Lock, Thread
-from uuid import UUID, uuid4
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, model_validator
-from sqlalchemy import text
+from sqlalchemy import make_url
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.db import SessionLocal, engine, get_db
-from app.models.article import Article
+from app.core.db import SessionLocal, get_db
 from app.models.ingestion_job import IngestionJob
 from app.models.user_preference import UserPreference
-from app.models.profile import Profile
-from app.services.cluster.clusterer import cluster_recent
-from app.services.ingest.fetch_rss import fetch_feed
-from app.services.rank.scorer import score_clusters
-from app.services.sources_state import get_active_sources_snapshot
-from app.services.filtering.terms import parse_terms, should_keep_article
+from app.services.ingest.jobs import active_ingestion_job, enqueue_ingestion_job
+from app.services.ingest.pipeline import (
+    INGESTION_PHASES,
+    PHASE_1_MAX_PROGRESS,
+    PHASE_2_MAX_PROGRESS,
+    PHASE_3_MAX_PROGRESS,
+    PHASE_4_MAX_PROGRESS,
+)
+from app.services.ingest.phase_metrics import recent_phase_metrics
+from app.services.ingest.poll_schedule import as_utc
+from app.services.ingest.progress_events import IngestionEventBroadcaster
 
 router = APIRouter(tags=["admin"])
+logger = logging.getLogger("uvicorn.error")
+
+EVENT_KEEPALIVE_SECONDS = 15.0
 
 
 class IngestionJobStatus(BaseModel):
@@ -33,6 +44,21 @@ class IngestionJobStatus(BaseModel):
     progress_percent: float
     eta_seconds: int | None = None
     phase: str = "DISCOVERING_FEEDS"
+    queued: bool = False
+
+
+class IngestionPhaseMetrics(BaseModel):
+    job_id: str
+    phase: str
+    started_at: datetime
+    finished_at: datetime
+    duration_seconds: float
+    unit: str | None = None
+    processed_items: int
+    total_items: int | None = None
+    row_count: int | None = None
+    items_per_second: float | None = None
+    rows_per_second: float | None = None
 
 
 class IngestionJobStartResponse(BaseModel):
@@ -51,6 +77,8 @@ class IngestRequest(BaseModel):
     cluster_similarity_threshold: float | None = Field(default=None, ge=0.0, le=1.0)
     start_date: date | None = None
     end_date: date | None = None
+    # Scheduled polls fetch only sources whose adaptive polling schedule is due.
+    due_only: bool = False
 
     @model_validator(mode="after")
     def validate_date_pair(self):
@@ -59,23 +87,6 @@ class IngestRequest(BaseModel):
         return self
 
 
-_ingest_lock = Lock()
-ORPHANED_RUNNING_JOB_TIMEOUT_SECONDS = 180
-INGESTION_ADVISORY_LOCK_KEY = 98172341
-INGESTION_PHASES = (
-    "DISCOVERING_FEEDS",
-    "IMPORTING_ITEMS",
-    "CLUSTERING",
-    "SCORING",
-    "FINALIZING",
-)
-
-PHASE_1_MAX_PROGRESS = 65
-PHASE_2_MAX_PROGRESS = 90
-PHASE_3_MAX_PROGRESS = 95
-PHASE_4_MAX_PROGRESS = 99
-
-
 def ensure_preferences(db: Session) -> UserPreference:
     default_window_days = max(1, int(settings.cluster_time_window_hours / 24) or 2)
     default_end = datetime.now(timezone.utc)
@@ -156,7 +167,10 @@ def _resolve_window_dates(
 def _derive_phase(job: IngestionJob) -> str:
     if job.status == "COMPLETED":
         return INGESTION_PHASES[-1]
+    if job.phase:
+        return job.phase
 
+    # Jobs from before phases were recorded: infer the phase from the progress bands.
     progress = job.progress_percent or 0
     if progress < PHASE_1_MAX_PROGRESS:
         return "DISCOVERING_FEEDS"
@@ -169,7 +183,18 @@ def _derive_phase(job: IngestionJob) -> str:
     return "FINALIZING"
 
 
+def _is_waiting(job: IngestionJob) -> bool:
+    """Queued, or claimed by a worker that went quiet; the worker loop hands such jobs back."""
+    if job.status != "RUNNING":
+        return False
+    if job.claimed_at is None or job.heartbeat_at is None:
+        return True
+    return as_utc(job.heartbeat_at) < datetime.now(timezone.utc) - timedelta(seconds=settings.ingest_job_stale_seconds)
+
+
 def _as_status(job: IngestionJob) -> IngestionJobStatus:
+    # Status routes only read: recovering stale jobs is the workers' job (see app.worker).
+    waiting = _is_waiting(job)
     return IngestionJobStatus(
         job_id=str(job.id),
         status=job.status,
@@ -178,17 +203,9 @@ def _as_status(job: IngestionJob) -> IngestionJobStatus:
         total_items=job.total_items,
         processed_items=job.processed_items,
         progress_percent=job.progress_percent,
-        eta_seconds=None,
+        eta_seconds=job.eta_seconds if job.status == "RUNNING" and not waiting else None,
         phase=_derive_phase(job),
-    )
-
-
-def _get_running_job(db: Session) -> IngestionJob | None:
-    return (
-        db.query(IngestionJob)
-        .filter(IngestionJob.status == "RUNNING")
-        .order_by(IngestionJob.started_at.desc())
-        .first()
+        queued=waiting,
     )
 
 
@@ -196,301 +213,29 @@ def _get_latest_job(db: Session) -> IngestionJob | None:
     return db.query(IngestionJob).order_by(IngestionJob.started_at.desc()).first()
 
 
-def _is_worker_alive_via_advisory_lock() -> bool:
-    if engine.dialect.name != "postgresql":
-        return False
-
-    with engine.connect() as conn:
-        acquired = conn.execute(
-            text("SELECT pg_try_advisory_lock(:lock_key)"),
-            {"lock_key": INGESTION_ADVISORY_LOCK_KEY},
-        ).scalar()
-
-        if acquired:
-            conn.execute(
-                text("SELECT pg_advisory_unlock(:lock_key)"),
-                {"lock_key": INGESTION_ADVISORY_LOCK_KEY},
-            )
-            return False
-
-        return True
-
-
-def _acquire_worker_advisory_lock():
-    if engine.dialect.name != "postgresql":
-        return None
-
-    conn = engine.connect()
-    acquired = conn.execute(
-        text("SELECT pg_try_advisory_lock(:lock_key)"),
-        {"lock_key": INGESTION_ADVISORY_LOCK_KEY},
-    ).scalar()
-    if not acquired:
-        conn.close()
-        raise RuntimeError("Another ingestion worker already owns the advisory lock")
-
-    return conn
-
-
-def _release_worker_advisory_lock(conn):
-    if conn is None:
-        return
-
-    try:
-        conn.execute(
-            text("SELECT pg_advisory_unlock(:lock_key)"),
-            {"lock_key": INGESTION_ADVISORY_LOCK_KEY},
-        )
-    finally:
-        conn.close()
-
-
-def _touch_job(db: Session, job: IngestionJob):
-    job.updated_at = datetime.now(timezone.utc)
-    db.commit()
-
-
-def _set_phase_progress(
-    db: Session,
-    job: IngestionJob,
-    phase: str,
-    progress_percent: int,
-    processed_items: int = 0,
-    total_items: int | None = None,
-    commit: bool = True,
-):
-    job.processed_items = max(0, processed_items)
-    if total_items is not None:
-        job.total_items = max(0, total_items)
-    job.progress_percent = max(0, min(100, progress_percent))
-    job.updated_at = datetime.now(timezone.utc)
-    if commit:
-        db.commit()
-
-
-def _phase_1_progress(discovered_feed_count: int, total_sources: int) -> int:
-    if total_sources <= 0:
-        return PHASE_1_MAX_PROGRESS
-    ratio = max(0.0, min(1.0, discovered_feed_count / total_sources))
-    return int(round(ratio * PHASE_1_MAX_PROGRESS))
-
-
-def _phase_2_progress(processed_items: int, total_items: int) -> int:
-    if total_items <= 0:
-        return PHASE_2_MAX_PROGRESS
-    ratio = max(0.0, min(1.0, processed_items / total_items))
-    return int(round(PHASE_1_MAX_PROGRESS + ratio * (PHASE_2_MAX_PROGRESS - PHASE_1_MAX_PROGRESS)))
-
-
-def _count_distinct_clusters_for_urls(db: Session, urls: list[str], chunk_size: int = 500) -> int:
-    if not urls:
-        return 0
-
-    cluster_ids: set[int] = set()
-    for i in range(0, len(urls), chunk_size):
-        chunk = urls[i : i + chunk_size]
-        rows = (
-            db.query(Article.cluster_id)
-            .filter(Article.url.in_(chunk), Article.cluster_id.is_not(None))
-            .distinct()
-            .all()
-        )
-        cluster_ids.update(int(cluster_id) for (cluster_id,) in rows if cluster_id is not None)
-
-    return len(cluster_ids)
-
-
-def _recover_orphaned_running_job(db: Session, job: IngestionJob) -> bool:
-    """Mark stale RUNNING jobs as FAILED so ingestion can be restarted.
-
-    Jobs run on daemon threads in-process, so a process restart can strand RUNNING
-    rows forever. If a RUNNING job has not updated for a safety window, treat it as
-    orphaned and fail it.
-    """
-    now = datetime.now(timezone.utc)
-    age_seconds = max(0.0, (now - job.updated_at).total_seconds())
-    if age_seconds <= ORPHANED_RUNNING_JOB_TIMEOUT_SECONDS:
-        return False
-
-    if _is_worker_alive_via_advisory_lock():
-        job.updated_at = now
-        db.commit()
-        return False
-
-    job.status = "FAILED"
-    job.updated_at = now
-    db.commit()
-    return True
-
-
-def _recover_if_stale_running_job(db: Session, job: IngestionJob | None) -> IngestionJob | None:
-    if not job or job.status != "RUNNING":
-        return job
-
-    with _ingest_lock:
-        recovered = _recover_orphaned_running_job(db, job)
-        if recovered:
-            return None
-
-    db.refresh(job)
-    return job
-
-
-def _mark_job_failed(db: Session, job: IngestionJob):
-    db.refresh(job)
-    job.status = "FAILED"
-    job.updated_at = datetime.now(timezone.utc)
-    db.commit()
-
-
-def _mark_job_complete(db: Session, job: IngestionJob, imported_items_count: int):
-    db.refresh(job)
-    job.total_items = max(0, imported_items_count)
-    job.processed_items = max(0, imported_items_count)
-    job.progress_percent = 100
-    job.status = "COMPLETED"
-    job.updated_at = datetime.now(timezone.utc)
-    db.commit()
-
-
-def run_ingestion_job(job_id: UUID, threshold: float, start_datetime: datetime, end_datetime: datetime):
+def _load_status(job_id: str | None) -> dict | None:
     db = SessionLocal()
-    lock_conn = None
     try:
-        lock_conn = _acquire_worker_advisory_lock()
-        job = db.get(IngestionJob, job_id)
-        if not job:
-            return
-        _set_phase_progress(db, job, phase=INGESTION_PHASES[0], progress_percent=0)
-
-        snapshot = get_active_sources_snapshot(db)
-        sources = snapshot.get("sources", [])
-        total_sources = len(sources)
-
-        profile = db.query(Profile).order_by(Profile.id.asc()).first()
-        include_terms = parse_terms(profile.include_terms if profile else None)
-        include_terms_2 = parse_terms(profile.include_terms_2 if profile else None)
-        exclude_terms = parse_terms(profile.exclude_terms if profile else None)
-
-        discovered_rows: list[dict] = []
-        discovered_feed_count = 0
-        for source in sources:
-            _touch_job(db, job)
-            items = fetch_feed(source["feed_url"])
-            discovered_feed_count += 1
-            _set_phase_progress(
-                db,
-                job,
-                phase=INGESTION_PHASES[0],
-                progress_percent=_phase_1_progress(discovered_feed_count, total_sources),
-                processed_items=discovered_feed_count,
-            )
-            for item in items:
-                url = item.get("url")
-                if not url:
-                    continue
-                title = (item.get("title") or "")[:512]
-                raw_excerpt = item.get("summary") or None
-                keep_article = should_keep_article(
-                    title=title,
-                    excerpt=raw_excerpt,
-                    include_terms=include_terms,
-                    include_terms_2=include_terms_2,
-                    exclude_terms=exclude_terms,
-                )
-
-                discovered_rows.append(
-                    {
-                        "source_id": source["id"],
-                        "url": url,
-                        "title": title,
-                        "raw_excerpt": raw_excerpt,
-                        "published_at": item.get("published_at"),
-                        "status": "INBOX" if keep_article else "REJECTED",
-                    }
-                )
-
-        _set_phase_progress(
-            db,
-            job,
-            phase=INGESTION_PHASES[0],
-            progress_percent=PHASE_1_MAX_PROGRESS,
-            processed_items=discovered_feed_count,
-        )
+        job = db.get(IngestionJob, UUID(job_id)) if job_id else active_ingestion_job(db)
+        return _as_status(job).model_dump() if job else None
+    finally:
+        db.close()
 
-        run_urls = list(dict.fromkeys(str(row["url"]) for row in discovered_rows if row.get("url")))
-        _set_phase_progress(
-            db,
-            job,
-            phase=INGESTION_PHASES[1],
-            progress_percent=PHASE_1_MAX_PROGRESS,
-            total_items=len(discovered_rows),
-        )
-        processed_count = 0
-        for row in discovered_rows:
-            with db.begin_nested():
-                stmt = insert(Article).values(row).on_conflict_do_nothing(index_elements=["url"])
-                db.execute(stmt)
-
-            processed_count += 1
-            _set_phase_progress(
-                db,
-                job,
-                phase=INGESTION_PHASES[1],
-                progress_percent=_phase_2_progress(processed_count, len(discovered_rows)),
-                processed_items=processed_count,
-                total_items=len(discovered_rows),
-                commit=(processed_count % 10 == 0 or processed_count == len(discovered_rows)),
-            )
 
-        _set_phase_progress(
-            db,
-            job,
-            phase=INGESTION_PHASES[1],
-            progress_percent=PHASE_2_MAX_PROGRESS,
-            processed_items=processed_count,
-            total_items=len(discovered_rows),
-        )
+_broadcaster: IngestionEventBroadcaster | None = None
 
-        _set_phase_progress(db, job, phase=INGESTION_PHASES[2], progress_percent=PHASE_2_MAX_PROGRESS)
-        cluster_recent(
-            db,
-            threshold=threshold,
-            start_datetime=start_datetime,
-            end_datetime=end_datetime,
-        )
-        cluster_count = _count_distinct_clusters_for_urls(db, run_urls)
-        _set_phase_progress(
-            db,
-            job,
-            phase=INGESTION_PHASES[2],
-            progress_percent=PHASE_3_MAX_PROGRESS,
-            processed_items=cluster_count,
-        )
 
-        _set_phase_progress(db, job, phase=INGESTION_PHASES[3], progress_percent=PHASE_3_MAX_PROGRESS)
-        score_clusters(db)
-        scored_clusters = _count_distinct_clusters_for_urls(db, run_urls)
-        _set_phase_progress(
-            db,
-            job,
-            phase=INGESTION_PHASES[3],
-            progress_percent=PHASE_4_MAX_PROGRESS,
-            processed_items=scored_clusters,
-        )
+def _event_broadcaster() -> IngestionEventBroadcaster:
+    global _broadcaster
+    if _broadcaster is None:
+        dsn = make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        _broadcaster = IngestionEventBroadcaster(dsn, _load_status)
+        _broadcaster.start()
+    return _broadcaster
 
-        _set_phase_progress(db, job, phase=INGESTION_PHASES[4], progress_percent=PHASE_4_MAX_PROGRESS)
-        db.commit()
 
-        _mark_job_complete(db, job, imported_items_count=processed_count)
-    except Exception:
-        db.rollback()
-        job = db.get(IngestionJob, job_id)
-        if job:
-            _mark_job_failed(db, job)
-    finally:
-        _release_worker_advisory_lock(lock_conn)
-        db.close()
+def _sse(status: dict | None) -> str:
+    return f"data: {json.dumps(status)}\n\n"
 
 
 @router.get("/admin/ingest/settings", response_model=IngestSettings)
@@ -520,46 +265,21 @@ def ingest(payload: IngestRequest | None = None, db: Session = Depends(get_db)):
     prefs.cluster_time_window_days = max(1, (end_date_value - start_date_value).days + 1)
     db.commit()
 
-    with _ingest_lock:
-        running_job = _get_running_job(db)
-        if running_job:
-            recovered = _recover_orphaned_running_job(db, running_job)
-            if not recovered:
-                return IngestionJobStartResponse(job_id=str(running_job.id), status="RUNNING", already_running=True)
-
-        now = datetime.now(timezone.utc)
-        job = IngestionJob(
-            id=uuid4(),
-            status="RUNNING",
-            total_items=0,
-            processed_items=0,
-            progress_percent=0,
-            started_at=now,
-            updated_at=now,
-        )
-        db.add(job)
-        db.commit()
-    try:
-        Thread(
-            target=run_ingestion_job,
-            args=(job.id, threshold, start_datetime, end_datetime),
-            daemon=True,
-        ).start()
-    except Exception as exc:
-        failed_job = db.get(IngestionJob, job.id)
-        if failed_job:
-            failed_job.status = "FAILED"
-            failed_job.updated_at = datetime.now(timezone.utc)
-            db.commit()
-        raise HTTPException(status_code=500, detail="Failed to start ingestion worker") from exc
-
-    return IngestionJobStartResponse(job_id=str(job.id), status="RUNNING", already_running=False)
+    job, created = enqueue_ingestion_job(
+        db,
+        threshold=threshold,
+        start_datetime=start_datetime,
+        end_datetime=end_datetime,
+        # Clustering rebuilds in full by itself when the window's clusters were built at another threshold.
+        incremental_clustering=True,
+        due_only=bool(payload and payload.due_only),
+    )
+    return IngestionJobStartResponse(job_id=str(job.id), status=job.status, already_running=not created)
 
 
 @router.get("/admin/ingest/status/current", response_model=IngestionJobStatus | None)
 def ingest_status_current(db: Session = Depends(get_db)):
-    job = _get_running_job(db)
-    job = _recover_if_stale_running_job(db, job)
+    job = active_ingestion_job(db)
     if not job:
         return None
     return _as_status(job)
@@ -570,17 +290,68 @@ def ingest_status_latest(db: Session = Depends(get_db)):
     job = _get_latest_job(db)
     if not job:
         return None
+    return _as_status(job)
 
-    if job.status == "RUNNING":
-        recovered_job = _recover_if_stale_running_job(db, job)
-        if recovered_job is None:
-            job = _get_latest_job(db)
-            if not job:
-                return None
-        else:
-            job = recovered_job
 
-    return _as_status(job)
+@router.get("/admin/ingest/events")
+async def ingest_events(request: Request, job_id: str | None = None):
+    """Server-sent events carrying an ``IngestionJobStatus`` whenever a job changes.
+
+    The first event is the current status (of ``job_id``, or else of the active job; null
+    when there is none). With ``job_id`` the stream ends after the job finishes, and an
+    unknown job gets a 404.
+    """
+    if job_id is not None:
+        try:
+            job_id = str(UUID(job_id))
+        except ValueError as exc:
+            raise HTTPException(status_code=404, detail="Ingestion job not found") from exc
+
+    broadcaster = _event_broadcaster()
+    # Subscribe before the first load so no change between the two is missed.
+    queue = broadcaster.subscribe()
+    try:
+        status = await run_in_threadpool(_load_status, job_id)
+        if job_id and status is None:
+            raise HTTPException(status_code=404, detail="Ingestion job not found")
+    except BaseException:
+        broadcaster.unsubscribe(queue)
+        raise
+
+    async def stream(status: dict | None):
+        try:
+            yield _sse(status)
+            while not (job_id and status and status["status"] != "RUNNING"):
+                try:
+                    status = await asyncio.wait_for(queue.get(), timeout=EVENT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                if job_id and status["job_id"] != job_id:
+                    continue
+                yield _sse(status)
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(status),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/admin/ingest/phases", response_model=list[IngestionPhaseMetrics])
+def ingest_phases(job_id: str | None = None, runs: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    """Duration and throughput of each phase of one job, or of the last ``runs`` jobs."""
+    parsed_id = None
+    if job_id is not None:
+        try:
+            parsed_id = UUID(job_id)
+        except ValueError as exc:
+            raise HTTPException(status_code=404, detail="Ingestion job not found") from exc
+    return recent_phase_metrics(db, job_id=parsed_id, runs=runs)
 
 
 @router.get("/admin/ingest/status/{job_id}", response_model=IngestionJobStatus)
@@ -593,27 +364,12 @@ def ingest_status(job_id: str, db: Session = Depends(get_db)):
     job = db.get(IngestionJob, parsed_id)
     if not job:
         raise HTTPException(status_code=404, detail="Ingestion job not found")
-
-    recovered_job = _recover_if_stale_running_job(db, job)
-    if recovered_job is None:
-        job = db.get(IngestionJob, parsed_id)
-        if not job:
-            raise HTTPException(status_code=404, detail="Ingestion job not found")
-    else:
-        job = recovered_job
-
     return _as_status(job)
 
 
 @router.get("/api/ingestion/status")
 def api_ingestion_status(db: Session = Depends(get_db)):
-    job = db.query(IngestionJob).order_by(IngestionJob.started_at.desc()).first()
-    if job and job.status == "RUNNING":
-        recovered_job = _recover_if_stale_running_job(db, job)
-        if recovered_job is None:
-            job = db.query(IngestionJob).order_by(IngestionJob.started_at.desc()).first()
-        else:
-            job = recovered_job
+    job = _get_latest_job(db)
 
     if not job:
         return {
@@ -625,11 +381,12 @@ def api_ingestion_status(db: Session = Depends(get_db)):
             "phase": INGESTION_PHASES[-1],
         }
 
+    status = _as_status(job)
     return {
-        "status": job.status,
-        "total_items": job.total_items,
-        "processed_items": job.processed_items,
-        "progress_percent": job.progress_percent,
-        "eta_seconds": None,
-        "phase": _derive_phase(job),
+        "status": status.status,
+        "total_items": status.total_items,
+        "processed_items": status.processed_items,
+        "progress_percent": status.progress_percent,
+        "eta_seconds": status.eta_seconds,
+        "phase": status.phase,
     }
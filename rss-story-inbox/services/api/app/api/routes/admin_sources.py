@@ -1,7 +1,7 @@
 import logging
 import uuid
 
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
@@ -9,8 +9,11 @@ from sqlalchemy.orm import Session
 from app.core.db import get_db
 from app.models.article import Article
 from app.models.cluster import Cluster
+from app.models.review_queue import ReviewQueueEntry
 from app.models.source import Source
-from app.schemas.source_admin import BulkDeleteSources
+from app.schemas.source_admin import BulkDeleteSources, SourceHealthOut
+from app.services.ingest.source_health import list_source_health, reset_source_health
+from app.services.review_queue import refresh_review_queue
 from app.services.sources_state import (
     bump_sources_version,
     get_sources_version,
@@ -71,6 +74,13 @@ def delete_sources_bulk(
             version = get_sources_version(db)
             if existing_ids:
                 article_ids_for_sources = select(Article.id).where(Article.source_id.in_(existing_ids))
+                affected_cluster_ids = [
+                    cluster_id
+                    for (cluster_id,) in db.query(Article.cluster_id)
+                    .filter(Article.source_id.in_(existing_ids), Article.cluster_id.is_not(None))
+                    .distinct()
+                    .all()
+                ]
                 db.execute(
                     update(Cluster)
                     .where(Cluster.canonical_article_id.in_(article_ids_for_sources))
@@ -83,6 +93,7 @@ def delete_sources_bulk(
                     .values(cluster_id=None)
                 )
                 db.execute(delete(Article).where(Article.source_id.in_(existing_ids)))
+                refresh_review_queue(db, affected_cluster_ids)
                 result = db.execute(delete(Source).where(Source.id.in_(existing_ids)))
                 deleted_count = result.rowcount or 0
                 if deleted_count:
@@ -130,6 +141,7 @@ def delete_sources_all(db: Session = Depends(get_db)):
     with db.begin():
         db.execute(update(Article).values(cluster_id=None))
         db.execute(update(Cluster).values(canonical_article_id=None))
+        db.execute(delete(ReviewQueueEntry))
         db.execute(delete(Cluster))
         db.execute(delete(Article))
         result = db.execute(delete(Source))
@@ -143,3 +155,17 @@ def delete_sources_all(db: Session = Depends(get_db)):
         publish_sources_changed(db, version)
 
     return {"ok": True, "deleted": deleted_count, "version": version}
+
+
+@router.get("/health", response_model=list[SourceHealthOut])
+def sources_health(db: Session = Depends(get_db)):
+    return list_source_health(db)
+
+
+@router.post("/{source_id}/health/reset")
+def reset_health(source_id: int, db: Session = Depends(get_db)):
+    if not db.get(Source, source_id):
+        raise HTTPException(status_code=404, detail="Source not found")
+    reset_source_health(db, source_id)
+    db.commit()
+    return {"ok": True}
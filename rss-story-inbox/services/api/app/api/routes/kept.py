@@ -1,119 +1,42 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy import desc
+from sqlalchemy import desc, select
 from sqlalchemy.orm import Session
 
 from app.core.db import get_db
 from app.models.article import Article
 from app.models.cluster import Cluster
-from app.models.profile import Profile
-from app.schemas.cluster import ClusterArticle, ClusterOut
-from app.services.filtering.terms import (
-    deserialize_qualifying_terms_snapshot,
-    find_cluster_qualifying_terms,
-    parse_terms,
-)
+from app.schemas.cluster import ClusterOut
+from app.services.cluster.payloads import build_cluster_outs, load_cluster_page
+from app.services.workflow.cluster_status import transition_cluster
 from app.services.workflow.transitions import apply_action, promote_to_shortlist
 
 router = APIRouter(prefix="/kept", tags=["kept"])
 
 
-def _article_payload(a: Article) -> ClusterArticle:
-    return ClusterArticle(
-        id=a.id,
-        title=a.title,
-        url=a.url,
-        source_name=a.source.name if a.source else "Unknown",
-        published_at=a.published_at,
-    )
-
-
-def cluster_out(db: Session, c: Cluster) -> ClusterOut:
-    members = (
-        db.query(Article)
-        .filter(Article.cluster_id == c.id)
-        .order_by(Article.published_at.desc().nullslast())
-        .all()
-    )
-
-    canonical_member = next(
-        (m for m in members if m.id == c.canonical_article_id),
-        members[0] if members else None,
-    )
-
-    coverage_members = members[:15]
-    if canonical_member and all(m.id != canonical_member.id for m in coverage_members):
-        coverage_members = [canonical_member, *coverage_members[:14]]
-
-    coverage = [_article_payload(a) for a in coverage_members]
-    canonical = _article_payload(canonical_member) if canonical_member else (coverage[0] if coverage else None)
-
-    qualifying_terms = deserialize_qualifying_terms_snapshot(c.qualifying_terms_snapshot)
-    if qualifying_terms is None:
-        profile = db.query(Profile).order_by(Profile.id.asc()).first()
-        include_terms = parse_terms(profile.include_terms if profile else None)
-        include_terms_2 = parse_terms(profile.include_terms_2 if profile else None)
-        qualifying_terms = find_cluster_qualifying_terms(
-            [
-                text
-                for m in members
-                for text in (m.title, m.raw_excerpt, m.content_text)
-            ],
-            include_terms,
-            include_terms_2,
-        )
-
-    why = f"Kept story; covered by {c.coverage_count} outlets"
-    return ClusterOut(
-        id=c.id,
-        cluster_title=c.cluster_title,
-        coverage_count=c.coverage_count,
-        latest_published_at=c.latest_published_at,
-        score=c.score,
-        why=why,
-        qualifying_terms=qualifying_terms,
-        canonical=canonical,
-        coverage=coverage,
-    )
+def _why(c: Cluster) -> str:
+    return f"Kept story; covered by {c.coverage_count} outlets"
 
 
 @router.get("", response_model=list[ClusterOut])
 def list_kept(db: Session = Depends(get_db)):
     clusters = (
         db.query(Cluster)
-        .join(Article, Article.cluster_id == Cluster.id)
-        .filter(Article.status == "KEPT")
+        .filter(Cluster.id.in_(select(Article.cluster_id).where(Article.status == "KEPT")))
         .order_by(desc(Cluster.score), desc(Cluster.latest_published_at), desc(Cluster.id))
         .all()
     )
-    seen = set()
-    out = []
-    for c in clusters:
-        if c.id in seen:
-            continue
-        seen.add(c.id)
-        out.append(cluster_out(db, c))
-    return out
+    return build_cluster_outs(load_cluster_page(db, clusters), why=_why, match_confidence=False)
 
 
 @router.post("/cluster/{cluster_id}/promote")
 def promote_cluster(cluster_id: int, db: Session = Depends(get_db)):
-    members = db.query(Article).filter(Article.cluster_id == cluster_id).all()
-    changed = 0
-    for a in members:
-        if a.status == "KEPT":
-            a.status = promote_to_shortlist(a.status)
-            changed += 1
+    changed = transition_cluster(db, cluster_id, "KEPT", promote_to_shortlist("KEPT"))
     db.commit()
-    return {"ok": True, "changed": changed}
+    return {"ok": True, "changed": len(changed)}
 
 
 @router.post("/cluster/{cluster_id}/remove")
 def remove_cluster(cluster_id: int, db: Session = Depends(get_db)):
-    members = db.query(Article).filter(Article.cluster_id == cluster_id).all()
-    changed = 0
-    for a in members:
-        if a.status == "KEPT":
-            a.status = apply_action(a.status, "reject")
-            changed += 1
+    changed = transition_cluster(db, cluster_id, "KEPT", apply_action("KEPT", "reject"))
     db.commit()
-    return {"ok": True, "changed": changed}
+    return {"ok": True, "changed": len(changed)}
@@ -1,17 +1,12 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, select
 from urllib.parse import urlparse
 from app.core.db import get_db
 from app.models.cluster import Cluster
 from app.models.article import Article
-from app.models.profile import Profile
-from app.models.summary import Summary
-from app.services.filtering.terms import (
-    deserialize_qualifying_terms_snapshot,
-    find_cluster_qualifying_terms,
-    parse_terms,
-)
+from app.services.cluster.payloads import load_cluster_page
+from app.services.workflow.cluster_status import transition_cluster
 from app.services.workflow.transitions import remove_from_published
 
 router = APIRouter(prefix="/published", tags=["published"])
@@ -30,45 +25,26 @@ def normalize_http_url(value: str | None) -> str | None:
 def list_published(db: Session = Depends(get_db)):
     clusters = (
         db.query(Cluster)
-        .join(Article, Article.cluster_id == Cluster.id)
-        .filter(Article.status == "PUBLISHED")
+        .filter(Cluster.id.in_(select(Article.cluster_id).where(Article.status == "PUBLISHED")))
         .order_by(desc(Cluster.score), desc(Cluster.latest_published_at))
         .all()
     )
-    seen = set()
+    page = load_cluster_page(db, clusters, with_summaries=True, with_canonical=True)
     out = []
-    profile = db.query(Profile).order_by(Profile.id.asc()).first()
-    include_terms = parse_terms(profile.include_terms if profile else None)
-    include_terms_2 = parse_terms(profile.include_terms_2 if profile else None)
     for c in clusters:
-        if c.id in seen:
-            continue
-        seen.add(c.id)
-        s = db.query(Summary).filter(Summary.cluster_id == c.id).first()
-        published_article = (
-            db.query(Article)
-            .filter(
-                Article.cluster_id == c.id,
-                Article.status == "PUBLISHED",
-                Article.published_at.isnot(None),
-            )
-            .order_by(desc(Article.published_at), desc(Article.id))
-            .first()
+        s = page.summaries.get(c.id)
+        published_article = max(
+            (
+                m
+                for m in page.members.get(c.id, [])
+                if m.status == "PUBLISHED" and m.published_at is not None
+            ),
+            key=lambda m: (m.published_at, m.id),
+            default=None,
         )
-        canonical_url = normalize_http_url(c.canonical_article.url if c.canonical_article else None)
+        canonical_article = page.canonical.get(c.id)
+        canonical_url = normalize_http_url(canonical_article.url if canonical_article else None)
         fallback_url = normalize_http_url(published_article.url if published_article else None)
-        qualifying_terms = deserialize_qualifying_terms_snapshot(c.qualifying_terms_snapshot)
-        if qualifying_terms is None:
-            members = db.query(Article).filter(Article.cluster_id == c.id).all()
-            qualifying_terms = find_cluster_qualifying_terms(
-                [
-                    text
-                    for m in members
-                    for text in (m.title, m.raw_excerpt, m.content_text)
-                ],
-                include_terms,
-                include_terms_2,
-            )
         out.append({
             "cluster_id": c.id,
             "title": c.cluster_title,
@@ -77,18 +53,13 @@ def list_published(db: Session = Depends(get_db)):
             "summary": (s.edited_text or s.draft_text) if s else None,
             "url": canonical_url or fallback_url,
             "score": c.score,
-            "qualifying_terms": qualifying_terms,
+            "qualifying_terms": page.qualifying_terms(c),
         })
     return out
 
 
 @router.post("/cluster/{cluster_id}/remove")
 def remove_cluster(cluster_id: int, db: Session = Depends(get_db)):
-    members = db.query(Article).filter(Article.cluster_id == cluster_id).all()
-    changed = 0
-    for a in members:
-        if a.status == "PUBLISHED":
-            a.status = remove_from_published(a.status)
-            changed += 1
+    changed = transition_cluster(db, cluster_id, "PUBLISHED", remove_from_published("PUBLISHED"))
     db.commit()
-    return {"ok": True, "changed": changed}
+    return {"ok": True, "changed": len(changed)}
@@ -1,20 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
 from app.core.db import get_db
 from app.models.cluster import Cluster
 from app.models.article import Article
-from app.models.profile import Profile
-from app.schemas.common import ActionRequest
-from app.schemas.cluster import ClusterOut, ClusterArticle
+from app.schemas.common import ActionRequest, BulkActionRequest
+from app.schemas.cluster import ClusterOut, ClusterPageOut
+from app.services.workflow.cluster_status import transition_cluster, transition_clusters
 from app.services.workflow.transitions import apply_action
-from app.services.cluster.clusterer import similarity_score
-from app.services.filtering.terms import (
-    deserialize_qualifying_terms_snapshot,
-    find_cluster_qualifying_terms,
-    parse_terms,
-    serialize_qualifying_terms_snapshot,
+from app.services.cluster.payloads import build_cluster_outs, load_cluster_page
+from app.services.filtering.term_hits import snapshot_qualifying_terms
+from app.services.review_queue import (
+    QueueCursor,
+    next_queued_cluster,
+    queued_cluster_count,
+    queued_cluster_page,
+    refresh_review_queue,
 )
 
 router = APIRouter(prefix="/queue", tags=["queue"])
@@ -24,146 +25,101 @@ class UndoRequest(BaseModel):
     article_ids: list[int]
 
 
-def _article_payload(a: Article, canonical_member: Article | None) -> ClusterArticle:
-    confidence = similarity_score(canonical_member.title, a.title) if canonical_member else None
-    return ClusterArticle(
-        id=a.id,
-        title=a.title,
-        url=a.url,
-        source_name=a.source.name if a.source else "Unknown",
-        published_at=a.published_at,
-        match_confidence=confidence,
-    )
-
-
-def cluster_payload(db: Session, c: Cluster) -> ClusterOut:
-    members = (
-        db.query(Article)
-        .filter(Article.cluster_id == c.id)
-        .order_by(Article.published_at.desc().nullslast())
-        .all()
-    )
-
-    canonical_member = next((m for m in members if m.id == c.canonical_article_id), members[0] if members else None)
-
-    coverage_members = members[:15]
-    if canonical_member and all(m.id != canonical_member.id for m in coverage_members):
-        coverage_members = [canonical_member, *coverage_members[:14]]
-
-    coverage = [_article_payload(a, canonical_member) for a in coverage_members]
-
-    canonical = _article_payload(canonical_member, canonical_member) if canonical_member else (coverage[0] if coverage else None)
-
+def _why(c: Cluster) -> str:
     why = f"Covered by {c.coverage_count} outlets"
     if c.latest_published_at:
         why += f"; latest {c.latest_published_at.isoformat()}"
+    return why
 
-    qualifying_terms = deserialize_qualifying_terms_snapshot(c.qualifying_terms_snapshot)
-    if qualifying_terms is None:
-        profile = db.query(Profile).order_by(Profile.id.asc()).first()
-        include_terms = parse_terms(profile.include_terms if profile else None)
-        include_terms_2 = parse_terms(profile.include_terms_2 if profile else None)
-        qualifying_terms = find_cluster_qualifying_terms(
-            [
-                text
-                for m in members
-                for text in (m.title, m.raw_excerpt, m.content_text)
-            ],
-            include_terms,
-            include_terms_2,
-        )
 
-    return ClusterOut(
-        id=c.id,
-        cluster_title=c.cluster_title,
-        coverage_count=c.coverage_count,
-        latest_published_at=c.latest_published_at,
-        score=c.score,
-        why=why,
-        qualifying_terms=qualifying_terms,
-        canonical=canonical,
-        coverage=coverage,
-    )
+def cluster_payload(db: Session, c: Cluster) -> ClusterOut:
+    return build_cluster_outs(load_cluster_page(db, [c]), why=_why)[0]
 
 
 @router.get("/next", response_model=ClusterOut | None)
 def next_cluster(db: Session = Depends(get_db)):
-    c = (
-        db.query(Cluster)
-        .join(Article, Article.cluster_id == Cluster.id)
-        .filter(Article.status == "INBOX")
-        .order_by(desc(Cluster.score), desc(Cluster.latest_published_at))
-        .first()
-    )
+    c = next_queued_cluster(db)
     if not c:
         return None
     return cluster_payload(db, c)
 
 
+@router.get("/page", response_model=ClusterPageOut)
+def queue_page(
+    limit: int = Query(5, ge=1, le=50),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+):
+    after = None
+    if cursor:
+        try:
+            after = QueueCursor.decode(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid queue cursor") from exc
+
+    clusters, next_cursor = queued_cluster_page(db, limit=limit, after=after)
+    return ClusterPageOut(
+        items=build_cluster_outs(load_cluster_page(db, clusters), why=_why),
+        next_cursor=next_cursor.encode() if next_cursor else None,
+    )
+
+
 @router.get("/count")
 def queue_count(db: Session = Depends(get_db)):
-    qualified_cluster_count = (
-        db.query(func.count(func.distinct(Article.cluster_id)))
-        .filter(Article.status == "INBOX")
-        .scalar()
-    ) or 0
-    return {"articles_to_review": qualified_cluster_count}
+    return {"articles_to_review": queued_cluster_count(db)}
+
+
+def _target_status(action: str) -> str:
+    try:
+        return apply_action("INBOX", action)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.post("/cluster/{cluster_id}/action")
 def act_on_cluster(cluster_id: int, payload: ActionRequest, db: Session = Depends(get_db)):
-    cluster = db.query(Cluster).filter(Cluster.id == cluster_id).first()
-    if cluster and not cluster.qualifying_terms_snapshot:
-        members_for_snapshot = db.query(Article).filter(Article.cluster_id == cluster_id).all()
-        profile = db.query(Profile).order_by(Profile.id.asc()).first()
-        include_terms = parse_terms(profile.include_terms if profile else None)
-        include_terms_2 = parse_terms(profile.include_terms_2 if profile else None)
-        cluster.qualifying_terms_snapshot = serialize_qualifying_terms_snapshot(
-            find_cluster_qualifying_terms(
-                [
-                    text
-                    for m in members_for_snapshot
-                    for text in (m.title, m.raw_excerpt, m.content_text)
-                ],
-                include_terms,
-                include_terms_2,
-            )
-        )
-
-    members = db.query(Article).filter(Article.cluster_id == cluster_id).all()
-    affected_article_ids: list[int] = []
-    for a in members:
-        if a.status == "INBOX":
-            a.status = apply_action(a.status, payload.action)
-            affected_article_ids.append(a.id)
+    to_status = _target_status(payload.action)
+    snapshot_qualifying_terms(db, [cluster_id])
+    affected_article_ids = transition_cluster(db, cluster_id, "INBOX", to_status)
+    refresh_review_queue(db, [cluster_id])
     db.commit()
     return {"ok": True, "affected_article_ids": affected_article_ids}
 
 
+@router.post("/clusters/action")
+def act_on_clusters(payload: BulkActionRequest, db: Session = Depends(get_db)):
+    """Apply one action to many clusters in a single transaction.
+
+    ``affected_article_ids`` maps each requested cluster id to the articles it moved, which is
+    what ``/cluster/{cluster_id}/undo`` expects back.
+    """
+    to_status = _target_status(payload.action)
+    if not payload.cluster_ids:
+        raise HTTPException(status_code=400, detail="No cluster ids provided")
+
+    snapshot_qualifying_terms(db, payload.cluster_ids)
+    affected = transition_clusters(db, payload.cluster_ids, "INBOX", to_status)
+    refresh_review_queue(db, affected.keys())
+    db.commit()
+    return {"ok": True, "affected_article_ids": affected}
+
+
 @router.post("/cluster/{cluster_id}/undo")
 def undo_cluster_action(cluster_id: int, payload: UndoRequest, db: Session = Depends(get_db)):
     if not payload.article_ids:
         raise HTTPException(status_code=400, detail="No article ids provided for undo")
 
-    members = (
-        db.query(Article)
-        .filter(
-            Article.cluster_id == cluster_id,
-            Article.id.in_(payload.article_ids),
+    reverted = transition_cluster(db, cluster_id, ("KEPT", "REJECTED"), "INBOX", article_ids=payload.article_ids)
+    if not reverted:
+        has_members = (
+            db.query(Article.id)
+            .filter(Article.cluster_id == cluster_id, Article.id.in_(payload.article_ids))
+            .first()
         )
-        .all()
-    )
-    if not members:
-        raise HTTPException(status_code=404, detail="No matching cluster articles found for undo")
-
-    reverted_count = 0
-    for a in members:
-        if a.status in {"KEPT", "REJECTED"}:
-            a.status = "INBOX"
-            reverted_count += 1
-
-    if reverted_count == 0:
+        if not has_members:
+            raise HTTPException(status_code=404, detail="No matching cluster articles found for undo")
         raise HTTPException(status_code=409, detail="No reversible queue action found for cluster")
 
+    refresh_review_queue(db, [cluster_id])
     db.commit()
-    return {"ok": True, "reverted_items": reverted_count}
+    return {"ok": True, "reverted_items": len(reverted)}
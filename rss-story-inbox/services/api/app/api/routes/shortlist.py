@@ -1,103 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, select
 from app.core.db import get_db
 from app.models.article import Article
 from app.models.cluster import Cluster
 from app.models.summary import Summary
 from app.models.profile import Profile
-from app.schemas.cluster import ClusterOut, ClusterArticle
+from app.schemas.cluster import ClusterOut
+from app.services.cluster.payloads import build_cluster_outs, load_cluster_page
+from app.services.workflow.cluster_status import transition_cluster
 from app.services.workflow.transitions import mark_published, remove_from_shortlist
 from app.services.ingest.extract_content import extract_article_text
 from app.services.ai.summarizer import generate_summary
 from app.core.config import settings
-from app.services.cluster.clusterer import similarity_score
-from app.services.filtering.terms import (
-    deserialize_qualifying_terms_snapshot,
-    find_cluster_qualifying_terms,
-    parse_terms,
-)
+from app.services.filtering.term_hits import assign_term_hits, current_term_matcher
 
 router = APIRouter(prefix="/shortlist", tags=["shortlist"])
 
-def cluster_out(db: Session, c: Cluster) -> ClusterOut:
-    members = (
-        db.query(Article)
-        .filter(Article.cluster_id == c.id)
-        .order_by(Article.published_at.desc().nullslast())
-        .all()
-    )
-    canonical_member = next((m for m in members if m.id == c.canonical_article_id), members[0] if members else None)
-    coverage_members = members[:15]
-    if canonical_member and all(m.id != canonical_member.id for m in coverage_members):
-        coverage_members = [canonical_member, *coverage_members[:14]]
+def _why(c: Cluster) -> str:
+    return "Shortlisted story"
 
-    coverage = [
-        ClusterArticle(
-            id=a.id,
-            title=a.title,
-            url=a.url,
-            source_name=a.source.name if a.source else "Unknown",
-            published_at=a.published_at,
-            match_confidence=similarity_score(canonical_member.title, a.title) if canonical_member else None,
-        )
-        for a in coverage_members
-    ]
-    canonical = (
-        ClusterArticle(
-            id=canonical_member.id,
-            title=canonical_member.title,
-            url=canonical_member.url,
-            source_name=canonical_member.source.name if canonical_member.source else "Unknown",
-            published_at=canonical_member.published_at,
-            match_confidence=1.0,
-        )
-        if canonical_member
-        else (coverage[0] if coverage else None)
-    )
-    qualifying_terms = deserialize_qualifying_terms_snapshot(c.qualifying_terms_snapshot)
-    if qualifying_terms is None:
-        profile = db.query(Profile).order_by(Profile.id.asc()).first()
-        include_terms = parse_terms(profile.include_terms if profile else None)
-        include_terms_2 = parse_terms(profile.include_terms_2 if profile else None)
-        qualifying_terms = find_cluster_qualifying_terms(
-            [
-                text
-                for m in members
-                for text in (m.title, m.raw_excerpt, m.content_text)
-            ],
-            include_terms,
-            include_terms_2,
-        )
-    why = "Shortlisted story"
-    return ClusterOut(
-        id=c.id,
-        cluster_title=c.cluster_title,
-        coverage_count=c.coverage_count,
-        latest_published_at=c.latest_published_at,
-        score=c.score,
-        why=why,
-        qualifying_terms=qualifying_terms,
-        canonical=canonical,
-        coverage=coverage,
-    )
 
 @router.get("", response_model=list[ClusterOut])
 def list_shortlist(db: Session = Depends(get_db)):
     clusters = (
         db.query(Cluster)
-        .join(Article, Article.cluster_id == Cluster.id)
-        .filter(Article.status == "SHORTLIST")
+        .filter(Cluster.id.in_(select(Article.cluster_id).where(Article.status == "SHORTLIST")))
         .order_by(desc(Cluster.score), desc(Cluster.latest_published_at), desc(Cluster.id))
         .all()
     )
-    seen, out = set(), []
-    for c in clusters:
-        if c.id in seen:
-            continue
-        seen.add(c.id)
-        out.append(cluster_out(db, c))
-    return out
+    return build_cluster_outs(load_cluster_page(db, clusters), why=_why, canonical_confidence=1.0)
 
 @router.post("/cluster/{cluster_id}/generate-summary")
 def gen_summary(cluster_id: int, db: Session = Depends(get_db)):
@@ -122,6 +54,7 @@ def gen_summary(cluster_id: int, db: Session = Depends(get_db)):
     if not content:
         content = extract_article_text(canonical.url)
         canonical.content_text = content
+        assign_term_hits(current_term_matcher(db), canonical)
         db.commit()
 
     if not content:
@@ -152,23 +85,13 @@ def gen_summary(cluster_id: int, db: Session = Depends(get_db)):
 
 @router.post("/cluster/{cluster_id}/publish")
 def publish(cluster_id: int, db: Session = Depends(get_db)):
-    members = db.query(Article).filter(Article.cluster_id == cluster_id).all()
-    changed = 0
-    for a in members:
-        if a.status == "SHORTLIST":
-            a.status = mark_published(a.status)
-            changed += 1
+    changed = transition_cluster(db, cluster_id, "SHORTLIST", mark_published("SHORTLIST"))
     db.commit()
-    return {"ok": True, "changed": changed}
+    return {"ok": True, "changed": len(changed)}
 
 
 @router.post("/cluster/{cluster_id}/remove")
 def remove_cluster(cluster_id: int, db: Session = Depends(get_db)):
-    members = db.query(Article).filter(Article.cluster_id == cluster_id).all()
-    changed = 0
-    for a in members:
-        if a.status == "SHORTLIST":
-            a.status = remove_from_shortlist(a.status)
-            changed += 1
+    changed = transition_cluster(db, cluster_id, "SHORTLIST", remove_from_shortlist("SHORTLIST"))
     db.commit()
-    return {"ok": True, "changed": changed}
+    return {"ok": True, "changed": len(changed)}
@@ -5,6 +5,31 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     openai_model: str = "gpt-4o-mini"
     cluster_time_window_hours: int = 48
+    cluster_similarity_workers: int = -1
+
+    slow_query_ms: float = 200.0
+    query_stats_headers: bool = False
+
+    ingest_fetch_concurrency: int = 16
+    ingest_fetch_per_host_limit: int = 2
+    ingest_fetch_timeout_seconds: float = 20.0
+    ingest_parse_processes: int = -1
+
+    ingest_worker_processes: int = 1
+    ingest_worker_poll_seconds: float = 2.0
+    ingest_worker_metrics_port: int = 9100
+    ingest_job_heartbeat_seconds: float = 15.0
+    ingest_job_stale_seconds: int = 120
+    ingest_job_max_attempts: int = 3
+    ingest_progress_flush_seconds: float = 2.0
+
+    ingest_poll_min_interval_minutes: int = 15
+    ingest_poll_max_interval_minutes: int = 24 * 60
+    ingest_poll_target_items: float = 3.0
+
+    ingest_source_backoff_base_minutes: int = 15
+    ingest_source_backoff_max_minutes: int = 24 * 60
+    ingest_source_disable_after_failures: int = 10
 
     default_audience: str = "Busy industry professionals"
     default_tone: str = "Neutral, practical, no hype."
@@ -0,0 +1,68 @@
+"""Prometheus metrics for ingestion, clustering and the API.
+
+The API serves them at ``/metrics``. Fetching, clustering and scoring run in the ingestion
+worker, which serves its own metrics on ``INGEST_WORKER_METRICS_PORT`` (see ``app.worker``).
+Per-source latency is deliberately not a label here: fetch timings are aggregated by outcome,
+and each source's last latency is already on ``/admin/sources/health``.
+"""
+
+from prometheus_client import Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+FEED_FETCH_SECONDS = Histogram(
+    "rss_feed_fetch_seconds",
+    "Time to fetch one feed, by fetch status.",
+    ["status"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30),
+)
+FEED_FETCH_BYTES = Histogram(
+    "rss_feed_fetch_bytes",
+    "Size of feed bodies downloaded.",
+    buckets=(1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000),
+)
+FEED_ITEMS_PARSED = Counter("rss_feed_items_parsed_total", "Feed items parsed from downloaded feeds.")
+ARTICLE_INSERTS = Counter(
+    "rss_article_inserts_total",
+    "Article rows offered for insert, by whether they were new or already stored.",
+    ["result"],
+)
+CLUSTER_COMPARISONS = Counter(
+    "rss_cluster_comparisons_total",
+    "Title similarity comparisons made while clustering, by clustering stage.",
+    ["stage"],
+)
+CLUSTER_SECONDS = Histogram(
+    "rss_cluster_seconds",
+    "Time spent clustering per ingestion run.",
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+SCORE_SECONDS = Histogram(
+    "rss_score_seconds",
+    "Time spent scoring clusters per ingestion run.",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "rss_http_request_seconds",
+    "API request latency, by method, route template and status code.",
+    ["method", "route", "status"],
+)
+
+
+class DatabasePoolCollector(Collector):
+    """Reports the SQLAlchemy connection pool's size and saturation at scrape time."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def collect(self):
+        pool = self.engine.pool
+        for name, help_text, read in (
+            ("rss_db_pool_size", "Connections the pool keeps open.", "size"),
+            ("rss_db_pool_checked_out", "Connections currently checked out of the pool.", "checkedout"),
+            ("rss_db_pool_overflow", "Connections open beyond the pool size.", "overflow"),
+        ):
+            # Only queue pools report these; e.g. SQLite's SingletonThreadPool has a plain ``size`` int.
+            method = getattr(pool, read, None)
+            if callable(method):
+                yield GaugeMetricFamily(name, help_text, value=method())
@@ -0,0 +1,107 @@
+"""Per-request SQL statement counts and DB time, with slow-statement logging.
+
+``install_query_hooks`` times every statement run on an engine. While ``track_queries`` is
+active (``QueryStatsMiddleware`` opens one per request), statements are added to its
+``QueryStats`` and to those of every tracker it is nested in; statements slower than
+``SLOW_QUERY_MS`` are logged with the route that ran them. With ``QUERY_STATS_HEADERS`` on,
+responses carry ``X-Query-Count`` and a ``Server-Timing`` entry for DB time.
+
+Tests use ``max_queries`` to hold code paths to a statement budget:
+
+    with max_queries(3):
+        client.get("/queue/next")
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from sqlalchemy import event
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+_current: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    statements: list[str] = field(default_factory=list)
+    scope: dict | None = None
+    parent: "QueryStats | None" = field(default=None, repr=False)
+
+    @property
+    def route(self) -> str:
+        route = (self.scope or {}).get("route")
+        return getattr(route, "path", None) or (self.scope or {}).get("path", "-")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    tracker = stats
+    while tracker is not None:
+        tracker.count += 1
+        tracker.total_seconds += elapsed
+        tracker.statements.append(statement)
+        tracker = tracker.parent
+    if settings.slow_query_ms > 0 and elapsed * 1000 >= settings.slow_query_ms:
+        logger.warning(
+            "slow query %.1fms on %s: %s",
+            elapsed * 1000,
+            stats.route if stats is not None else "-",
+            " ".join(statement.split())[:1000],
+        )
+
+
+def install_query_hooks(engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries(scope: dict | None = None) -> Iterator[QueryStats]:
+    """Collect the statements run in this context (including threads it hands work to).
+
+    Statements also count towards any tracker already active, so a ``max_queries`` around a
+    test client call sees the statements of the request's own tracker.
+    """
+    stats = QueryStats(scope=scope, parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail with the statements that ran when the block runs more than ``limit`` of them."""
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        listing = "\n".join(f"  {i}. {' '.join(s.split())[:200]}" for i, s in enumerate(stats.statements, 1))
+        raise AssertionError(f"expected at most {limit} queries, ran {stats.count}:\n{listing}")
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        with track_queries(request.scope) as stats:
+            response = await call_next(request)
+        if settings.query_stats_headers:
+            # Streamed bodies may run more statements after this point; those are not counted.
+            response.headers["X-Query-Count"] = str(stats.count)
+            response.headers["Server-Timing"] = f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries"'
+        return response
@@ -1,9 +1,14 @@
 import logging
 import os
+import time
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import health, sources, profile, queue, kept, shortlist, published, summaries, admin_ingest, admin_opml, admin_sources
+from prometheus_client import REGISTRY
+from app.api.routes import health, sources, profile, queue, kept, shortlist, published, summaries, admin_ingest, admin_opml, admin_sources, metrics
+from app.core.db import engine
+from app.core.metrics import HTTP_REQUEST_SECONDS, DatabasePoolCollector
+from app.core.query_stats import QueryStatsMiddleware, install_query_hooks
 
 app = FastAPI(title="RSS Story Inbox (MVP)")
 logger = logging.getLogger("uvicorn.error")
@@ -30,6 +35,25 @@ app.include_router(published.router)
 app.include_router(admin_ingest.router)
 app.include_router(admin_opml.router)
 app.include_router(admin_sources.router)
+app.include_router(metrics.router)
+
+REGISTRY.register(DatabasePoolCollector(engine))
+install_query_hooks(engine)
+app.add_middleware(QueryStatsMiddleware)
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # Label by route template so /queue/clusters/1 and /queue/clusters/2 share a series.
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_REQUEST_SECONDS.labels(request.method, route, str(status_code)).observe(time.perf_counter() - started)
 
 
 @app.on_event("startup")
@@ -13,6 +13,10 @@ from app.models.summary import Summary  # noqa: F401
 from app.models.user_preference import UserPreference  # noqa: F401
 from app.models.sources_state import SourcesVersion, SourcesCache  # noqa: F401
 from app.models.ingestion_job import IngestionJob  # noqa: F401
+from app.models.ingestion_fetch_task import IngestionFetchTask  # noqa: F401
+from app.models.ingestion_job_phase import IngestionJobPhase  # noqa: F401
+from app.models.source_fetch_state import SourceFetchState  # noqa: F401
+from app.models.review_queue import ReviewQueueEntry  # noqa: F401
 
 config = context.config
 if config.config_file_name is not None:
@@ -0,0 +1,25 @@
+"""Add per-source fetch state for conditional feed requests."""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_source_fetch_state"
+down_revision = "0007_explicit_time_window_dates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "source_fetch_state",
+        sa.Column("source_id", sa.Integer, sa.ForeignKey("sources.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("etag", sa.String(length=512), nullable=True),
+        sa.Column("last_modified", sa.String(length=128), nullable=True),
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+        sa.Column("last_fetched_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+
+
+def downgrade():
+    op.drop_table("source_fetch_state")
@@ -0,0 +1,19 @@
+"""Store per-article profile term hits keyed to the profile terms version."""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_article_term_hits"
+down_revision = "0008_source_fetch_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("articles", sa.Column("term_hits", sa.Text(), nullable=True))
+    op.add_column("articles", sa.Column("term_hits_version", sa.String(length=16), nullable=True))
+
+
+def downgrade():
+    op.drop_column("articles", "term_hits_version")
+    op.drop_column("articles", "term_hits")
@@ -0,0 +1,39 @@
+"""Add materialized review queue keyed by cluster."""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010_review_queue"
+down_revision = "0009_article_term_hits"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "review_queue",
+        sa.Column("cluster_id", sa.Integer, sa.ForeignKey("clusters.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("inbox_count", sa.Integer, nullable=False),
+        sa.Column("score", sa.Float, nullable=False, server_default="0"),
+        sa.Column("latest_published_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.execute(
+        "CREATE INDEX ix_review_queue_order "
+        "ON review_queue (score DESC, latest_published_at DESC NULLS LAST, cluster_id DESC)"
+    )
+    op.execute(
+        """
+        INSERT INTO review_queue (cluster_id, inbox_count, score, latest_published_at)
+        SELECT a.cluster_id, count(*), coalesce(c.score, 0), c.latest_published_at
+        FROM articles a
+        JOIN clusters c ON c.id = a.cluster_id
+        WHERE a.status = 'INBOX'
+        GROUP BY a.cluster_id, c.score, c.latest_published_at
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("ix_review_queue_order", table_name="review_queue")
+    op.drop_table("review_queue")
@@ -0,0 +1,42 @@
+"""Turn ingestion_job into a durable queue claimed by worker processes."""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011_ingestion_job_queue"
+down_revision = "0010_review_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("ingestion_job", sa.Column("cluster_similarity_threshold", sa.Float(), nullable=True))
+    op.add_column("ingestion_job", sa.Column("window_start", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("ingestion_job", sa.Column("window_end", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        "ingestion_job",
+        sa.Column("incremental_clustering", sa.Boolean(), nullable=False, server_default=sa.true()),
+    )
+    op.add_column("ingestion_job", sa.Column("claimed_by", sa.String(length=128), nullable=True))
+    op.add_column("ingestion_job", sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("ingestion_job", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("ingestion_job", sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("ingestion_job", sa.Column("error", sa.Text(), nullable=True))
+
+    # Jobs left RUNNING by the old in-process threads have no parameters to resume with.
+    op.execute("UPDATE ingestion_job SET status = 'FAILED' WHERE status = 'RUNNING'")
+
+
+def downgrade():
+    for column in (
+        "error",
+        "attempts",
+        "heartbeat_at",
+        "claimed_at",
+        "claimed_by",
+        "incremental_clustering",
+        "window_end",
+        "window_start",
+        "cluster_similarity_threshold",
+    ):
+        op.drop_column("ingestion_job", column)
@@ -0,0 +1,41 @@
+"""Add per-source fetch tasks so workers can share an ingestion job's fetch phase."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0012_ingestion_fetch_task"
+down_revision = "0011_ingestion_job_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ingestion_fetch_task",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column(
+            "job_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("ingestion_job.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("source_id", sa.Integer, sa.ForeignKey("sources.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("feed_url", sa.String(length=1024), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="PENDING"),
+        sa.Column("claimed_by", sa.String(length=128), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("fetch_status", sa.String(length=20), nullable=True),
+        sa.Column("item_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("inserted_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("existing_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+        sa.UniqueConstraint("job_id", "source_id", name="uq_ingestion_fetch_task_job_source"),
+    )
+    op.create_index("ix_ingestion_fetch_task_job_status", "ingestion_fetch_task", ["job_id", "status"])
+
+
+def downgrade():
+    op.drop_index("ix_ingestion_fetch_task_job_status", table_name="ingestion_fetch_task")
+    op.drop_table("ingestion_fetch_task")
@@ -0,0 +1,28 @@
+"""Add adaptive polling schedule to source_fetch_state and due-only ingestion jobs."""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013_source_poll_schedule"
+down_revision = "0012_ingestion_fetch_task"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("source_fetch_state", sa.Column("publish_rate_per_hour", sa.Float(), nullable=True))
+    op.add_column("source_fetch_state", sa.Column("poll_interval_seconds", sa.Integer(), nullable=True))
+    op.add_column("source_fetch_state", sa.Column("next_due_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_source_fetch_state_next_due_at", "source_fetch_state", ["next_due_at"])
+    op.add_column(
+        "ingestion_job",
+        sa.Column("due_only", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade():
+    op.drop_column("ingestion_job", "due_only")
+    op.drop_index("ix_source_fetch_state_next_due_at", table_name="source_fetch_state")
+    op.drop_column("source_fetch_state", "next_due_at")
+    op.drop_column("source_fetch_state", "poll_interval_seconds")
+    op.drop_column("source_fetch_state", "publish_rate_per_hour")
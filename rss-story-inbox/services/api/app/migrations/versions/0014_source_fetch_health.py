@@ -0,0 +1,35 @@
+"""Track per-source fetch outcomes, backoff and circuit breaking."""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0014_source_fetch_health"
+down_revision = "0013_source_poll_schedule"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    ("last_status", sa.String(length=20)),
+    ("last_http_status", sa.Integer()),
+    ("last_latency_ms", sa.Integer()),
+    ("last_error", sa.String(length=128)),
+    ("last_success_at", sa.DateTime(timezone=True)),
+    ("last_failure_at", sa.DateTime(timezone=True)),
+    ("backoff_until", sa.DateTime(timezone=True)),
+    ("disabled_at", sa.DateTime(timezone=True)),
+)
+
+
+def upgrade():
+    for name, type_ in COLUMNS:
+        op.add_column("source_fetch_state", sa.Column(name, type_, nullable=True))
+    op.add_column(
+        "source_fetch_state",
+        sa.Column("consecutive_failures", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_column("source_fetch_state", "consecutive_failures")
+    for name, _ in reversed(COLUMNS):
+        op.drop_column("source_fetch_state", name)
@@ -0,0 +1,42 @@
+"""Record the phase and ETA of running ingestion jobs and keep per-phase timings of every run."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0015_ingestion_phase_metrics"
+down_revision = "0014_source_fetch_health"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("ingestion_job", sa.Column("phase", sa.String(length=32), nullable=True))
+    op.add_column("ingestion_job", sa.Column("eta_seconds", sa.Integer(), nullable=True))
+    op.create_table(
+        "ingestion_job_phase",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column(
+            "job_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("ingestion_job.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("phase", sa.String(length=32), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("duration_seconds", sa.Float(), nullable=False),
+        sa.Column("processed_items", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("total_items", sa.Integer, nullable=True),
+        sa.Column("row_count", sa.Integer, nullable=True),
+    )
+    op.create_index("ix_ingestion_job_phase_job", "ingestion_job_phase", ["job_id"])
+    op.create_index("ix_ingestion_job_phase_phase_finished", "ingestion_job_phase", ["phase", "finished_at"])
+
+
+def downgrade():
+    op.drop_index("ix_ingestion_job_phase_phase_finished", table_name="ingestion_job_phase")
+    op.drop_index("ix_ingestion_job_phase_job", table_name="ingestion_job_phase")
+    op.drop_table("ingestion_job_phase")
+    op.drop_column("ingestion_job", "eta_seconds")
+    op.drop_column("ingestion_job", "phase")
@@ -0,0 +1,24 @@
+"""Order undated clusters first in the review queue index, as the queue did before it existed."""
+
+from alembic import op
+
+revision = "0016_review_queue_nulls_first"
+down_revision = "0015_ingestion_phase_metrics"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index("ix_review_queue_order", table_name="review_queue")
+    op.execute(
+        "CREATE INDEX ix_review_queue_order "
+        "ON review_queue (score DESC, latest_published_at DESC NULLS FIRST, cluster_id DESC)"
+    )
+
+
+def downgrade():
+    op.drop_index("ix_review_queue_order", table_name="review_queue")
+    op.execute(
+        "CREATE INDEX ix_review_queue_order "
+        "ON review_queue (score DESC, latest_published_at DESC NULLS LAST, cluster_id DESC)"
+    )
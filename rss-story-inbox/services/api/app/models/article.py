@@ -15,6 +15,8 @@ class Article(Base):
 
     raw_excerpt: Mapped[str] = mapped_column(Text, nullable=True)
     content_text: Mapped[str] = mapped_column(Text, nullable=True)
+    term_hits: Mapped[str | None] = mapped_column(Text, nullable=True)
+    term_hits_version: Mapped[str | None] = mapped_column(String(16), nullable=True)
 
     status: Mapped[str] = mapped_column(String(32), default="INBOX", index=True)
     cluster_id: Mapped[int] = mapped_column(ForeignKey("clusters.id"), nullable=True, index=True)
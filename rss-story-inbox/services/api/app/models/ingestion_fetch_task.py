@@ -0,0 +1,36 @@
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class IngestionFetchTask(Base):
+    """Fetch-and-import work for one source within one ingestion job.
+
+    Any worker may claim PENDING tasks; a claimed task is DONE once its items, validators and
+    counts are committed together.
+    """
+
+    __tablename__ = "ingestion_fetch_task"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job_id: Mapped[object] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("ingestion_job.id", ondelete="CASCADE"), nullable=False
+    )
+    source_id: Mapped[int] = mapped_column(ForeignKey("sources.id", ondelete="CASCADE"), nullable=False)
+    feed_url: Mapped[str] = mapped_column(String(1024), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="PENDING")
+    claimed_by: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    heartbeat_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    fetch_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    inserted_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    existing_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[object] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("job_id", "source_id", name="uq_ingestion_fetch_task_job_source"),
+        Index("ix_ingestion_fetch_task_job_status", "job_id", "status"),
+    )
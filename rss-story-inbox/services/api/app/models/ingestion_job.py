@@ -1,4 +1,4 @@
-from sqlalchemy import DateTime, Float, Integer, String, func
+from sqlalchemy import Boolean, DateTime, Float, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -6,6 +6,13 @@ from app.models.base import Base
 
 
 class IngestionJob(Base):
+    """One ingestion run, doubling as its entry in the durable job queue.
+
+    A RUNNING job with no ``claimed_at`` is waiting for a worker; once claimed, the worker
+    bumps ``heartbeat_at`` until it finishes. ``phase`` and ``eta_seconds`` are written with
+    progress; finished phases are recorded in ``ingestion_job_phase``.
+    """
+
     __tablename__ = "ingestion_job"
 
     id: Mapped[object] = mapped_column(UUID(as_uuid=True), primary_key=True)
@@ -13,5 +20,18 @@ class IngestionJob(Base):
     total_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     processed_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     progress_percent: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    phase: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    eta_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
     started_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    cluster_similarity_threshold: Mapped[float | None] = mapped_column(Float, nullable=True)
+    window_start: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    window_end: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    incremental_clustering: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    due_only: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    claimed_by: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    claimed_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -0,0 +1,32 @@
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class IngestionJobPhase(Base):
+    """How long one phase of one ingestion run took and how much it processed.
+
+    Rows are kept for every run, so phase durations and throughput can be compared across
+    runs and used to estimate how long the phases of the next run will take.
+    """
+
+    __tablename__ = "ingestion_job_phase"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job_id: Mapped[object] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("ingestion_job.id", ondelete="CASCADE"), nullable=False
+    )
+    phase: Mapped[str] = mapped_column(String(32), nullable=False)
+    started_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+    finished_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False)
+    duration_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    processed_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_items: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    row_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_ingestion_job_phase_job", "job_id"),
+        Index("ix_ingestion_job_phase_phase_finished", "phase", "finished_at"),
+    )
@@ -0,0 +1,29 @@
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ReviewQueueEntry(Base):
+    """One row per cluster that still has INBOX articles, with its review sort key."""
+
+    __tablename__ = "review_queue"
+
+    cluster_id: Mapped[int] = mapped_column(ForeignKey("clusters.id", ondelete="CASCADE"), primary_key=True)
+    inbox_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    latest_published_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[object] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_review_queue_order",
+            score.desc(),
+            latest_published_at.desc().nullsfirst(),
+            cluster_id.desc(),
+        ),
+    )
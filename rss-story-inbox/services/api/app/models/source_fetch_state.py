@@ -0,0 +1,33 @@
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class SourceFetchState(Base):
+    """Conditional-request validators, adaptive polling schedule and fetch health for one source."""
+
+    __tablename__ = "source_fetch_state"
+
+    source_id: Mapped[int] = mapped_column(ForeignKey("sources.id", ondelete="CASCADE"), primary_key=True)
+    etag: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    last_fetched_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=True)
+    publish_rate_per_hour: Mapped[float | None] = mapped_column(Float, nullable=True)
+    poll_interval_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    next_due_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    last_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    last_http_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    last_success_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_failure_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    consecutive_failures: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    backoff_until: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    disabled_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[object] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
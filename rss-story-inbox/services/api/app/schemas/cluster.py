@@ -22,3 +22,8 @@ class ClusterOut(BaseModel):
     qualifying_terms: List[str] = []
     canonical: Optional[ClusterArticle] = None
     coverage: List[ClusterArticle] = []
+
+
+class ClusterPageOut(BaseModel):
+    items: List[ClusterOut] = []
+    next_cursor: Optional[str] = None
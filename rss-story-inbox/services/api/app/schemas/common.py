@@ -2,3 +2,7 @@ from pydantic import BaseModel
 
 class ActionRequest(BaseModel):
     action: str  # keep | reject | defer
+
+
+class BulkActionRequest(ActionRequest):
+    cluster_ids: list[int]
@@ -1,6 +1,26 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import Union
+from typing import Optional, Union
 
 
 class BulkDeleteSources(BaseModel):
     source_ids: list[Union[int, str]]
+
+
+class SourceHealthOut(BaseModel):
+    source_id: int
+    name: str
+    feed_url: str
+    active: bool
+    health: str  # HEALTHY | FAILING | BACKING_OFF | DISABLED | UNKNOWN
+    last_status: Optional[str] = None
+    last_http_status: Optional[int] = None
+    last_latency_ms: Optional[int] = None
+    last_error: Optional[str] = None
+    last_success_at: Optional[datetime] = None
+    last_failure_at: Optional[datetime] = None
+    consecutive_failures: int = 0
+    backoff_until: Optional[datetime] = None
+    disabled_at: Optional[datetime] = None
+    publish_rate_per_hour: Optional[float] = None
+    next_due_at: Optional[datetime] = None
@@ -0,0 +1,192 @@
+"""Candidate generation for greedy title clustering.
+
+``similarity_score`` is ``max(token_set_ratio, token_sort_ratio)`` over normalized titles. Every
+way that score can reach the threshold implies one of three cheap, indexable conditions, so the
+index only has to return clusters that satisfy at least one of them:
+
+* the query's token set is mostly contained in the cluster's (token_set "sect vs sect+ab"),
+* the cluster's token set is mostly contained in the query's (token_set "sect vs sect+ba"),
+* the two strings are within a small Indel distance (token_sort, and token_set "sect+ab vs
+  sect+ba"), which forces them to share many within-token character bigrams.
+
+The first two are answered with prefix filtering over a token inverted index, the last with a
+count filter over a bigram inverted index. Candidates are a superset of every cluster that can
+score at or above the threshold, so checking them in insertion order gives exactly the same
+assignment as checking every cluster.
+"""
+
+import math
+from collections import Counter
+from itertools import chain
+from typing import Hashable, Iterable
+
+# Extra room added to every bound so float rounding in rapidfuzz can never drop a true match.
+_SLACK = 1
+
+
+class _TitleProfile:
+    __slots__ = ("tokens", "full_len", "set_len", "bigrams", "full_bigram_count", "set_bigram_count")
+
+    def __init__(self, normalized_title: str):
+        tokens = normalized_title.split()
+        token_set = set(tokens)
+        self.tokens = token_set
+        self.full_len = sum(len(t) for t in tokens) + max(0, len(tokens) - 1)
+        self.set_len = sum(len(t) for t in token_set) + max(0, len(token_set) - 1)
+        self.bigrams = Counter(tok[i : i + 2] for tok in tokens for i in range(len(tok) - 1))
+        self.full_bigram_count = sum(self.bigrams.values())
+        self.set_bigram_count = sum(len(t) - 1 for t in token_set)
+
+
+class TitleBlockingIndex:
+    """Inverted index over normalized cluster representatives.
+
+    ``corpus`` is only used to order tokens rarest-first, which keeps the probed prefixes
+    short; correctness does not depend on it.
+    """
+
+    def __init__(self, threshold: float, corpus: Iterable[str] = ()):
+        self.threshold = threshold
+        self._token_freq: Counter = Counter()
+        for title in corpus:
+            profile = _TitleProfile(title)
+            self._token_freq.update(profile.tokens)
+
+        self._keys: list[Hashable] = []
+        self._stats: list[_TitleProfile] = []
+        self._token_postings: dict[str, list[int]] = {}
+        self._prefix_postings: dict[str, list[int]] = {}
+        self._bigram_postings: dict[str, list[int]] = {}
+        self._max_len = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _containment_prefix(self, profile: _TitleProfile) -> list[str]:
+        """Rarest tokens that must intersect the shared tokens for a containment match.
+
+        token_set scores ``sect`` against ``sect + diff`` as ``2*|sect| / (|sect| + set_len)``,
+        so reaching the threshold needs ``|sect| >= t * set_len / (2 - t)``. Weighting each
+        token by ``len + 1``, at most ``allowed_missing`` weight may be absent from ``sect``.
+        """
+        t = self.threshold
+        total_weight = profile.set_len + 1
+        allowed_missing = total_weight - t * profile.set_len / (2 - t) + _SLACK
+
+        prefix: list[str] = []
+        weight = 0
+        for token in sorted(profile.tokens, key=lambda tok: (self._token_freq[tok], tok)):
+            prefix.append(token)
+            weight += len(token) + 1
+            if weight > allowed_missing:
+                break
+        return prefix
+
+    def _max_distance(self, left_len: int, right_len: int) -> int:
+        return math.floor((1 - self.threshold) * (left_len + right_len)) + _SLACK
+
+    def add(self, key: Hashable, normalized_title: str) -> None:
+        seq = len(self._keys)
+        self._keys.append(key)
+        profile = _TitleProfile(normalized_title)
+        self._stats.append(profile)
+
+        for token in profile.tokens:
+            self._token_postings.setdefault(token, []).append(seq)
+        for token in self._containment_prefix(profile):
+            self._prefix_postings.setdefault(token, []).append(seq)
+
+        for bigram, count in profile.bigrams.items():
+            self._bigram_postings.setdefault(bigram, []).extend([seq] * count)
+        self._max_len = max(self._max_len, profile.full_len)
+
+    def candidates(self, normalized_title: str) -> list[Hashable]:
+        """Return keys that may score at or above the threshold, in insertion order."""
+        if self.threshold <= 0:
+            return list(self._keys)
+
+        profile = _TitleProfile(normalized_title)
+        found: set[int] = set()
+
+        if profile.tokens:
+            for token in self._containment_prefix(profile):
+                found.update(self._token_postings.get(token, ()))
+            for token in profile.tokens:
+                found.update(self._prefix_postings.get(token, ()))
+
+        found.update(self._edit_distance_candidates(profile))
+        return [self._keys[seq] for seq in sorted(found)]
+
+    def _edit_distance_candidates(self, profile: _TitleProfile) -> set[int]:
+        """Clusters close enough in Indel distance for token_sort or token_set's diff comparison.
+
+        Aligning two strings at Indel distance ``d`` with ``ux``/``uy`` unmatched characters on
+        each side leaves at least ``W(x) - 2*ux - uy`` of x's within-token bigrams intact in y,
+        where ``ux - uy`` is the length difference. That lower bound is checked against an upper
+        bound on the bigrams the pair actually shares (bigram occurrences in the cluster that
+        the query also contains). Set-form bigrams never exceed full-form ones, so one count
+        serves both comparisons.
+        """
+        shared = Counter(chain.from_iterable(self._bigram_postings.get(b, ()) for b in profile.bigrams))
+
+        fewest = self._fewest_required(profile)
+        if fewest > 0:
+            # Every possible match shares at least one bigram, so only counted clusters qualify.
+            pool = [(seq, count) for seq, count in shared.items() if count >= fewest]
+        else:
+            pool = ((seq, shared.get(seq, 0)) for seq in range(len(self._keys)))
+
+        found: set[int] = set()
+        for seq, shared_count in pool:
+            stats = self._stats[seq]
+            required = math.inf
+            sort_distance = self._max_distance(profile.full_len, stats.full_len)
+            if abs(profile.full_len - stats.full_len) <= sort_distance:
+                required = _required_shared_bigrams(
+                    profile.full_bigram_count,
+                    stats.full_bigram_count,
+                    profile.full_len - stats.full_len,
+                    sort_distance,
+                )
+            set_distance = self._max_distance(profile.set_len, stats.set_len)
+            if abs(profile.set_len - stats.set_len) <= set_distance:
+                required = min(
+                    required,
+                    _required_shared_bigrams(
+                        profile.set_bigram_count,
+                        stats.set_bigram_count,
+                        profile.set_len - stats.set_len,
+                        set_distance,
+                    ),
+                )
+            if shared_count >= required:
+                found.add(seq)
+        return found
+
+    def _fewest_required(self, profile: _TitleProfile) -> float:
+        """Lower bound on the shared bigrams any indexed cluster needs to match ``profile``."""
+        fewest = math.inf
+        for length, bigram_count in (
+            (profile.full_len, profile.full_bigram_count),
+            (profile.set_len, profile.set_bigram_count),
+        ):
+            for other_len in self._comparable_lengths(length):
+                distance = self._max_distance(length, other_len)
+                if abs(length - other_len) <= distance:
+                    fewest = min(fewest, bigram_count - (3 * distance + length - other_len) / 2)
+        return fewest
+
+    def _comparable_lengths(self, length: int) -> range:
+        # |length - other| <= (1 - t) * (length + other) + _SLACK solved for other.
+        t = self.threshold
+        low = math.floor((t * length - _SLACK) / (2 - t))
+        high = math.ceil(((2 - t) * length + _SLACK) / t)
+        return range(max(0, low), min(self._max_len, high) + 1)
+
+
+def _required_shared_bigrams(left_bigrams: int, right_bigrams: int, length_delta: int, max_distance: int) -> float:
+    """Fewest within-token bigrams two strings share when their Indel distance is <= max_distance."""
+    return max(
+        left_bigrams - (3 * max_distance + length_delta) / 2,
+        right_bigrams - (3 * max_distance - length_delta) / 2,
+    )
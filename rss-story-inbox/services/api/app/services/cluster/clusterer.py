@@ -1,8 +1,14 @@
 from datetime import datetime, timedelta, timezone
+import numpy as np
 from rapidfuzz import fuzz
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
+from app.core.metrics import CLUSTER_COMPARISONS
 from app.models.article import Article
 from app.models.cluster import Cluster
+from app.models.summary import Summary
+from app.services.cluster.blocking import TitleBlockingIndex
+from app.services.cluster.similarity import similarity_matrix
 from app.services.ingest.normalize import normalize_title
 
 
@@ -15,73 +21,70 @@ def similarity_score(left: str, right: str) -> float:
     return max(token_set, token_sort) / 100.0
 
 
-def _pick_canonical(members: list[Article]) -> Article:
+def _pick_canonical(members: list[Article], similarities: np.ndarray) -> int:
+    """Return the index of the member most similar on average to the others.
+
+    ``similarities`` is the members' pairwise ``similarity_matrix``. Ties go to the earliest
+    published member.
+    """
     if len(members) == 1:
-        return members[0]
+        return 0
 
     best = None
     best_score = -1.0
-    for candidate in members:
-        others = [m for m in members if m.id != candidate.id]
-        if not others:
-            avg = 1.0
-        else:
-            avg = sum(similarity_score(candidate.title, o.title) for o in others) / len(others)
+    for i, candidate in enumerate(members):
+        row = similarities[i].tolist()
+        # Summed in member order, as the pairwise loop did, so ties break the same way.
+        avg = sum(row[:i] + row[i + 1 :]) / (len(members) - 1)
 
         tie_break_time = candidate.published_at or datetime.max.replace(tzinfo=timezone.utc)
         if avg > best_score:
-            best = candidate
+            best = i
             best_score = avg
         elif avg == best_score and best is not None:
-            best_time = best.published_at or datetime.max.replace(tzinfo=timezone.utc)
+            best_time = members[best].published_at or datetime.max.replace(tzinfo=timezone.utc)
             if tie_break_time < best_time:
-                best = candidate
+                best = i
 
-    return best or members[0]
+    return best if best is not None else 0
 
 
-def cluster_recent(
+def _place_articles(
     db: Session,
-    threshold: float = 0.88,
-    start_datetime: datetime | None = None,
-    end_datetime: datetime | None = None,
-) -> None:
-    if start_datetime is None or end_datetime is None:
-        end_datetime = datetime.now(timezone.utc)
-        start_datetime = end_datetime - timedelta(days=2)
-
-    if start_datetime.tzinfo is None:
-        start_datetime = start_datetime.replace(tzinfo=timezone.utc)
-    if end_datetime.tzinfo is None:
-        end_datetime = end_datetime.replace(tzinfo=timezone.utc)
-
-    articles = (
-        db.query(Article)
-        .filter(Article.published_at.isnot(None))
-        .filter(Article.published_at >= start_datetime)
-        .filter(Article.published_at <= end_datetime)
-        .order_by(Article.published_at.desc())
-        .all()
-    )
+    articles: list[Article],
+    clusters: list[tuple[int, str]],
+    member_sources: dict[int, set[int]],
+    threshold: float,
+    start_datetime: datetime,
+    end_datetime: datetime,
+) -> dict[int, list[Article]]:
+    """Greedily assign each article to the first compatible cluster, creating clusters as needed.
 
-    for a in articles:
-        a.cluster_id = None
-    db.flush()
+    ``clusters`` holds (cluster_id, normalized representative title) in placement order and is
+    extended with any clusters created here. Returns the newly placed articles per cluster.
 
-    existing_clusters: list[tuple[int, str]] = []
-    cluster_members: dict[int, list[Article]] = {}
+    Only clusters returned by the blocking index are scored, in one batch per article; the
+    index never drops a cluster that could reach ``threshold``, so taking the first match in
+    candidate order matches scanning every cluster in order.
+    """
+    placed: dict[int, list[Article]] = {}
+    normalized = [normalize_title(a.title) for a in articles]
+    representatives = dict(clusters)
+    index = TitleBlockingIndex(threshold, corpus=[*representatives.values(), *normalized])
+    for cid, rep in clusters:
+        index.add(cid, rep)
 
-    for a in articles:
-        tnorm = normalize_title(a.title)
+    comparisons = 0
+    for a, tnorm in zip(articles, normalized):
         assigned = None
 
-        for cid, rep in existing_clusters:
-            members = cluster_members.get(cid, [])
-            if any(m.source_id == a.source_id for m in members):
-                continue
-            if similarity_score(tnorm, rep) >= threshold:
-                assigned = cid
-                break
+        candidates = [cid for cid in index.candidates(tnorm) if a.source_id not in member_sources.get(cid, ())]
+        comparisons += len(candidates)
+        if candidates:
+            scores = similarity_matrix([tnorm], [representatives[cid] for cid in candidates])[0]
+            matches = np.flatnonzero(scores >= threshold)
+            if matches.size:
+                assigned = candidates[matches[0]]
 
         if assigned is None:
             c = Cluster(
@@ -92,22 +95,42 @@ def cluster_recent(
             )
             db.add(c)
             db.flush()
-            existing_clusters.append((c.id, tnorm))
+            clusters.append((c.id, tnorm))
+            representatives[c.id] = tnorm
+            index.add(c.id, tnorm)
             assigned = c.id
 
-        cluster_members.setdefault(assigned, []).append(a)
+        placed.setdefault(assigned, []).append(a)
+        member_sources.setdefault(assigned, set()).add(a.source_id)
         a.cluster_id = assigned
 
-    for cid, members in cluster_members.items():
-        canonical = _pick_canonical(members)
-        scores = [
-            similarity_score(canonical.title, member.title) for member in members if member.id != canonical.id
-        ]
+    CLUSTER_COMPARISONS.labels("placement").inc(comparisons)
+    return placed
+
+
+def _refresh_cluster_stats(
+    db: Session,
+    members_by_cluster: dict[int, list[Article]],
+    threshold: float,
+    start_datetime: datetime,
+    end_datetime: datetime,
+) -> None:
+    if not members_by_cluster:
+        return
+
+    clusters = {c.id: c for c in db.query(Cluster).filter(Cluster.id.in_(list(members_by_cluster))).all()}
+    for cid, members in members_by_cluster.items():
+        normalized = [normalize_title(m.title) for m in members]
+        similarities = similarity_matrix(normalized, normalized)
+        CLUSTER_COMPARISONS.labels("canonical").inc(len(normalized) ** 2)
+        canonical_index = _pick_canonical(members, similarities)
+        canonical = members[canonical_index]
+        scores = [score for i, score in enumerate(similarities[canonical_index].tolist()) if i != canonical_index]
         avg_similarity = sum(scores) / len(scores) if scores else 1.0
 
         sources = {m.source_id for m in members}
         latest = max((m.published_at for m in members if m.published_at), default=None)
-        c = db.query(Cluster).get(cid)
+        c = clusters[cid]
         c.cluster_title = canonical.title
         c.canonical_article_id = canonical.id
         c.created_with_threshold = threshold
@@ -117,4 +140,144 @@ def cluster_recent(
         c.latest_published_at = latest
         c.score = avg_similarity
 
+
+def _delete_orphaned_clusters(db: Session, cluster_ids: set[int]) -> None:
+    """Delete clusters left without members, keeping any that still carry a summary."""
+    if not cluster_ids:
+        return
+
+    db.query(Cluster).filter(
+        Cluster.id.in_(cluster_ids),
+        ~exists().where(Article.cluster_id == Cluster.id),
+        ~exists().where(Summary.cluster_id == Cluster.id),
+    ).delete(synchronize_session=False)
+
+
+def cluster_recent(
+    db: Session,
+    threshold: float = 0.88,
+    start_datetime: datetime | None = None,
+    end_datetime: datetime | None = None,
+    incremental: bool = False,
+) -> set[int]:
+    """Cluster articles published inside the window and return the ids of clusters touched.
+
+    A full run rebuilds every cluster in the window from scratch and deletes the clusters it
+    empties. An incremental run keeps existing assignments and representative titles, places
+    only articles that have no cluster yet, and updates the clusters they join in place. It
+    turns into a full run when any cluster in the window was built at another threshold.
+    """
+    if start_datetime is None or end_datetime is None:
+        end_datetime = datetime.now(timezone.utc)
+        start_datetime = end_datetime - timedelta(days=2)
+
+    if start_datetime.tzinfo is None:
+        start_datetime = start_datetime.replace(tzinfo=timezone.utc)
+    if end_datetime.tzinfo is None:
+        end_datetime = end_datetime.replace(tzinfo=timezone.utc)
+
+    window_query = (
+        db.query(Article)
+        .filter(Article.published_at.isnot(None))
+        .filter(Article.published_at >= start_datetime)
+        .filter(Article.published_at <= end_datetime)
+    )
+
+    if incremental and not _window_built_at_other_threshold(db, window_query, threshold):
+        return _cluster_incremental(db, window_query, threshold, start_datetime, end_datetime)
+
+    articles = window_query.order_by(Article.published_at.desc()).all()
+
+    previous_cluster_ids = {a.cluster_id for a in articles if a.cluster_id is not None}
+    for a in articles:
+        a.cluster_id = None
+    db.flush()
+
+    members_by_cluster = _place_articles(
+        db,
+        articles,
+        clusters=[],
+        member_sources={},
+        threshold=threshold,
+        start_datetime=start_datetime,
+        end_datetime=end_datetime,
+    )
+    _refresh_cluster_stats(db, members_by_cluster, threshold, start_datetime, end_datetime)
+    db.flush()
+    _delete_orphaned_clusters(db, previous_cluster_ids - set(members_by_cluster))
+
+    db.commit()
+    # Previous clusters count as touched: they lost members even when they were not deleted.
+    return set(members_by_cluster) | previous_cluster_ids
+
+
+def _window_built_at_other_threshold(db: Session, window_query, threshold: float) -> bool:
+    window_cluster_ids = window_query.with_entities(Article.cluster_id).filter(Article.cluster_id.isnot(None))
+    return db.query(
+        exists().where(Cluster.id.in_(window_cluster_ids.statement), Cluster.created_with_threshold != threshold)
+    ).scalar()
+
+
+def _cluster_incremental(
+    db: Session,
+    window_query,
+    threshold: float,
+    start_datetime: datetime,
+    end_datetime: datetime,
+) -> set[int]:
+    new_articles = (
+        window_query.filter(Article.cluster_id.is_(None))
+        .order_by(Article.published_at.desc())
+        .all()
+    )
+    if not new_articles:
+        return set()
+
+    window_cluster_ids = (
+        window_query.with_entities(Article.cluster_id)
+        .filter(Article.cluster_id.isnot(None))
+        .distinct()
+        .statement
+    )
+    existing = (
+        db.query(Cluster.id, Cluster.cluster_title)
+        .filter(Cluster.id.in_(window_cluster_ids))
+        .order_by(Cluster.id.asc())
+        .all()
+    )
+    clusters = [(cid, normalize_title(title)) for cid, title in existing]
+
+    member_sources: dict[int, set[int]] = {}
+    if clusters:
+        rows = (
+            db.query(Article.cluster_id, Article.source_id)
+            .filter(Article.cluster_id.in_([cid for cid, _ in clusters]))
+            .all()
+        )
+        for cid, source_id in rows:
+            member_sources.setdefault(cid, set()).add(source_id)
+
+    placed = _place_articles(
+        db,
+        new_articles,
+        clusters=clusters,
+        member_sources=member_sources,
+        threshold=threshold,
+        start_datetime=start_datetime,
+        end_datetime=end_datetime,
+    )
+    db.flush()
+
+    members_by_cluster: dict[int, list[Article]] = {}
+    touched_members = (
+        db.query(Article)
+        .filter(Article.cluster_id.in_(list(placed)))
+        .order_by(Article.published_at.desc().nullslast(), Article.id.asc())
+        .all()
+    )
+    for a in touched_members:
+        members_by_cluster.setdefault(a.cluster_id, []).append(a)
+    _refresh_cluster_stats(db, members_by_cluster, threshold, start_datetime, end_datetime)
+
     db.commit()
+    return set(members_by_cluster)
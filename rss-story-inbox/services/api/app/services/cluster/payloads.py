@@ -0,0 +1,152 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+from app.models.cluster import Cluster
+from app.models.source import Source
+from app.models.summary import Summary
+from app.schemas.cluster import ClusterArticle, ClusterOut
+from app.services.cluster.similarity import similarity_matrix
+from app.services.filtering.matcher import TermMatcher
+from app.services.filtering.term_hits import cluster_qualifying_terms, current_term_matcher
+from app.services.filtering.terms import deserialize_qualifying_terms_snapshot
+from app.services.ingest.normalize import normalize_title
+
+COVERAGE_LIMIT = 15
+
+
+@dataclass
+class ClusterPage:
+    """Everything needed to render a page of clusters, loaded with a fixed number of queries.
+
+    Members are ordered newest first (undated last). ``canonical`` (each cluster's canonical
+    article, member or not) and ``summaries`` (the first summary per cluster) are only filled
+    when requested.
+    """
+
+    clusters: list[Cluster]
+    members: dict[int, list[Article]] = field(default_factory=dict)
+    source_names: dict[int, str] = field(default_factory=dict)
+    canonical: dict[int, Article | None] = field(default_factory=dict)
+    summaries: dict[int, Summary] = field(default_factory=dict)
+    term_matcher: TermMatcher | None = None
+
+    def qualifying_terms(self, c: Cluster) -> list[str]:
+        terms = deserialize_qualifying_terms_snapshot(c.qualifying_terms_snapshot)
+        if terms is None:
+            terms = cluster_qualifying_terms(self.term_matcher, self.members.get(c.id, []))
+        return terms
+
+    def source_name(self, a: Article) -> str:
+        return self.source_names.get(a.source_id, "Unknown")
+
+
+def load_cluster_page(
+    db: Session, clusters: list[Cluster], with_summaries: bool = False, with_canonical: bool = False
+) -> ClusterPage:
+    page = ClusterPage(clusters=clusters)
+    if not clusters:
+        return page
+
+    cluster_ids = [c.id for c in clusters]
+    rows = (
+        db.query(Article)
+        .filter(Article.cluster_id.in_(cluster_ids))
+        .order_by(Article.cluster_id, Article.published_at.desc().nullslast(), Article.id.asc())
+        .all()
+    )
+    for a in rows:
+        page.members.setdefault(a.cluster_id, []).append(a)
+
+    by_id = {a.id: a for a in rows}
+    if with_canonical:
+        missing_canonical = [
+            c.canonical_article_id for c in clusters if c.canonical_article_id and c.canonical_article_id not in by_id
+        ]
+        if missing_canonical:
+            by_id.update({a.id: a for a in db.query(Article).filter(Article.id.in_(missing_canonical)).all()})
+        for c in clusters:
+            page.canonical[c.id] = by_id.get(c.canonical_article_id) if c.canonical_article_id else None
+
+    source_ids = {a.source_id for a in by_id.values()}
+    if source_ids:
+        page.source_names = dict(db.query(Source.id, Source.name).filter(Source.id.in_(source_ids)).all())
+
+    if with_summaries:
+        summaries = db.query(Summary).filter(Summary.cluster_id.in_(cluster_ids)).order_by(Summary.id.asc()).all()
+        for s in summaries:
+            page.summaries.setdefault(s.cluster_id, s)
+
+    page.term_matcher = current_term_matcher(db)
+    return page
+
+
+def build_cluster_outs(
+    page: ClusterPage,
+    why: Callable[[Cluster], str],
+    match_confidence: bool = True,
+    canonical_confidence: float | None = None,
+) -> list[ClusterOut]:
+    """Render every cluster in ``page``.
+
+    The canonical card is the cluster's canonical article when it is a member, otherwise the
+    newest member. With ``match_confidence`` each coverage card carries its title similarity to
+    the canonical one; the canonical card gets ``canonical_confidence`` if given, otherwise its
+    own similarity score.
+    """
+    out: list[ClusterOut] = []
+    for c in page.clusters:
+        members = page.members.get(c.id, [])
+        canonical_member = next(
+            (m for m in members if m.id == c.canonical_article_id),
+            members[0] if members else None,
+        )
+
+        coverage_members = members[:COVERAGE_LIMIT]
+        if canonical_member and all(m.id != canonical_member.id for m in coverage_members):
+            coverage_members = [canonical_member, *coverage_members[: COVERAGE_LIMIT - 1]]
+
+        confidences: list[float | None] = [None] * len(coverage_members)
+        own_confidence = canonical_confidence
+        if match_confidence and canonical_member:
+            scores = similarity_matrix(
+                [normalize_title(canonical_member.title)],
+                [normalize_title(canonical_member.title), *(normalize_title(a.title) for a in coverage_members)],
+            )[0].tolist()
+            if own_confidence is None:
+                own_confidence = scores[0]
+            confidences = scores[1:]
+
+        coverage = [_article_payload(page, a, confidence) for a, confidence in zip(coverage_members, confidences)]
+        if canonical_member:
+            canonical = _article_payload(page, canonical_member, own_confidence if match_confidence else None)
+        else:
+            canonical = coverage[0] if coverage else None
+
+        out.append(
+            ClusterOut(
+                id=c.id,
+                cluster_title=c.cluster_title,
+                coverage_count=c.coverage_count,
+                latest_published_at=c.latest_published_at,
+                score=c.score,
+                why=why(c),
+                qualifying_terms=page.qualifying_terms(c),
+                canonical=canonical,
+                coverage=coverage,
+            )
+        )
+    return out
+
+
+def _article_payload(page: ClusterPage, a: Article, confidence: float | None) -> ClusterArticle:
+    return ClusterArticle(
+        id=a.id,
+        title=a.title,
+        url=a.url,
+        source_name=page.source_name(a),
+        published_at=a.published_at,
+        match_confidence=confidence,
+    )
@@ -0,0 +1,26 @@
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from app.core.config import settings
+
+# Below this many pairs, starting worker threads costs more than the scoring itself.
+PARALLEL_MIN_PAIRS = 4096
+
+
+def similarity_matrix(queries: list[str], choices: list[str], workers: int | None = None) -> np.ndarray:
+    """Score every (query, choice) pair of already-normalized titles as 0.0-1.0.
+
+    Each cell equals ``similarity_score(query, choice)``: the larger of token_set_ratio and
+    token_sort_ratio, computed in float64 so threshold comparisons match the pairwise path.
+    """
+    if not queries or not choices:
+        return np.zeros((len(queries), len(choices)), dtype=np.float64)
+
+    if workers is None:
+        workers = settings.cluster_similarity_workers
+    if len(queries) * len(choices) < PARALLEL_MIN_PAIRS:
+        workers = 1
+
+    token_set = process.cdist(queries, choices, scorer=fuzz.token_set_ratio, dtype=np.float64, workers=workers)
+    token_sort = process.cdist(queries, choices, scorer=fuzz.token_sort_ratio, dtype=np.float64, workers=workers)
+    return np.maximum(token_set, token_sort, out=token_set) / 100.0
@@ -1,3 +1,4 @@
+from app.services.filtering.matcher import TermMatcher, get_term_matcher
 from app.services.filtering.terms import (
     find_matching_terms,
     parse_terms,
@@ -5,4 +6,11 @@ from app.services.filtering.terms import (
     should_keep_article,
 )
 
-__all__ = ["parse_terms", "score_article_relevance", "should_keep_article", "find_matching_terms"]
+__all__ = [
+    "parse_terms",
+    "score_article_relevance",
+    "should_keep_article",
+    "find_matching_terms",
+    "TermMatcher",
+    "get_term_matcher",
+]
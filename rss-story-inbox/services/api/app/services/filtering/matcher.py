@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Mapping
+
+import ahocorasick
+
+TITLE_WEIGHT = 3.0
+SUMMARY_WEIGHT = 2.0
+CONTENT_WEIGHT = 1.0
+
+# Article fields scanned for relevance, with their weights. Keys name the fields in stored hits.
+ARTICLE_FIELDS = (("title", TITLE_WEIGHT), ("excerpt", SUMMARY_WEIGHT), ("content", CONTENT_WEIGHT))
+
+
+def terms_version(include_terms: Iterable[str], include_terms_2: Iterable[str], exclude_terms: Iterable[str]) -> str:
+    """Short stable fingerprint of the three term lists; changes whenever any list changes."""
+    payload = json.dumps([list(include_terms), list(include_terms_2), list(exclude_terms)])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class TermMatcher:
+    """Aho-Corasick automaton over the include, secondary include and exclude term lists.
+
+    Each text is lowercased and scanned once, yielding every configured term it contains;
+    the helpers below then apply the same rules as ``should_keep_article``,
+    ``score_article_relevance`` and ``find_matching_terms`` to that hit set.
+
+    ``field_hits`` records an article's hits as term ids, indexes into ``vocabulary``. Ids are
+    only meaningful together with ``version``, which changes whenever the term lists do.
+    """
+
+    def __init__(self, include_terms: Iterable[str], include_terms_2: Iterable[str], exclude_terms: Iterable[str]):
+        self.include_terms = list(include_terms)
+        self.include_terms_2 = list(include_terms_2)
+        self.exclude_terms = list(exclude_terms)
+        self.version = terms_version(self.include_terms, self.include_terms_2, self.exclude_terms)
+
+        # Qualifying terms are matched stripped and lowercased, keep/score terms as given.
+        self.qualifying_terms_order = list(
+            dict.fromkeys(
+                normalized
+                for normalized in (term.strip().lower() for term in (*self.include_terms, *self.include_terms_2))
+                if normalized
+            )
+        )
+        patterns = {*self.include_terms, *self.include_terms_2, *self.exclude_terms, *self.qualifying_terms_order}
+        self.vocabulary = sorted(patterns)
+        term_ids = {term: term_id for term_id, term in enumerate(self.vocabulary)}
+        self._include_counts = Counter(term_ids[term] for term in (*self.include_terms, *self.include_terms_2))
+        self._exclude_counts = Counter(term_ids[term] for term in self.exclude_terms)
+        self._include_total = len(self.include_terms) + len(self.include_terms_2)
+        self._exclude_total = len(self.exclude_terms)
+        self._qualifying_ids = [(term_ids[term], term) for term in self.qualifying_terms_order]
+        self._term_ids = term_ids
+
+        # "" is a substring of every string, so an empty term always hits.
+        self._always = frozenset(term for term in patterns if not term)
+        self._automaton = None
+        if patterns - self._always:
+            self._automaton = ahocorasick.Automaton()
+            for term in patterns - self._always:
+                self._automaton.add_word(term, term)
+            self._automaton.make_automaton()
+
+    @property
+    def has_terms(self) -> bool:
+        return bool(self.include_terms or self.include_terms_2 or self.exclude_terms)
+
+    def hits(self, lowered_text: str) -> set[str]:
+        """Return every configured term that occurs in ``lowered_text``."""
+        found = set(self._always)
+        if self._automaton is not None and lowered_text:
+            for _, term in self._automaton.iter(lowered_text):
+                found.add(term)
+        return found
+
+    def keep_article(self, title: str | None, excerpt: str | None) -> bool:
+        hits = self.hits(f"{title or ''} {excerpt or ''}".lower())
+
+        include_hit = any(term in hits for term in self.include_terms)
+        include_hit_2 = any(term in hits for term in self.include_terms_2)
+        exclude_hit = any(term in hits for term in self.exclude_terms)
+
+        if self.include_terms and self.include_terms_2:
+            return include_hit and include_hit_2
+        if self.include_terms:
+            return include_hit
+        if self.include_terms_2:
+            return False
+        return not exclude_hit
+
+    def field_hits(self, title: str | None, excerpt: str | None, content: str | None) -> dict[str, list[int]]:
+        """Return sorted term ids hit in each article field, omitting fields without hits."""
+        out: dict[str, list[int]] = {}
+        for (field, _), text in zip(ARTICLE_FIELDS, (title, excerpt, content)):
+            if not text:
+                continue
+            ids = sorted(self._term_ids[term] for term in self.hits(text.lower()))
+            if ids:
+                out[field] = ids
+        return out
+
+    def relevance_from_hits(self, field_hits: Mapping[str, list[int]]) -> float:
+        """Score one article from its ``field_hits``; equals ``article_relevance`` on its text."""
+        include_raw = 0.0
+        exclude_raw = 0.0
+        for field, weight in ARTICLE_FIELDS:
+            ids = field_hits.get(field, ())
+            include_raw += float(sum(weight * self._include_counts[term_id] for term_id in ids))
+            exclude_raw += float(sum(weight * self._exclude_counts[term_id] for term_id in ids))
+
+        max_field_weight = TITLE_WEIGHT + SUMMARY_WEIGHT + CONTENT_WEIGHT
+        include_norm = include_raw / (self._include_total * max_field_weight) if self._include_total else 0.0
+        exclude_norm = exclude_raw / (self._exclude_total * max_field_weight) if self._exclude_total else 0.0
+        return include_norm - exclude_norm
+
+    def article_relevance(self, title: str | None, excerpt: str | None, content: str | None) -> float:
+        return self.relevance_from_hits(self.field_hits(title, excerpt, content))
+
+    def qualifying_terms_from_hits(self, hit_sets: Iterable[Mapping[str, list[int]]]) -> list[str]:
+        """Include terms hit in any field of any of the given articles, in profile order."""
+        found: set[int] = set()
+        for field_hits in hit_sets:
+            for ids in field_hits.values():
+                found.update(ids)
+        return [term for term_id, term in self._qualifying_ids if term_id in found]
+
+    def qualifying_terms(self, texts: list[str | None]) -> list[str]:
+        """Include terms (both lists, normalized and deduplicated) present in any of ``texts``."""
+        if not texts or not self.qualifying_terms_order:
+            return []
+        searchable = " ".join(text for text in texts if text).lower()
+        if not searchable:
+            return []
+        hits = self.hits(searchable)
+        return [term for term in self.qualifying_terms_order if term in hits]
+
+
+@lru_cache(maxsize=16)
+def _cached_matcher(include_terms: tuple[str, ...], include_terms_2: tuple[str, ...], exclude_terms: tuple[str, ...]):
+    return TermMatcher(include_terms, include_terms_2, exclude_terms)
+
+
+def get_term_matcher(
+    include_terms: Iterable[str] = (),
+    include_terms_2: Iterable[str] = (),
+    exclude_terms: Iterable[str] = (),
+) -> TermMatcher:
+    """Return the compiled matcher for these term lists, building it once per distinct profile."""
+    return _cached_matcher(tuple(include_terms), tuple(include_terms_2), tuple(exclude_terms))
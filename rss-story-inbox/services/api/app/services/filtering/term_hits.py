@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+from typing import Iterable
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+from app.models.cluster import Cluster
+from app.models.profile import Profile
+from app.services.filtering.matcher import TermMatcher, get_term_matcher
+from app.services.filtering.terms import parse_terms, serialize_qualifying_terms_snapshot
+
+TERM_HITS_REFRESH_BATCH_SIZE = 500
+
+
+def current_term_matcher(db: Session) -> TermMatcher:
+    profile = db.query(Profile).order_by(Profile.id.asc()).first()
+    return get_term_matcher(
+        parse_terms(profile.include_terms if profile else None),
+        parse_terms(profile.include_terms_2 if profile else None),
+        parse_terms(profile.exclude_terms if profile else None),
+    )
+
+
+def serialize_term_hits(field_hits: dict[str, list[int]]) -> str:
+    return json.dumps(field_hits, separators=(",", ":"))
+
+
+def deserialize_term_hits(raw: str | None) -> dict[str, list[int]] | None:
+    if raw is None:
+        return None
+    try:
+        parsed = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(parsed, dict):
+        return None
+    return {str(field): [int(i) for i in ids] for field, ids in parsed.items() if isinstance(ids, list)}
+
+
+def term_hit_values(matcher: TermMatcher, title: str | None, excerpt: str | None, content: str | None) -> dict:
+    """Column values recording an article's term hits for the matcher's profile version."""
+    return {
+        "term_hits": serialize_term_hits(matcher.field_hits(title, excerpt, content)),
+        "term_hits_version": matcher.version,
+    }
+
+
+def assign_term_hits(matcher: TermMatcher, article: Article) -> None:
+    for key, value in term_hit_values(matcher, article.title, article.raw_excerpt, article.content_text).items():
+        setattr(article, key, value)
+
+
+def article_term_hits(matcher: TermMatcher, article: Article) -> dict[str, list[int]]:
+    """Stored hits when they belong to the matcher's version, otherwise hits computed from text."""
+    if article.term_hits_version == matcher.version:
+        stored = deserialize_term_hits(article.term_hits)
+        if stored is not None:
+            return stored
+    return matcher.field_hits(article.title, article.raw_excerpt, article.content_text)
+
+
+def cluster_qualifying_terms(matcher: TermMatcher, members: Iterable[Article]) -> list[str]:
+    return matcher.qualifying_terms_from_hits(article_term_hits(matcher, m) for m in members)
+
+
+def refresh_stale_term_hits(db: Session, matcher: TermMatcher, cluster_ids: Iterable[int] | None = None) -> int:
+    """Recompute stored hits for clustered articles recorded under another profile version.
+
+    Limited to ``cluster_ids`` when given. Returns the number of articles updated. Does not
+    commit.
+    """
+    query = db.query(Article.id).filter(
+        Article.cluster_id.isnot(None),
+        or_(Article.term_hits_version.is_(None), Article.term_hits_version != matcher.version),
+    )
+    if cluster_ids is not None:
+        query = query.filter(Article.cluster_id.in_(list(cluster_ids)))
+    stale_ids = [article_id for (article_id,) in query.all()]
+
+    for i in range(0, len(stale_ids), TERM_HITS_REFRESH_BATCH_SIZE):
+        batch = stale_ids[i : i + TERM_HITS_REFRESH_BATCH_SIZE]
+        rows = (
+            db.query(Article.id, Article.title, Article.raw_excerpt, Article.content_text)
+            .filter(Article.id.in_(batch))
+            .all()
+        )
+        db.execute(
+            update(Article),
+            [
+                {"id": article_id, **term_hit_values(matcher, title, excerpt, content)}
+                for article_id, title, excerpt, content in rows
+            ],
+        )
+    return len(stale_ids)
+
+
+def snapshot_qualifying_terms(db: Session, cluster_ids: Iterable[int]) -> int:
+    """Record qualifying terms on those of ``cluster_ids`` that have no snapshot yet.
+
+    Loads the clusters, their members and the profile once for the whole batch and writes
+    every snapshot in one bulk UPDATE. Returns the number of clusters snapshotted. Does not
+    commit.
+    """
+    ids = list(dict.fromkeys(cluster_ids))
+    if not ids:
+        return 0
+    pending = [
+        cluster_id
+        for (cluster_id,) in db.query(Cluster.id)
+        .filter(
+            Cluster.id.in_(ids),
+            or_(Cluster.qualifying_terms_snapshot.is_(None), Cluster.qualifying_terms_snapshot == ""),
+        )
+        .all()
+    ]
+    if not pending:
+        return 0
+
+    members: dict[int, list] = {cluster_id: [] for cluster_id in pending}
+    rows = db.query(
+        Article.cluster_id,
+        Article.title,
+        Article.raw_excerpt,
+        Article.content_text,
+        Article.term_hits,
+        Article.term_hits_version,
+    ).filter(Article.cluster_id.in_(pending))
+    for row in rows.all():
+        members[row.cluster_id].append(row)
+
+    matcher = current_term_matcher(db)
+    db.execute(
+        update(Cluster),
+        [
+            {
+                "id": cluster_id,
+                "qualifying_terms_snapshot": serialize_qualifying_terms_snapshot(
+                    cluster_qualifying_terms(matcher, cluster_members)
+                ),
+            }
+            for cluster_id, cluster_members in members.items()
+        ],
+    )
+    return len(pending)
@@ -1,9 +1,7 @@
 from __future__ import annotations
 import json
 
-TITLE_WEIGHT = 3.0
-SUMMARY_WEIGHT = 2.0
-CONTENT_WEIGHT = 1.0
+from app.services.filtering.matcher import CONTENT_WEIGHT, SUMMARY_WEIGHT, TITLE_WEIGHT, get_term_matcher
 
 
 def parse_terms(raw_terms: str | None) -> list[str]:
@@ -17,21 +15,7 @@ def find_matching_terms(texts: list[str | None], terms: list[str]) -> list[str]:
     if not texts or not terms:
         return []
 
-    searchable = " ".join(text for text in texts if text).lower()
-    if not searchable:
-        return []
-
-    seen: set[str] = set()
-    matched: list[str] = []
-    for term in terms:
-        normalized = term.strip().lower()
-        if not normalized or normalized in seen:
-            continue
-        if normalized in searchable:
-            matched.append(normalized)
-            seen.add(normalized)
-
-    return matched
+    return get_term_matcher(terms).qualifying_terms(texts)
 
 
 def find_cluster_qualifying_terms(
@@ -58,14 +42,6 @@ def deserialize_qualifying_terms_snapshot(raw: str | None) -> list[str] | None:
     return [str(item) for item in parsed if isinstance(item, str)]
 
 
-def _weighted_hits(text: str, terms: list[str], weight: float) -> float:
-    if not text or not terms:
-        return 0.0
-
-    lowered = text.lower()
-    return float(sum(weight for term in terms if term in lowered))
-
-
 def score_article_relevance(
     title: str | None,
     excerpt: str | None,
@@ -84,24 +60,8 @@ def score_article_relevance(
     Output is approximately in range [-1.0, 1.0]. Positive means relevant.
     """
 
-    all_include_terms = [*include_terms, *include_terms_2]
-
-    include_raw = (
-        _weighted_hits(title or "", all_include_terms, TITLE_WEIGHT)
-        + _weighted_hits(excerpt or "", all_include_terms, SUMMARY_WEIGHT)
-        + _weighted_hits(content or "", all_include_terms, CONTENT_WEIGHT)
-    )
-    exclude_raw = (
-        _weighted_hits(title or "", exclude_terms, TITLE_WEIGHT)
-        + _weighted_hits(excerpt or "", exclude_terms, SUMMARY_WEIGHT)
-        + _weighted_hits(content or "", exclude_terms, CONTENT_WEIGHT)
-    )
-
-    max_field_weight = TITLE_WEIGHT + SUMMARY_WEIGHT + CONTENT_WEIGHT
-    include_norm = include_raw / (len(all_include_terms) * max_field_weight) if all_include_terms else 0.0
-    exclude_norm = exclude_raw / (len(exclude_terms) * max_field_weight) if exclude_terms else 0.0
-
-    return include_norm - exclude_norm
+    matcher = get_term_matcher(include_terms, include_terms_2, exclude_terms)
+    return matcher.article_relevance(title, excerpt, content)
 
 
 def should_keep_article(
@@ -122,22 +82,5 @@ def should_keep_article(
     - Include matches always override exclude matches.
     """
 
-    searchable = f"{title or ''} {excerpt or ''}".lower()
-
-    include_hit = any(term in searchable for term in include_terms)
-    include_hit_2 = any(term in searchable for term in include_terms_2)
-    exclude_hit = any(term in searchable for term in exclude_terms)
-
-    if include_terms and include_terms_2:
-        return include_hit and include_hit_2
-
-    if include_terms:
-        return include_hit
-
-    if include_terms_2:
-        return False
-
-    if exclude_hit:
-        return False
-
-    return True
+    matcher = get_term_matcher(include_terms, include_terms_2, exclude_terms)
+    return matcher.keep_article(title, excerpt)
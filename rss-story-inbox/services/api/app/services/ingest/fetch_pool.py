@@ -0,0 +1,154 @@
+import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from app.services.ingest.fetch_rss import (
+    DEFAULT_FETCH_TIMEOUT_SECONDS,
+    FETCH_ERROR,
+    FeedFetchResult,
+    fetch_feed_conditional,
+    parse_feed,
+)
+
+logger = logging.getLogger("uvicorn.error")
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_PER_HOST_LIMIT = 2
+
+
+def feed_host(feed_url: str) -> str:
+    return (urlparse(feed_url).hostname or "").lower()
+
+
+def fetch_source(
+    source: dict, timeout: float, client: httpx.Client | None = None, parse: bool = True
+) -> FeedFetchResult:
+    """Conditionally fetch one source using the validators stored under ``source["fetch_state"]``."""
+    state = source.get("fetch_state") or {}
+    return fetch_feed_conditional(
+        source["feed_url"],
+        etag=state.get("etag"),
+        last_modified=state.get("last_modified"),
+        content_hash=state.get("content_hash"),
+        timeout=timeout,
+        client=client,
+        parse=parse,
+    )
+
+
+def fetch_feeds_concurrently(
+    sources: list[dict],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    timeout: float = DEFAULT_FETCH_TIMEOUT_SECONDS,
+    fetch: Callable[..., FeedFetchResult] = fetch_source,
+    parse_pool: Executor | None = None,
+    max_buffered: int | None = None,
+) -> Iterator[Tuple[dict, FeedFetchResult]]:
+    """Fetch every source on a bounded thread pool, yielding (source, result) as each feed finishes.
+
+    At most ``max_concurrency`` requests are in flight overall and at most ``per_host_limit``
+    against any single host. Hosts are served round-robin so one host with many feeds cannot
+    starve the rest. Results are yielded on the calling thread, so callers can keep using a
+    single DB session for progress accounting.
+
+    With a ``parse_pool`` (normally a process pool, see ``parse_pool.feed_parse_pool``) the
+    fetch threads only download: each changed body is handed to the pool for parsing and the
+    thread moves on to the next request, so slow parses never hold a connection slot.
+
+    Downloads only start while fewer than ``max_buffered`` (default ``max_concurrency``)
+    downloaded feeds are waiting to be parsed or taken by the caller, so a slow consumer holds
+    back fetching instead of letting parsed feeds pile up in memory.
+    """
+    if not sources:
+        return
+
+    max_concurrency = max(1, max_concurrency)
+    per_host_limit = max(1, per_host_limit)
+    max_in_progress = max_concurrency + max(1, max_buffered or max_concurrency)
+
+    pending_by_host: dict[str, deque[dict]] = {}
+    for source in sources:
+        pending_by_host.setdefault(feed_host(source["feed_url"]), deque()).append(source)
+    host_order: deque[str] = deque(pending_by_host)
+    in_flight_by_host: dict[str, int] = {host: 0 for host in pending_by_host}
+    in_flight: dict[Future, tuple[str, dict]] = {}
+    parsing: dict[Future, tuple[dict, FeedFetchResult, bytes, str]] = {}
+    fetch_kwargs = {"parse": False} if parse_pool is not None else {}
+
+    with httpx.Client(
+        limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+    ) as client, ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="feed-fetch") as pool:
+
+        def run(source: dict) -> FeedFetchResult:
+            return fetch(source, timeout=timeout, client=client, **fetch_kwargs)
+
+        def submit_ready() -> None:
+            # One pass over the host ring per submission keeps hosts interleaved.
+            while len(in_flight) < max_concurrency and len(in_flight) + len(parsing) < max_in_progress and host_order:
+                submitted = False
+                for _ in range(len(host_order)):
+                    host = host_order[0]
+                    host_order.rotate(-1)
+                    if in_flight_by_host[host] >= per_host_limit:
+                        continue
+                    source = pending_by_host[host].popleft()
+                    if not pending_by_host[host]:
+                        host_order.remove(host)
+                    in_flight_by_host[host] += 1
+                    in_flight[pool.submit(run, source)] = (host, source)
+                    submitted = True
+                    break
+                if not submitted:
+                    return
+
+        submit_ready()
+        while in_flight or parsing:
+            done, _ = wait([*in_flight, *parsing], return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in parsing:
+                    source, result, content, url = parsing.pop(future)
+                    try:
+                        try:
+                            result.items = future.result()
+                        except BrokenProcessPool:
+                            # A parser process died (e.g. OOM-killed) and failed every parse in flight
+                            # with it; the feed itself is fine, so it must not count against the source.
+                            logger.warning("Feed parse pool broke; parsing source_id=%s inline", source.get("id"))
+                            result.items = parse_feed(content, url, result.response_headers)
+                    except Exception as exc:
+                        logger.exception(
+                            "Feed parse failed for source_id=%s url=%s", source.get("id"), source["feed_url"]
+                        )
+                        # An ERROR result keeps the stored validators, so the feed is parsed again next time.
+                        result.status = FETCH_ERROR
+                        result.error = type(exc).__name__
+                    submit_ready()
+                    yield source, result
+                    continue
+
+                host, source = in_flight.pop(future)
+                in_flight_by_host[host] -= 1
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    logger.exception("Feed fetch failed for source_id=%s url=%s", source.get("id"), source["feed_url"])
+                    result = FeedFetchResult(status=FETCH_ERROR, error=type(exc).__name__)
+                submit_ready()
+                if result.content is not None:
+                    content, result.content = result.content, None
+                    url = result.content_url or source["feed_url"]
+                    try:
+                        future = parse_pool.submit(parse_feed, content, url, result.response_headers)
+                        parsing[future] = (source, result, content, url)
+                        continue
+                    except RuntimeError:
+                        # A broken or shut down pool: parse here rather than lose the feed.
+                        logger.exception("Feed parse pool unavailable; parsing source_id=%s inline", source.get("id"))
+                        result.items = parse_feed(content, url, result.response_headers)
+                yield source, result
@@ -1,9 +1,50 @@
+import hashlib
+import time
+from dataclasses import dataclass, field
+
 import feedparser
+import httpx
 from dateutil import parser as dtparser
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Mapping
+
+FEED_USER_AGENT = "RSS-Story-Inbox/1.0"
+DEFAULT_FETCH_TIMEOUT_SECONDS = 20.0
+
+FETCH_OK = "OK"
+FETCH_NOT_MODIFIED = "NOT_MODIFIED"
+FETCH_UNCHANGED = "UNCHANGED"
+FETCH_ERROR = "ERROR"
+
+
+@dataclass
+class FeedFetchResult:
+    """Outcome of one feed request plus the validators to store for the next one.
+
+    ``http_status``, ``error`` (the exception class on failure) and ``elapsed_seconds``
+    describe the request itself and feed per-source health tracking. A changed body fetched
+    with ``parse=False`` is left unparsed in ``content``, with the final URL and response
+    headers ``parse_feed`` needs, so it can be parsed elsewhere.
+    """
+
+    status: str
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    http_status: int | None = None
+    error: str | None = None
+    elapsed_seconds: float | None = None
+    body_bytes: int | None = None
+    content: bytes | None = None
+    content_url: str | None = None
+    response_headers: Dict[str, str] | None = None
+
 
-def fetch_feed(feed_url: str) -> List[Dict[str, Any]]:
-    d = feedparser.parse(feed_url)
+def parse_feed(content: bytes, feed_url: str, response_headers: Mapping[str, str] | None = None) -> List[Dict[str, Any]]:
+    headers = {key.lower(): value for key, value in (response_headers or {}).items()}
+    # feedparser resolves relative links against content-location when parsing raw bytes.
+    headers.setdefault("content-location", feed_url)
+    d = feedparser.parse(content, response_headers=headers)
     items: List[Dict[str, Any]] = []
     for e in getattr(d, "entries", []):
         url = getattr(e, "link", None)
@@ -24,3 +65,78 @@ def fetch_feed(feed_url: str) -> List[Dict[str, Any]]:
 
         items.append({"url": url, "title": title, "summary": summary, "published_at": published})
     return items
+
+
+def fetch_feed_conditional(
+    feed_url: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    content_hash: str | None = None,
+    timeout: float = DEFAULT_FETCH_TIMEOUT_SECONDS,
+    client: httpx.Client | None = None,
+    parse: bool = True,
+) -> FeedFetchResult:
+    """Fetch a feed, skipping the parse on a 304 or when the body hash matches ``content_hash``.
+
+    With ``parse=False`` a changed body is returned unparsed in ``result.content``.
+    """
+    request_headers = {"User-Agent": FEED_USER_AGENT}
+    if etag:
+        request_headers["If-None-Match"] = etag
+    if last_modified:
+        request_headers["If-Modified-Since"] = last_modified
+
+    started = time.perf_counter()
+    try:
+        if client is None:
+            resp = httpx.get(feed_url, timeout=timeout, follow_redirects=True, headers=request_headers)
+        else:
+            resp = client.get(feed_url, timeout=timeout, follow_redirects=True, headers=request_headers)
+        if resp.status_code == 304:
+            return FeedFetchResult(
+                status=FETCH_NOT_MODIFIED,
+                etag=resp.headers.get("etag") or etag,
+                last_modified=resp.headers.get("last-modified") or last_modified,
+                content_hash=content_hash,
+                http_status=resp.status_code,
+                elapsed_seconds=time.perf_counter() - started,
+            )
+        resp.raise_for_status()
+    except httpx.HTTPError as exc:
+        response = exc.response if isinstance(exc, httpx.HTTPStatusError) else None
+        return FeedFetchResult(
+            status=FETCH_ERROR,
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=content_hash,
+            http_status=response.status_code if response is not None else None,
+            error=type(exc).__name__,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+
+    body_hash = hashlib.sha256(resp.content).hexdigest()
+    result = FeedFetchResult(
+        status=FETCH_UNCHANGED if body_hash == content_hash else FETCH_OK,
+        etag=resp.headers.get("etag"),
+        last_modified=resp.headers.get("last-modified"),
+        content_hash=body_hash,
+        http_status=resp.status_code,
+        elapsed_seconds=time.perf_counter() - started,
+        body_bytes=len(resp.content),
+    )
+    if result.status == FETCH_OK:
+        if parse:
+            result.items = parse_feed(resp.content, str(resp.url), resp.headers)
+        else:
+            result.content = resp.content
+            result.content_url = str(resp.url)
+            result.response_headers = dict(resp.headers)
+    return result
+
+
+def fetch_feed(
+    feed_url: str,
+    timeout: float = DEFAULT_FETCH_TIMEOUT_SECONDS,
+    client: httpx.Client | None = None,
+) -> List[Dict[str, Any]]:
+    return fetch_feed_conditional(feed_url, timeout=timeout, client=client).items
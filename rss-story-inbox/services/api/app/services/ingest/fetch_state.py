@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.source_fetch_state import SourceFetchState
+from app.services.ingest.fetch_rss import FETCH_ERROR, FeedFetchResult
+from app.services.ingest.poll_schedule import PollSchedule
+
+
+def load_fetch_states(db: Session, source_ids: list[int]) -> dict[int, dict]:
+    """Return stored conditional-request validators and polling state keyed by source id."""
+    if not source_ids:
+        return {}
+
+    rows = db.query(SourceFetchState).filter(SourceFetchState.source_id.in_(source_ids)).all()
+    return {
+        row.source_id: {
+            "etag": row.etag,
+            "last_modified": row.last_modified,
+            "content_hash": row.content_hash,
+            "last_fetched_at": row.last_fetched_at,
+            "publish_rate_per_hour": row.publish_rate_per_hour,
+            "consecutive_failures": row.consecutive_failures,
+        }
+        for row in rows
+    }
+
+
+def save_fetch_states(db: Session, results: dict[int, FeedFetchResult]) -> None:
+    """Upsert validators for successful fetches. Does not commit.
+
+    Callers should only save validators once the fetched items are persisted; otherwise a
+    failed run would leave validators behind that make the next run skip unseen items.
+    """
+    now = datetime.now(timezone.utc)
+    values = [
+        {
+            "source_id": source_id,
+            "etag": (result.etag or None) and result.etag[:512],
+            "last_modified": (result.last_modified or None) and result.last_modified[:128],
+            "content_hash": result.content_hash,
+            "last_fetched_at": now,
+            "updated_at": now,
+        }
+        for source_id, result in results.items()
+        if result.status != FETCH_ERROR
+    ]
+    if not values:
+        return
+
+    stmt = insert(SourceFetchState).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["source_id"],
+        set_={
+            "etag": stmt.excluded.etag,
+            "last_modified": stmt.excluded.last_modified,
+            "content_hash": stmt.excluded.content_hash,
+            "last_fetched_at": stmt.excluded.last_fetched_at,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
+
+
+def save_poll_schedules(db: Session, schedules: dict[int, PollSchedule]) -> None:
+    """Upsert the next polling schedule per source. Does not commit."""
+    if not schedules:
+        return
+
+    now = datetime.now(timezone.utc)
+    stmt = insert(SourceFetchState).values(
+        [
+            {
+                "source_id": source_id,
+                "publish_rate_per_hour": schedule.publish_rate_per_hour,
+                "poll_interval_seconds": schedule.poll_interval_seconds,
+                "next_due_at": schedule.next_due_at,
+                "updated_at": now,
+            }
+            for source_id, schedule in schedules.items()
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["source_id"],
+        set_={
+            "publish_rate_per_hour": stmt.excluded.publish_rate_per_hour,
+            "poll_interval_seconds": stmt.excluded.poll_interval_seconds,
+            "next_due_at": stmt.excluded.next_due_at,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
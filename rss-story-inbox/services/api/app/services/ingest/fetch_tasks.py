@@ -0,0 +1,267 @@
+"""Per-source fetch tasks, so any number of workers can share an ingestion job's fetch phase.
+
+The job's coordinator creates one task per active source. Workers claim PENDING tasks in
+batches with ``FOR UPDATE SKIP LOCKED``, fetch those feeds, and commit each source's new
+articles, fetch validators and counts together before marking its task DONE. Fetching and
+inserting are idempotent, so a task taken back from a dead worker can simply run again.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterator
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import ARTICLE_INSERTS, FEED_FETCH_BYTES, FEED_FETCH_SECONDS, FEED_ITEMS_PARSED
+from app.models.ingestion_fetch_task import IngestionFetchTask
+from app.models.ingestion_job import IngestionJob
+from app.services.filtering.matcher import TermMatcher
+from app.services.filtering.term_hits import current_term_matcher, term_hit_values
+from app.services.ingest.fetch_pool import fetch_feeds_concurrently
+from app.services.ingest.fetch_rss import FETCH_ERROR, FeedFetchResult
+from app.services.ingest.fetch_state import load_fetch_states, save_fetch_states, save_poll_schedules
+from app.services.ingest.parse_pool import feed_parse_pool
+from app.services.ingest.poll_schedule import due_source_ids, observed_publish_rate, plan_next_poll
+from app.services.ingest.source_health import blocked_source_ids, fetch_outcome_values, save_fetch_outcome
+from app.services.ingest.store import insert_article_batch, iter_batches
+from app.services.sources_state import get_active_sources_snapshot
+
+FETCH_TASK_PENDING = "PENDING"
+FETCH_TASK_CLAIMED = "CLAIMED"
+FETCH_TASK_DONE = "DONE"
+
+
+@dataclass
+class FetchTaskProgress:
+    total: int = 0
+    done: int = 0
+    claimed: int = 0
+    item_count: int = 0
+    inserted_count: int = 0
+    existing_count: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.done >= self.total
+
+
+@dataclass(frozen=True)
+class ClaimedFetchTask:
+    id: int
+    job_id: object
+    source_id: int
+    feed_url: str
+
+
+def create_fetch_tasks(db: Session, job_id, due_only: bool = False) -> int:
+    """Create a task for every active source that the job does not have one for. Commits.
+
+    Sources that are disabled or backing off after failures never get a task; with
+    ``due_only`` only sources whose polling schedule is due do. Returns the
+    job's total number of tasks, so a coordinator resuming a job keeps the tasks finished
+    before it was interrupted.
+    """
+    sources = get_active_sources_snapshot(db).get("sources", [])
+    blocked = blocked_source_ids(db, [source["id"] for source in sources])
+    sources = [source for source in sources if source["id"] not in blocked]
+    if due_only:
+        due = set(due_source_ids(db, [source["id"] for source in sources]))
+        sources = [source for source in sources if source["id"] in due]
+    rows = [
+        {"job_id": job_id, "source_id": source["id"], "feed_url": source["feed_url"], "status": FETCH_TASK_PENDING}
+        for source in sources
+    ]
+    for batch in iter_batches(rows):
+        db.execute(
+            insert(IngestionFetchTask)
+            .values(batch)
+            .on_conflict_do_nothing(constraint="uq_ingestion_fetch_task_job_source")
+        )
+    db.commit()
+    return db.query(func.count(IngestionFetchTask.id)).filter(IngestionFetchTask.job_id == job_id).scalar() or 0
+
+
+def claim_fetch_tasks(db: Session, worker_id: str, limit: int, job_id=None) -> list[ClaimedFetchTask]:
+    """Claim up to ``limit`` pending tasks of running jobs (only ``job_id``'s when given). Commits."""
+    query = (
+        db.query(IngestionFetchTask)
+        .join(IngestionJob, IngestionJob.id == IngestionFetchTask.job_id)
+        .filter(IngestionFetchTask.status == FETCH_TASK_PENDING, IngestionJob.status == "RUNNING")
+    )
+    if job_id is not None:
+        query = query.filter(IngestionFetchTask.job_id == job_id)
+    tasks = (
+        query.order_by(IngestionFetchTask.id.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True, of=IngestionFetchTask)
+        .all()
+    )
+
+    now = datetime.now(timezone.utc)
+    for task in tasks:
+        task.status = FETCH_TASK_CLAIMED
+        task.claimed_by = worker_id
+        task.heartbeat_at = now
+    claimed = [ClaimedFetchTask(id=t.id, job_id=t.job_id, source_id=t.source_id, feed_url=t.feed_url) for t in tasks]
+    db.commit()
+    return claimed
+
+
+def iter_article_rows(term_matcher: TermMatcher, source_id: int, items: list[dict]) -> Iterator[dict]:
+    """Article insert rows for one feed's items, filtered to INBOX or REJECTED by the profile."""
+    for item in items:
+        url = item.get("url")
+        if not url:
+            continue
+        title = (item.get("title") or "")[:512]
+        raw_excerpt = item.get("summary") or None
+        keep_article = term_matcher.keep_article(title, raw_excerpt)
+        yield {
+            "source_id": source_id,
+            "url": url,
+            "title": title,
+            "raw_excerpt": raw_excerpt,
+            "published_at": item.get("published_at"),
+            "status": "INBOX" if keep_article else "REJECTED",
+            **term_hit_values(term_matcher, title, raw_excerpt, None),
+        }
+
+
+def _record_fetch_metrics(result: FeedFetchResult, inserted_count: int, existing_count: int) -> None:
+    if result.elapsed_seconds is not None:
+        FEED_FETCH_SECONDS.labels(result.status).observe(result.elapsed_seconds)
+    if result.body_bytes is not None:
+        FEED_FETCH_BYTES.observe(result.body_bytes)
+    FEED_ITEMS_PARSED.inc(len(result.items))
+    ARTICLE_INSERTS.labels("inserted").inc(inserted_count)
+    ARTICLE_INSERTS.labels("existing").inc(existing_count)
+
+
+def run_fetch_tasks(db: Session, worker_id: str, tasks: list[ClaimedFetchTask]) -> int:
+    """Fetch and import the claimed tasks' feeds, committing each source as it finishes.
+
+    The stages stream into each other: downloads run on the fetch thread pool, parsing on this
+    process's parse pool, and each parsed feed is filtered and inserted in batches on this
+    thread as soon as it arrives. Only a bounded number of feeds wait between stages (see
+    ``fetch_feeds_concurrently``), so memory stays flat however many sources there are, and a
+    source's articles are visible as soon as its feed is done.
+
+    If the batch fails part-way, its unfinished tasks go back to PENDING before the error is
+    re-raised. Returns the number of tasks completed.
+    """
+    if not tasks:
+        return 0
+
+    term_matcher = current_term_matcher(db)
+    fetch_states = load_fetch_states(db, [task.source_id for task in tasks])
+    sources = [
+        {"id": task.source_id, "feed_url": task.feed_url, "fetch_state": fetch_states.get(task.source_id), "task": task}
+        for task in tasks
+    ]
+
+    try:
+        return _import_fetched_sources(db, worker_id, term_matcher, sources)
+    except Exception:
+        # The worker survives this batch, and its heartbeats would keep the unfinished tasks
+        # claimed forever; hand them back so another worker (or a retry) can run them.
+        db.rollback()
+        release_fetch_tasks(db, worker_id, [task.id for task in tasks])
+        raise
+
+
+def _import_fetched_sources(db: Session, worker_id: str, term_matcher: TermMatcher, sources: list[dict]) -> int:
+    completed = 0
+    for source, fetch_result in fetch_feeds_concurrently(
+        sources,
+        max_concurrency=settings.ingest_fetch_concurrency,
+        per_host_limit=settings.ingest_fetch_per_host_limit,
+        timeout=settings.ingest_fetch_timeout_seconds,
+        parse_pool=feed_parse_pool(),
+    ):
+        item_count = 0
+        inserted_count = 0
+        existing_count = 0
+        for batch in iter_batches(iter_article_rows(term_matcher, source["id"], fetch_result.items)):
+            item_count += len(batch)
+            batch_result = insert_article_batch(db, batch)
+            inserted_count += batch_result.inserted_count
+            existing_count += batch_result.existing_count
+        _record_fetch_metrics(fetch_result, inserted_count, existing_count)
+
+        # Validators are stored in the same transaction as the items they cover.
+        save_fetch_states(db, {source["id"]: fetch_result})
+        now = datetime.now(timezone.utc)
+        state = source["fetch_state"] or {}
+        observed_rate = None
+        if fetch_result.status != FETCH_ERROR:
+            observed_rate = observed_publish_rate(fetch_result.items, inserted_count, state.get("last_fetched_at"), now)
+        save_poll_schedules(
+            db, {source["id"]: plan_next_poll(state.get("publish_rate_per_hour"), observed_rate, now)}
+        )
+        save_fetch_outcome(
+            db, source["id"], fetch_outcome_values(fetch_result, state.get("consecutive_failures") or 0, now)
+        )
+        db.execute(
+            update(IngestionFetchTask)
+            .where(IngestionFetchTask.id == source["task"].id, IngestionFetchTask.claimed_by == worker_id)
+            .values(
+                status=FETCH_TASK_DONE,
+                finished_at=now,
+                fetch_status=fetch_result.status,
+                item_count=item_count,
+                inserted_count=inserted_count,
+                existing_count=existing_count,
+            )
+        )
+        db.commit()
+        completed += 1
+    return completed
+
+
+def release_fetch_tasks(db: Session, worker_id: str, task_ids: list[int]) -> None:
+    """Return the given tasks still claimed by ``worker_id`` to PENDING. Commits."""
+    db.execute(
+        update(IngestionFetchTask)
+        .where(
+            IngestionFetchTask.id.in_(task_ids),
+            IngestionFetchTask.status == FETCH_TASK_CLAIMED,
+            IngestionFetchTask.claimed_by == worker_id,
+        )
+        .values(status=FETCH_TASK_PENDING, claimed_by=None, heartbeat_at=None)
+    )
+    db.commit()
+
+
+def work_fetch_tasks(db: Session, worker_id: str, job_id=None) -> int:
+    """Claim one batch of pending tasks (sized to the fetch pool) and run it."""
+    tasks = claim_fetch_tasks(db, worker_id, limit=max(1, settings.ingest_fetch_concurrency), job_id=job_id)
+    return run_fetch_tasks(db, worker_id, tasks)
+
+
+def fetch_task_progress(db: Session, job_id) -> FetchTaskProgress:
+    rows = (
+        db.query(
+            IngestionFetchTask.status,
+            func.count(IngestionFetchTask.id),
+            func.coalesce(func.sum(IngestionFetchTask.item_count), 0),
+            func.coalesce(func.sum(IngestionFetchTask.inserted_count), 0),
+            func.coalesce(func.sum(IngestionFetchTask.existing_count), 0),
+        )
+        .filter(IngestionFetchTask.job_id == job_id)
+        .group_by(IngestionFetchTask.status)
+        .all()
+    )
+    progress = FetchTaskProgress()
+    for status, count, items, inserted, existing in rows:
+        progress.total += count
+        progress.item_count += items
+        progress.inserted_count += inserted
+        progress.existing_count += existing
+        if status == FETCH_TASK_DONE:
+            progress.done += count
+        elif status == FETCH_TASK_CLAIMED:
+            progress.claimed += count
+    return progress
@@ -0,0 +1,183 @@
+"""Durable ingestion job queue stored in the ``ingestion_job`` table.
+
+The API enqueues jobs; worker processes (``python -m app.worker``) claim them with
+``FOR UPDATE SKIP LOCKED`` so each job runs exactly once, and keep them alive with heartbeats.
+A claimed job whose heartbeat goes quiet is handed back to the queue, or failed once it has
+used up its attempts; fetch tasks (see ``fetch_tasks``) held by a quiet worker go back to
+PENDING.
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import exists, text, update
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.models.ingestion_fetch_task import IngestionFetchTask
+from app.models.ingestion_job import IngestionJob
+from app.services.ingest.progress import notify_job_changed
+
+INGESTION_ENQUEUE_LOCK_KEY = 98172342
+
+
+def active_ingestion_job(db: Session) -> IngestionJob | None:
+    """The newest job that is queued or being worked on."""
+    return (
+        db.query(IngestionJob)
+        .filter(IngestionJob.status == "RUNNING")
+        .order_by(IngestionJob.started_at.desc())
+        .first()
+    )
+
+
+def enqueue_ingestion_job(
+    db: Session,
+    threshold: float,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    incremental_clustering: bool,
+    due_only: bool = False,
+) -> tuple[IngestionJob, bool]:
+    """Queue an ingestion run unless one is already active.
+
+    ``due_only`` runs fetch only the sources whose polling schedule is due. A full run is
+    never turned away by a due-only one: a due-only job still waiting for a worker becomes
+    the full run, and one already running gets the full run queued behind it. Returns the
+    job and whether this call queued it. Commits.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Serializes concurrent enqueues across API processes until this transaction ends.
+        db.execute(text("SELECT pg_advisory_xact_lock(:lock_key)"), {"lock_key": INGESTION_ENQUEUE_LOCK_KEY})
+
+    now = datetime.now(timezone.utc)
+    existing = active_ingestion_job(db)
+    if existing and not due_only and existing.due_only:
+        # Lock the row so no worker claims the job while it is being upgraded.
+        db.refresh(existing, with_for_update=True)
+        if existing.claimed_at is None:
+            existing.due_only = False
+            existing.cluster_similarity_threshold = threshold
+            existing.window_start = start_datetime
+            existing.window_end = end_datetime
+            existing.incremental_clustering = incremental_clustering
+            existing.updated_at = now
+            notify_job_changed(db, existing.id)
+            db.commit()
+            return existing, True
+    elif existing:
+        db.commit()
+        return existing, False
+
+    job = IngestionJob(
+        id=uuid4(),
+        status="RUNNING",
+        total_items=0,
+        processed_items=0,
+        progress_percent=0,
+        started_at=now,
+        updated_at=now,
+        cluster_similarity_threshold=threshold,
+        window_start=start_datetime,
+        window_end=end_datetime,
+        incremental_clustering=incremental_clustering,
+        due_only=due_only,
+        attempts=0,
+    )
+    db.add(job)
+    notify_job_changed(db, job.id)
+    db.commit()
+    return job, True
+
+
+def claim_ingestion_job(db: Session, worker_id: str) -> IngestionJob | None:
+    """Claim the oldest active job if it is unclaimed; None otherwise. Commits.
+
+    Jobs run one at a time: one queued behind a running job waits until that job finishes.
+    """
+    older = aliased(IngestionJob)
+    job = (
+        db.query(IngestionJob)
+        .filter(
+            IngestionJob.status == "RUNNING",
+            IngestionJob.claimed_at.is_(None),
+            ~exists().where(older.status == "RUNNING", older.started_at < IngestionJob.started_at),
+        )
+        .order_by(IngestionJob.started_at.asc())
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if not job:
+        db.commit()
+        return None
+
+    now = datetime.now(timezone.utc)
+    job.claimed_by = worker_id
+    job.claimed_at = now
+    job.heartbeat_at = now
+    job.attempts = (job.attempts or 0) + 1
+    job.error = None
+    notify_job_changed(db, job.id)
+    db.commit()
+    return job
+
+
+def heartbeat_worker(db: Session, worker_id: str) -> None:
+    """Record that ``worker_id`` is alive on every job and fetch task it holds. Commits."""
+    now = datetime.now(timezone.utc)
+    db.execute(
+        update(IngestionJob)
+        .where(IngestionJob.status == "RUNNING", IngestionJob.claimed_by == worker_id)
+        .values(heartbeat_at=now)
+    )
+    db.execute(
+        update(IngestionFetchTask)
+        .where(IngestionFetchTask.status == "CLAIMED", IngestionFetchTask.claimed_by == worker_id)
+        .values(heartbeat_at=now)
+    )
+    db.commit()
+
+
+def recover_stale_ingestion_jobs(
+    db: Session,
+    stale_after_seconds: float | None = None,
+    max_attempts: int | None = None,
+) -> int:
+    """Requeue claimed jobs whose worker stopped heartbeating, failing those out of attempts.
+
+    Fetch tasks claimed by a quiet worker return to PENDING. Returns the number of jobs
+    recovered. Commits.
+    """
+    stale_after_seconds = settings.ingest_job_stale_seconds if stale_after_seconds is None else stale_after_seconds
+    max_attempts = settings.ingest_job_max_attempts if max_attempts is None else max_attempts
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=stale_after_seconds)
+
+    db.execute(
+        update(IngestionFetchTask)
+        .where(IngestionFetchTask.status == "CLAIMED", IngestionFetchTask.heartbeat_at < cutoff)
+        .values(status="PENDING", claimed_by=None, heartbeat_at=None)
+    )
+
+    stale_jobs = (
+        db.query(IngestionJob)
+        .filter(
+            IngestionJob.status == "RUNNING",
+            IngestionJob.claimed_at.isnot(None),
+            IngestionJob.heartbeat_at < cutoff,
+        )
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for job in stale_jobs:
+        if (job.attempts or 0) >= max_attempts:
+            job.status = "FAILED"
+            job.error = f"Worker {job.claimed_by} stopped responding"
+        else:
+            job.claimed_by = None
+            job.claimed_at = None
+            job.heartbeat_at = None
+        job.updated_at = now
+        notify_job_changed(db, job.id)
+    db.commit()
+    return len(stale_jobs)
@@ -0,0 +1,47 @@
+"""Process pool that parses downloaded feeds away from the fetch threads.
+
+``feedparser`` and ``dateutil`` are pure Python, so parsing on the fetch threads serializes
+it on the GIL and keeps connection slots busy. Each ingestion worker process keeps one
+pool of ``ingest_parse_processes`` parser processes (-1: one per core, 0: parse on the
+fetch threads instead) for its lifetime. The pool uses the ``spawn`` start method because
+the worker already runs a heartbeat thread and an HTTP connection pool, neither of which
+survives ``fork``.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import settings
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def parse_processes() -> int:
+    processes = settings.ingest_parse_processes
+    return (os.cpu_count() or 1) if processes < 0 else processes
+
+
+def feed_parse_pool() -> ProcessPoolExecutor | None:
+    """This process's parse pool, started on first use; None when parsing stays in-thread."""
+    global _pool
+    processes = parse_processes()
+    if processes <= 0:
+        return None
+    with _pool_lock:
+        # A parser process that died (e.g. OOM-killed) breaks the whole pool; start a new one.
+        if _pool is None or getattr(_pool, "_broken", False):
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_feed_parse_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,114 @@
+"""Per-phase timings of ingestion runs: throughput, history and ETA estimates.
+
+Each phase measures its own unit: the fetch phase counts feeds (and the rows they
+produced), clustering and scoring count the clusters they touched. A running phase with a
+known total extrapolates from its own rate; otherwise, and for every phase still to come,
+the estimate is the median duration of that phase over recent completed runs of the same
+kind (full or due-only).
+
+Items are imported while their feeds are fetched, so ``IMPORTING_ITEMS`` only marks the
+hand-over to clustering for status displays: it is never timed, and the fetch phase's
+``row_count`` carries the import throughput.
+"""
+
+from collections import defaultdict
+from statistics import median
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.ingestion_job import IngestionJob
+from app.models.ingestion_job_phase import IngestionJobPhase
+
+INGESTION_PHASES = (
+    "DISCOVERING_FEEDS",
+    "IMPORTING_ITEMS",
+    "CLUSTERING",
+    "SCORING",
+    "FINALIZING",
+)
+UNTIMED_PHASES = frozenset({"IMPORTING_ITEMS"})
+PHASE_UNITS = {
+    "DISCOVERING_FEEDS": "feeds",
+    "CLUSTERING": "clusters",
+    "SCORING": "clusters",
+    "FINALIZING": None,
+}
+HISTORY_RUNS = 10
+
+
+def historical_phase_seconds(db: Session, due_only: bool = False, runs: int = HISTORY_RUNS) -> dict[str, float]:
+    """Median duration of each phase over the last ``runs`` completed jobs of the same kind."""
+    recent_jobs = (
+        select(IngestionJob.id)
+        .where(IngestionJob.status == "COMPLETED", IngestionJob.due_only == due_only)
+        .order_by(IngestionJob.started_at.desc())
+        .limit(runs)
+    )
+    durations: dict[str, list[float]] = defaultdict(list)
+    for phase, seconds in (
+        db.query(IngestionJobPhase.phase, IngestionJobPhase.duration_seconds)
+        .filter(IngestionJobPhase.job_id.in_(recent_jobs), IngestionJobPhase.phase.notin_(UNTIMED_PHASES))
+        .all()
+    ):
+        durations[phase].append(seconds)
+    return {phase: median(values) for phase, values in durations.items()}
+
+
+def estimate_eta_seconds(
+    phase: str,
+    elapsed_seconds: float,
+    processed_items: int,
+    total_items: int | None,
+    history: dict[str, float],
+) -> int | None:
+    """Seconds until the run finishes; None when the current phase has neither a rate nor history."""
+    if total_items and processed_items >= total_items:
+        remaining = 0.0
+    elif total_items and processed_items > 0 and elapsed_seconds > 0:
+        remaining = (total_items - processed_items) * elapsed_seconds / processed_items
+    elif phase in history:
+        remaining = max(0.0, history[phase] - elapsed_seconds)
+    else:
+        return None
+
+    if phase in INGESTION_PHASES:
+        remaining += sum(history.get(later, 0.0) for later in INGESTION_PHASES[INGESTION_PHASES.index(phase) + 1 :])
+    return int(round(remaining))
+
+
+def _per_second(count: int | None, seconds: float) -> float | None:
+    if count is None or seconds <= 0:
+        return None
+    return count / seconds
+
+
+def recent_phase_metrics(db: Session, job_id=None, runs: int = HISTORY_RUNS) -> list[dict]:
+    """Recorded phases of one job, or of the last ``runs`` jobs, newest run first."""
+    query = (
+        db.query(IngestionJobPhase, IngestionJob.started_at)
+        .join(IngestionJob, IngestionJob.id == IngestionJobPhase.job_id)
+        .filter(IngestionJobPhase.phase.notin_(UNTIMED_PHASES))
+    )
+    if job_id is not None:
+        query = query.filter(IngestionJobPhase.job_id == job_id)
+    else:
+        recent_jobs = select(IngestionJob.id).order_by(IngestionJob.started_at.desc()).limit(runs)
+        query = query.filter(IngestionJobPhase.job_id.in_(recent_jobs))
+    rows = query.order_by(IngestionJob.started_at.desc(), IngestionJobPhase.started_at.asc()).all()
+    return [
+        {
+            "job_id": str(phase.job_id),
+            "phase": phase.phase,
+            "started_at": phase.started_at,
+            "finished_at": phase.finished_at,
+            "duration_seconds": phase.duration_seconds,
+            "unit": PHASE_UNITS.get(phase.phase),
+            "processed_items": phase.processed_items,
+            "total_items": phase.total_items,
+            "row_count": phase.row_count,
+            "items_per_second": _per_second(phase.processed_items, phase.duration_seconds),
+            "rows_per_second": _per_second(phase.row_count, phase.duration_seconds),
+        }
+        for phase, _ in rows
+    ]
@@ -0,0 +1,174 @@
+"""The ingestion pipeline run by the worker that claims an ingestion job.
+
+The claiming worker coordinates: it splits the fetch phase into per-source tasks that every
+worker helps with (see ``fetch_tasks``), waits for them to finish, then runs clustering and
+scoring, the only phases that stay a singleton across workers.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal, engine
+from app.core.metrics import CLUSTER_SECONDS, SCORE_SECONDS
+from app.models.ingestion_job import IngestionJob
+from app.services.cluster.clusterer import cluster_recent
+from app.services.ingest.fetch_tasks import create_fetch_tasks, fetch_task_progress, work_fetch_tasks
+from app.services.ingest.jobs import recover_stale_ingestion_jobs
+from app.services.ingest.phase_metrics import INGESTION_PHASES, historical_phase_seconds
+from app.services.ingest.progress import JobProgress, notify_job_changed
+from app.services.rank.scorer import score_clusters
+from app.services.review_queue import refresh_review_queue
+
+logger = logging.getLogger("uvicorn.error")
+
+INGESTION_ADVISORY_LOCK_KEY = 98172341
+
+PHASE_1_MAX_PROGRESS = 65
+PHASE_2_MAX_PROGRESS = 90
+PHASE_3_MAX_PROGRESS = 95
+PHASE_4_MAX_PROGRESS = 99
+
+
+@contextmanager
+def _singleton_phase_lock():
+    """Hold the cluster/score advisory lock, waiting for any other coordinator to release it."""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:lock_key)"), {"lock_key": INGESTION_ADVISORY_LOCK_KEY})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:lock_key)"), {"lock_key": INGESTION_ADVISORY_LOCK_KEY})
+
+
+def _phase_1_progress(discovered_feed_count: int, total_sources: int) -> int:
+    if total_sources <= 0:
+        return PHASE_1_MAX_PROGRESS
+    ratio = max(0.0, min(1.0, discovered_feed_count / total_sources))
+    return int(round(ratio * PHASE_1_MAX_PROGRESS))
+
+
+def _mark_job_failed(db: Session, job: IngestionJob, error: str | None = None):
+    db.refresh(job)
+    job.status = "FAILED"
+    job.error = error
+    job.updated_at = datetime.now(timezone.utc)
+    notify_job_changed(db, job.id)
+    db.commit()
+
+
+def _mark_job_complete(db: Session, job: IngestionJob, imported_items_count: int):
+    db.refresh(job)
+    job.total_items = max(0, imported_items_count)
+    job.processed_items = max(0, imported_items_count)
+    job.progress_percent = 100
+    job.status = "COMPLETED"
+    job.updated_at = datetime.now(timezone.utc)
+    notify_job_changed(db, job.id)
+    db.commit()
+
+
+def _run_fetch_phase(db: Session, job: IngestionJob, worker_id: str, reporter: JobProgress):
+    """Work through the job's fetch tasks alongside other workers until every task is done."""
+    total_sources = create_fetch_tasks(db, job.id, due_only=job.due_only)
+    while True:
+        completed = work_fetch_tasks(db, worker_id, job_id=job.id)
+        progress = fetch_task_progress(db, job.id)
+        reporter.update(
+            INGESTION_PHASES[0],
+            _phase_1_progress(progress.done, total_sources),
+            processed_items=progress.done,
+            total_items=total_sources,
+            row_count=progress.item_count,
+        )
+        if progress.finished:
+            return progress
+        if not completed:
+            # The remaining tasks are claimed by other workers; wait, reclaiming them if those die.
+            time.sleep(settings.ingest_worker_poll_seconds)
+            recover_stale_ingestion_jobs(db)
+
+
+def run_ingestion_job(
+    job_id: UUID,
+    threshold: float,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    incremental_clustering: bool = True,
+    worker_id: str = "local",
+):
+    db = SessionLocal()
+    reporter = JobProgress(job_id, SessionLocal)
+    try:
+        job = db.get(IngestionJob, job_id)
+        if not job:
+            return
+        reporter.history = historical_phase_seconds(db, due_only=job.due_only)
+        reporter.update(INGESTION_PHASES[0], 0)
+
+        fetched = _run_fetch_phase(db, job, worker_id, reporter)
+        if job.due_only and fetched.total == 0:
+            # Scheduled poll with no source due: nothing new to cluster or score.
+            reporter.finish()
+            _mark_job_complete(db, job, imported_items_count=0)
+            return
+        logger.info(
+            "ingestion job %s imported items from %s sources: new=%s existing=%s",
+            job_id,
+            fetched.total,
+            fetched.inserted_count,
+            fetched.existing_count,
+        )
+        reporter.update(
+            INGESTION_PHASES[1],
+            PHASE_2_MAX_PROGRESS,
+            processed_items=fetched.item_count,
+            total_items=fetched.item_count,
+        )
+
+        with _singleton_phase_lock():
+            reporter.update(INGESTION_PHASES[2], PHASE_2_MAX_PROGRESS)
+            with CLUSTER_SECONDS.time():
+                touched_cluster_ids = cluster_recent(
+                    db,
+                    threshold=threshold,
+                    start_datetime=start_datetime,
+                    end_datetime=end_datetime,
+                    incremental=incremental_clustering,
+                )
+            reporter.update(INGESTION_PHASES[2], PHASE_3_MAX_PROGRESS, processed_items=len(touched_cluster_ids))
+
+            reporter.update(INGESTION_PHASES[3], PHASE_3_MAX_PROGRESS)
+            with SCORE_SECONDS.time():
+                scored_cluster_ids = score_clusters(
+                    db,
+                    cluster_ids=touched_cluster_ids,
+                    start_datetime=start_datetime,
+                    end_datetime=end_datetime,
+                )
+            refresh_review_queue(db, scored_cluster_ids)
+            db.commit()
+            reporter.update(INGESTION_PHASES[3], PHASE_4_MAX_PROGRESS, processed_items=len(scored_cluster_ids))
+
+        reporter.update(INGESTION_PHASES[4], PHASE_4_MAX_PROGRESS)
+        reporter.finish()
+
+        _mark_job_complete(db, job, imported_items_count=fetched.item_count)
+    except Exception as exc:
+        logger.exception("ingestion job %s failed", job_id)
+        db.rollback()
+        job = db.get(IngestionJob, job_id)
+        if job:
+            _mark_job_failed(db, job, error=f"{type(exc).__name__}: {exc}"[:2000])
+    finally:
+        db.close()
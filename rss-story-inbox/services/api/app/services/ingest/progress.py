@@ -0,0 +1,182 @@
+"""Progress of a running ingestion job, written to ``ingestion_job`` only now and then.
+
+The pipeline reports progress after every fetch batch and phase step. Those reports land in
+memory, and the job row is updated at most every ``ingest_progress_flush_seconds`` (and on
+every phase change) in a short transaction of its own, so progress never commits or waits
+on the pipeline's data transaction. Jobs run in worker processes, so the flushed row is the
+source of truth for every status endpoint.
+
+The reporter also times each phase: the ETA written with progress comes from the current
+phase's rate and the durations of past runs (see ``phase_metrics``), and every finished timed
+phase is recorded in ``ingestion_job_phase`` with the flush that follows it.
+
+Every write of a job row also sends a Postgres ``NOTIFY`` on ``INGESTION_PROGRESS_CHANNEL``
+carrying the job id, which API processes relay to event-stream clients (see
+``progress_events``).
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import insert, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.ingestion_job import IngestionJob
+from app.models.ingestion_job_phase import IngestionJobPhase
+from app.services.ingest.phase_metrics import UNTIMED_PHASES, estimate_eta_seconds
+
+
+INGESTION_PROGRESS_CHANNEL = "ingestion_progress"
+
+
+def notify_job_changed(db: Session, job_id) -> None:
+    """Announce a change to the job's row once ``db`` commits. No-op outside Postgres."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            text("SELECT pg_notify(:channel, :job_id)"),
+            {"channel": INGESTION_PROGRESS_CHANNEL, "job_id": str(job_id)},
+        )
+
+
+@dataclass(frozen=True)
+class ProgressSnapshot:
+    phase: str
+    progress_percent: int
+    processed_items: int
+    total_items: int
+    updated_at: datetime
+    eta_seconds: int | None = None
+
+    def values(self) -> tuple:
+        return (self.phase, self.progress_percent, self.processed_items, self.total_items, self.eta_seconds)
+
+
+class JobProgress:
+    def __init__(
+        self,
+        job_id,
+        session_factory: Callable[[], Session],
+        flush_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        history: dict[str, float] | None = None,
+    ):
+        self.job_id = job_id
+        self.session_factory = session_factory
+        self.flush_seconds = settings.ingest_progress_flush_seconds if flush_seconds is None else flush_seconds
+        self.clock = clock
+        # Median seconds per phase in recent runs, for the ETA of phases without a measurable rate.
+        self.history = history or {}
+        self.snapshot: ProgressSnapshot | None = None
+        self._flushed: ProgressSnapshot | None = None
+        self._flushed_at: float | None = None
+        self._phase_started: float = 0.0
+        self._phase_started_at: datetime | None = None
+        self._phase_total: int | None = None
+        self._phase_rows: int | None = None
+        self._finished_phases: list[dict] = []
+
+    def update(
+        self,
+        phase: str,
+        progress_percent: int,
+        processed_items: int = 0,
+        total_items: int | None = None,
+        row_count: int | None = None,
+        force: bool = False,
+    ) -> None:
+        previous = self.snapshot
+        now = datetime.now(timezone.utc)
+        if previous is None or previous.phase != phase:
+            if previous is not None:
+                self._finish_phase(now)
+            self._phase_started = self.clock()
+            self._phase_started_at = now
+            self._phase_total = None
+            self._phase_rows = None
+        if total_items is not None:
+            self._phase_total = max(0, total_items)
+        if row_count is not None:
+            self._phase_rows = row_count
+
+        processed_items = max(0, processed_items)
+        self.snapshot = ProgressSnapshot(
+            phase=phase,
+            progress_percent=max(0, min(100, progress_percent)),
+            processed_items=processed_items,
+            total_items=max(0, total_items) if total_items is not None else (previous.total_items if previous else 0),
+            updated_at=now,
+            eta_seconds=estimate_eta_seconds(
+                phase, self.clock() - self._phase_started, processed_items, self._phase_total, self.history
+            ),
+        )
+
+        phase_changed = self._flushed is None or self._flushed.phase != phase
+        due = self._flushed_at is None or self.clock() - self._flushed_at >= self.flush_seconds
+        if force or phase_changed or due:
+            self.flush()
+
+    def _finish_phase(self, now: datetime) -> None:
+        snapshot = self.snapshot
+        if snapshot.phase in UNTIMED_PHASES:
+            return
+        self._finished_phases.append(
+            {
+                "job_id": self.job_id,
+                "phase": snapshot.phase,
+                "started_at": self._phase_started_at,
+                "finished_at": now,
+                "duration_seconds": max(0.0, self.clock() - self._phase_started),
+                "processed_items": snapshot.processed_items,
+                "total_items": self._phase_total,
+                "row_count": self._phase_rows,
+            }
+        )
+
+    def finish(self) -> None:
+        """Record the last phase and write everything out; call once the run has succeeded."""
+        if self.snapshot is None:
+            return
+        self._finish_phase(datetime.now(timezone.utc))
+        self.snapshot = ProgressSnapshot(
+            phase=self.snapshot.phase,
+            progress_percent=self.snapshot.progress_percent,
+            processed_items=self.snapshot.processed_items,
+            total_items=self.snapshot.total_items,
+            updated_at=datetime.now(timezone.utc),
+            eta_seconds=0,
+        )
+        self.flush()
+
+    def flush(self) -> None:
+        """Write the current snapshot and finished phases if anything changed since the last write."""
+        snapshot = self.snapshot
+        if snapshot is None:
+            return
+        if not self._finished_phases and self._flushed is not None and snapshot.values() == self._flushed.values():
+            return
+        db = self.session_factory()
+        try:
+            if self._finished_phases:
+                db.execute(insert(IngestionJobPhase), self._finished_phases)
+            db.execute(
+                update(IngestionJob)
+                .where(IngestionJob.id == self.job_id)
+                .values(
+                    progress_percent=snapshot.progress_percent,
+                    processed_items=snapshot.processed_items,
+                    total_items=snapshot.total_items,
+                    phase=snapshot.phase,
+                    eta_seconds=snapshot.eta_seconds,
+                    updated_at=snapshot.updated_at,
+                )
+            )
+            notify_job_changed(db, self.job_id)
+            db.commit()
+        finally:
+            db.close()
+        self._finished_phases = []
+        self._flushed = snapshot
+        self._flushed_at = self.clock()
@@ -0,0 +1,82 @@
+"""Fan ingestion job changes out to event-stream clients of this API process.
+
+Whoever writes an ``ingestion_job`` row sends a ``NOTIFY`` with the job id (see
+``progress.notify_job_changed``). Each API process runs one listener thread on a dedicated
+connection; on every notification it loads the job's status once and hands it to all
+subscribed clients, however many there are. Clients that fall behind lose their oldest
+updates rather than growing an unbounded backlog.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable
+
+import psycopg
+
+from app.services.ingest.progress import INGESTION_PROGRESS_CHANNEL
+
+logger = logging.getLogger("uvicorn.error")
+
+SUBSCRIBER_QUEUE_SIZE = 16
+LISTEN_RETRY_SECONDS = 5.0
+
+
+def _offer(queue: asyncio.Queue, item: dict) -> None:
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+class IngestionEventBroadcaster:
+    def __init__(self, dsn: str, load_status: Callable[[str], dict | None]):
+        self.dsn = dsn
+        self.load_status = load_status
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._lock = threading.Lock()
+        self._listener: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the listener thread (once); it runs for the life of the process."""
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="ingest-events", daemon=True)
+                self._listener.start()
+
+    def subscribe(self) -> asyncio.Queue:
+        """A queue receiving job status dicts; call from the event loop that will read it."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def dispatch(self, job_id: str) -> None:
+        """Load the job's status and deliver it to every subscriber."""
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        if not subscribers:
+            return
+        status = self.load_status(job_id)
+        if status is None:
+            return
+        for queue, loop in subscribers:
+            loop.call_soon_threadsafe(_offer, queue, status)
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                with psycopg.connect(self.dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {INGESTION_PROGRESS_CHANNEL}")
+                    for notify in conn.notifies():
+                        try:
+                            self.dispatch(notify.payload)
+                        except Exception:
+                            logger.exception("failed to relay ingestion job %s", notify.payload)
+            except Exception:
+                logger.exception("ingestion event listener lost its connection; retrying")
+            time.sleep(LISTEN_RETRY_SECONDS)
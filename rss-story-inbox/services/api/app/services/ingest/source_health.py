@@ -0,0 +1,128 @@
+"""Per-source fetch health: outcome history, exponential backoff and circuit breaking.
+
+Every fetch records its status, HTTP status, latency and error class. Each consecutive
+failure doubles the source's backoff (from ``ingest_source_backoff_base_minutes`` up to
+``ingest_source_backoff_max_minutes``), during which no ingestion run fetches it; after
+``ingest_source_disable_after_failures`` failures in a row the circuit opens and the source
+is skipped until an admin resets it. One success clears the failure streak.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.source import Source
+from app.models.source_fetch_state import SourceFetchState
+from app.services.ingest.fetch_rss import FETCH_ERROR, FeedFetchResult
+from app.services.ingest.poll_schedule import as_utc
+
+
+def backoff_delay(consecutive_failures: int) -> timedelta:
+    if consecutive_failures <= 0:
+        return timedelta(0)
+    minutes = settings.ingest_source_backoff_base_minutes * 2 ** min(consecutive_failures - 1, 30)
+    return timedelta(minutes=min(minutes, settings.ingest_source_backoff_max_minutes))
+
+
+def fetch_outcome_values(result: FeedFetchResult, previous_failures: int, now: datetime) -> dict:
+    """Column values recording one fetch outcome on top of the source's failure streak."""
+    values = {
+        "last_status": result.status,
+        "last_http_status": result.http_status,
+        "last_latency_ms": int(result.elapsed_seconds * 1000) if result.elapsed_seconds is not None else None,
+        "last_error": (result.error or None) and result.error[:128],
+    }
+    if result.status != FETCH_ERROR:
+        values.update(last_success_at=now, consecutive_failures=0, backoff_until=None)
+        return values
+
+    failures = previous_failures + 1
+    values.update(last_failure_at=now, consecutive_failures=failures, backoff_until=now + backoff_delay(failures))
+    if failures >= settings.ingest_source_disable_after_failures:
+        values["disabled_at"] = now
+    return values
+
+
+def save_fetch_outcome(db: Session, source_id: int, values: dict) -> None:
+    """Upsert one source's outcome values. Does not commit."""
+    now = datetime.now(timezone.utc)
+    stmt = insert(SourceFetchState).values(source_id=source_id, updated_at=now, **values)
+    stmt = stmt.on_conflict_do_update(index_elements=["source_id"], set_={**values, "updated_at": now})
+    db.execute(stmt)
+
+
+def blocked_source_ids(db: Session, source_ids: Iterable[int], now: datetime | None = None) -> set[int]:
+    """The given sources that are disabled or still backing off."""
+    ids = list(source_ids)
+    if not ids:
+        return set()
+    now = now or datetime.now(timezone.utc)
+    return {
+        source_id
+        for (source_id,) in db.query(SourceFetchState.source_id)
+        .filter(
+            SourceFetchState.source_id.in_(ids),
+            or_(SourceFetchState.disabled_at.isnot(None), SourceFetchState.backoff_until > now),
+        )
+        .all()
+    }
+
+
+def list_source_health(db: Session) -> list[dict]:
+    rows = (
+        db.query(Source, SourceFetchState)
+        .outerjoin(SourceFetchState, SourceFetchState.source_id == Source.id)
+        .order_by(Source.id.asc())
+        .all()
+    )
+    now = datetime.now(timezone.utc)
+    out = []
+    for source, state in rows:
+        failures = state.consecutive_failures if state else 0
+        disabled_at = state.disabled_at if state else None
+        backoff_until = state.backoff_until if state else None
+        if disabled_at is not None:
+            health = "DISABLED"
+        elif backoff_until is not None and as_utc(backoff_until) > now:
+            health = "BACKING_OFF"
+        elif failures:
+            health = "FAILING"
+        elif state is None or state.last_status is None:
+            health = "UNKNOWN"
+        else:
+            health = "HEALTHY"
+        out.append(
+            {
+                "source_id": source.id,
+                "name": source.name,
+                "feed_url": source.feed_url,
+                "active": source.active,
+                "health": health,
+                "last_status": state.last_status if state else None,
+                "last_http_status": state.last_http_status if state else None,
+                "last_latency_ms": state.last_latency_ms if state else None,
+                "last_error": state.last_error if state else None,
+                "last_success_at": state.last_success_at if state else None,
+                "last_failure_at": state.last_failure_at if state else None,
+                "consecutive_failures": failures,
+                "backoff_until": backoff_until,
+                "disabled_at": disabled_at,
+                "publish_rate_per_hour": state.publish_rate_per_hour if state else None,
+                "next_due_at": state.next_due_at if state else None,
+            }
+        )
+    return out
+
+
+def reset_source_health(db: Session, source_id: int) -> bool:
+    """Close the circuit and clear backoff so the next run fetches the source. Does not commit."""
+    result = db.execute(
+        update(SourceFetchState)
+        .where(SourceFetchState.source_id == source_id)
+        .values(consecutive_failures=0, backoff_until=None, disabled_at=None, next_due_at=None)
+    )
+    return result.rowcount > 0
@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+
+ARTICLE_INSERT_BATCH_SIZE = 1000
+
+
+@dataclass
+class ArticleInsertResult:
+    inserted: list[tuple[int, str]] = field(default_factory=list)
+    existing_count: int = 0
+
+    @property
+    def inserted_count(self) -> int:
+        return len(self.inserted)
+
+
+def iter_batches(rows: Iterable[dict], batch_size: int = ARTICLE_INSERT_BATCH_SIZE) -> Iterator[list[dict]]:
+    """Split rows into lists of ``batch_size``, pulling lazily so a generator is never materialized."""
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def insert_article_batch(db: Session, rows: list[dict]) -> ArticleInsertResult:
+    """Insert rows in one ``INSERT ... ON CONFLICT (url) DO NOTHING RETURNING id, url``.
+
+    Rows repeating a URL already in the batch count as existing, same as rows whose URL is
+    already stored. Rows are written in URL order so concurrent batches lock in the same order.
+    Does not commit.
+    """
+    unique_rows: dict[str, dict] = {}
+    for row in rows:
+        unique_rows.setdefault(row["url"], row)
+    if not unique_rows:
+        return ArticleInsertResult(existing_count=len(rows))
+
+    ordered = [unique_rows[url] for url in sorted(unique_rows)]
+    stmt = (
+        insert(Article)
+        .values(ordered)
+        .on_conflict_do_nothing(index_elements=["url"])
+        .returning(Article.id, Article.url)
+    )
+    inserted = [(int(article_id), url) for article_id, url in db.execute(stmt).all()]
+    return ArticleInsertResult(inserted=inserted, existing_count=len(rows) - len(inserted))
@@ -1,48 +1,94 @@
 from datetime import datetime, timezone
+from typing import Iterable
 
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Float, bindparam, case, cast, func, or_, true, update
 
+from app.models.article import Article
 from app.models.cluster import Cluster
-from app.models.profile import Profile
-from app.services.filtering.terms import parse_terms, score_article_relevance
+from app.services.filtering.term_hits import current_term_matcher, deserialize_term_hits, refresh_stale_term_hits
 from app.services.rank.relevance import cluster_relevance_from_articles
 
+COVERAGE_WEIGHT = 10.0
+RECENCY_WEIGHT = 5.0
+RELEVANCE_WEIGHT = 4.0
+RECENCY_HORIZON_HOURS = 48.0
 
-def score_clusters(db) -> None:
-    profile = db.query(Profile).order_by(Profile.id.asc()).first()
-    include_terms = parse_terms(profile.include_terms if profile else None)
-    include_terms_2 = parse_terms(profile.include_terms_2 if profile else None)
-    exclude_terms = parse_terms(profile.exclude_terms if profile else None)
+
+def _article_scores_by_cluster(db, term_matcher, cluster_ids: list[int]) -> dict[int, list[float]]:
+    """Relevance of every article in ``cluster_ids``, aggregated from stored term hits."""
+    refresh_stale_term_hits(db, term_matcher, cluster_ids)
+
+    scores_by_hits: dict[str | None, float] = {}
+    out: dict[int, list[float]] = {}
+    rows = db.query(Article.cluster_id, Article.term_hits).filter(Article.cluster_id.in_(cluster_ids)).all()
+    for cluster_id, raw_hits in rows:
+        score = scores_by_hits.get(raw_hits)
+        if score is None:
+            score = term_matcher.relevance_from_hits(deserialize_term_hits(raw_hits) or {})
+            scores_by_hits[raw_hits] = score
+        out.setdefault(cluster_id, []).append(score)
+    return out
+
+
+def _base_score_expression(now: datetime):
+    age_hours = (now.timestamp() - cast(func.extract("epoch", Cluster.latest_published_at), Float)) / 3600.0
+    remaining = RECENCY_HORIZON_HOURS - age_hours
+    recency_boost = case(
+        (Cluster.latest_published_at.is_(None), 0.0),
+        (remaining > 0, remaining / RECENCY_HORIZON_HOURS),
+        else_=0.0,
+    )
+    coverage = cast(func.coalesce(Cluster.coverage_count, 1), Float)
+    return coverage * COVERAGE_WEIGHT + recency_boost * RECENCY_WEIGHT
+
+
+def score_clusters(
+    db,
+    cluster_ids: Iterable[int] | None = None,
+    start_datetime: datetime | None = None,
+    end_datetime: datetime | None = None,
+) -> list[int]:
+    """Score clusters touched by a run or whose latest article falls inside the window.
+
+    Coverage and recency are written by one set-based UPDATE; term relevance, computed from
+    stored article term hits, is then added only to clusters where it is non-zero. With no
+    ``cluster_ids`` and no window every cluster is scored. Returns the ids of the clusters scored.
+    """
+    scope = []
+    if cluster_ids is not None:
+        scope.append(Cluster.id.in_(list(cluster_ids)))
+    if start_datetime is not None and end_datetime is not None:
+        scope.append(Cluster.latest_published_at.between(start_datetime, end_datetime))
+    condition = or_(*scope) if scope else true()
+
+    scoped_ids = [cid for (cid,) in db.query(Cluster.id).filter(condition).all()]
+    if not scoped_ids:
+        db.commit()
+        return []
 
     now = datetime.now(timezone.utc)
-    has_term_filters = bool(include_terms or include_terms_2 or exclude_terms)
-
-    clusters_query = db.query(Cluster)
-    if has_term_filters:
-        clusters_query = clusters_query.options(selectinload(Cluster.articles))
-    clusters = clusters_query.all()
-    for c in clusters:
-        coverage = float(c.coverage_count or 1)
-        recency_boost = 0.0
-        if c.latest_published_at:
-            age_hours = (now - c.latest_published_at).total_seconds() / 3600.0
-            recency_boost = max(0.0, 48.0 - age_hours) / 48.0
-
-        relevance_boost = 0.0
-        if has_term_filters:
-            article_scores = [
-                score_article_relevance(
-                    title=a.title,
-                    excerpt=a.raw_excerpt,
-                    content=a.content_text,
-                    include_terms=include_terms,
-                    include_terms_2=include_terms_2,
-                    exclude_terms=exclude_terms,
-                )
-                for a in c.articles
-            ]
-            relevance_boost = cluster_relevance_from_articles(article_scores)
+    db.execute(
+        update(Cluster)
+        .where(Cluster.id.in_(scoped_ids))
+        .values(score=_base_score_expression(now))
+        .execution_options(synchronize_session=False)
+    )
 
-        c.score = (coverage * 10.0) + (recency_boost * 5.0) + (relevance_boost * 4.0)
+    term_matcher = current_term_matcher(db)
+    if term_matcher.has_terms:
+        article_scores_by_cluster = _article_scores_by_cluster(db, term_matcher, scoped_ids)
+        boosts = []
+        for cid, article_scores in article_scores_by_cluster.items():
+            relevance_boost = cluster_relevance_from_articles(article_scores)
+            if relevance_boost:
+                boosts.append({"cid": cid, "boost": relevance_boost * RELEVANCE_WEIGHT})
+        if boosts:
+            db.execute(
+                update(Cluster.__table__)
+                .where(Cluster.__table__.c.id == bindparam("cid"))
+                .values(score=Cluster.__table__.c.score + bindparam("boost")),
+                boosts,
+            )
 
     db.commit()
+    return scoped_ids
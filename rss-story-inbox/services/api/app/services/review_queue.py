@@ -0,0 +1,153 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import and_, delete, exists, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+from app.models.cluster import Cluster
+from app.models.review_queue import ReviewQueueEntry
+
+REVIEW_QUEUE_REFRESH_BATCH_SIZE = 1000
+
+# Order of the review queue; matches ix_review_queue_order so next/page are index scans.
+# Undated clusters come first within a score, as they always have on Postgres.
+REVIEW_QUEUE_ORDER = (
+    ReviewQueueEntry.score.desc(),
+    ReviewQueueEntry.latest_published_at.desc().nullsfirst(),
+    ReviewQueueEntry.cluster_id.desc(),
+)
+
+
+def refresh_review_queue(db: Session, cluster_ids: Iterable[int]) -> None:
+    """Recompute queue rows for ``cluster_ids`` from their INBOX articles. Does not commit.
+
+    Clusters with INBOX articles are upserted with their current count, score and recency;
+    clusters without any are removed. Call after anything that changes article status,
+    cluster membership or cluster scores.
+    """
+    ids = sorted({cid for cid in cluster_ids if cid is not None})
+    for i in range(0, len(ids), REVIEW_QUEUE_REFRESH_BATCH_SIZE):
+        batch = ids[i : i + REVIEW_QUEUE_REFRESH_BATCH_SIZE]
+        inbox_counts = (
+            select(Article.cluster_id.label("cluster_id"), func.count().label("inbox_count"))
+            .where(Article.status == "INBOX", Article.cluster_id.in_(batch))
+            .group_by(Article.cluster_id)
+            .subquery()
+        )
+        rows = select(
+            inbox_counts.c.cluster_id,
+            inbox_counts.c.inbox_count,
+            func.coalesce(Cluster.score, 0.0),
+            Cluster.latest_published_at,
+        ).join(Cluster, Cluster.id == inbox_counts.c.cluster_id)
+
+        stmt = insert(ReviewQueueEntry).from_select(
+            ["cluster_id", "inbox_count", "score", "latest_published_at"],
+            rows,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["cluster_id"],
+            set_={
+                "inbox_count": stmt.excluded.inbox_count,
+                "score": stmt.excluded.score,
+                "latest_published_at": stmt.excluded.latest_published_at,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+
+        db.execute(
+            delete(ReviewQueueEntry).where(
+                ReviewQueueEntry.cluster_id.in_(batch),
+                ~exists().where(Article.cluster_id == ReviewQueueEntry.cluster_id, Article.status == "INBOX"),
+            )
+        )
+
+
+def next_queued_cluster(db: Session) -> Cluster | None:
+    return (
+        db.query(Cluster)
+        .join(ReviewQueueEntry, ReviewQueueEntry.cluster_id == Cluster.id)
+        .order_by(*REVIEW_QUEUE_ORDER)
+        .first()
+    )
+
+
+def queued_cluster_count(db: Session) -> int:
+    return db.query(func.count()).select_from(ReviewQueueEntry).scalar() or 0
+
+
+@dataclass(frozen=True)
+class QueueCursor:
+    """Sort key of the last cluster a client has seen; the next page starts after it.
+
+    Being a position in the sort order rather than an offset, a cursor stays valid while
+    clusters before it leave the queue.
+    """
+
+    score: float
+    latest_published_at: datetime | None
+    cluster_id: int
+
+    def encode(self) -> str:
+        payload = [
+            self.score,
+            self.latest_published_at.isoformat() if self.latest_published_at else None,
+            self.cluster_id,
+        ]
+        return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+    @classmethod
+    def decode(cls, raw: str) -> "QueueCursor":
+        """Parse a cursor produced by ``encode``; raises ValueError for anything else."""
+        try:
+            score, latest, cluster_id = json.loads(base64.urlsafe_b64decode(raw.encode("ascii")))
+            return cls(
+                score=float(score),
+                latest_published_at=datetime.fromisoformat(latest) if latest is not None else None,
+                cluster_id=int(cluster_id),
+            )
+        except (TypeError, ValueError, UnicodeError) as exc:
+            raise ValueError("Invalid queue cursor") from exc
+
+
+def _after(cursor: QueueCursor):
+    entry = ReviewQueueEntry
+    if cursor.latest_published_at is None:
+        # NULL recency sorts first, so every dated row follows, and NULL rows with a lower id.
+        same_score_after = or_(
+            entry.latest_published_at.isnot(None),
+            and_(entry.latest_published_at.is_(None), entry.cluster_id < cursor.cluster_id),
+        )
+    else:
+        same_score_after = or_(
+            entry.latest_published_at < cursor.latest_published_at,
+            and_(entry.latest_published_at == cursor.latest_published_at, entry.cluster_id < cursor.cluster_id),
+        )
+    return or_(entry.score < cursor.score, and_(entry.score == cursor.score, same_score_after))
+
+
+def queued_cluster_page(
+    db: Session,
+    limit: int,
+    after: QueueCursor | None = None,
+) -> tuple[list[Cluster], QueueCursor | None]:
+    """Return up to ``limit`` queued clusters in review order, plus the cursor for the next page."""
+    query = db.query(Cluster, ReviewQueueEntry.score, ReviewQueueEntry.latest_published_at).join(
+        ReviewQueueEntry, ReviewQueueEntry.cluster_id == Cluster.id
+    )
+    if after is not None:
+        query = query.filter(_after(after))
+    rows = query.order_by(*REVIEW_QUEUE_ORDER).limit(limit + 1).all()
+
+    clusters = [c for c, _, _ in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last, score, latest = rows[limit - 1]
+        next_cursor = QueueCursor(score=score, latest_published_at=latest, cluster_id=last.id)
+    return clusters, next_cursor
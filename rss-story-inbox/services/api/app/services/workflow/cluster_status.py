@@ -0,0 +1,48 @@
+from typing import Iterable
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+
+
+def transition_clusters(
+    db: Session,
+    cluster_ids: Iterable[int],
+    from_status: str | Iterable[str],
+    to_status: str,
+    article_ids: Iterable[int] | None = None,
+) -> dict[int, list[int]]:
+    """Move the articles of ``cluster_ids`` from ``from_status`` to ``to_status`` in one UPDATE.
+
+    Only rows still in ``from_status`` change, so concurrent actions on the same cluster cannot
+    move an article twice. Callers resolve ``to_status`` through the guards in
+    ``transitions`` first. ``article_ids`` narrows the update to those members. Returns the
+    sorted ids of the articles that changed, keyed by every requested cluster id.
+    """
+    ids = list(dict.fromkeys(cluster_ids))
+    changed: dict[int, list[int]] = {cluster_id: [] for cluster_id in ids}
+    if not ids:
+        return changed
+
+    from_statuses = [from_status] if isinstance(from_status, str) else list(from_status)
+    stmt = update(Article).where(Article.cluster_id.in_(ids), Article.status.in_(from_statuses))
+    if article_ids is not None:
+        stmt = stmt.where(Article.id.in_(list(article_ids)))
+    stmt = stmt.values(status=to_status).returning(Article.cluster_id, Article.id)
+    for cluster_id, article_id in db.execute(stmt).all():
+        changed[cluster_id].append(article_id)
+    for article_ids_changed in changed.values():
+        article_ids_changed.sort()
+    return changed
+
+
+def transition_cluster(
+    db: Session,
+    cluster_id: int,
+    from_status: str | Iterable[str],
+    to_status: str,
+    article_ids: Iterable[int] | None = None,
+) -> list[int]:
+    """Single-cluster ``transition_clusters``; returns the sorted ids of the changed articles."""
+    return transition_clusters(db, [cluster_id], from_status, to_status, article_ids)[cluster_id]
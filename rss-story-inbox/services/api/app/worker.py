@@ -0,0 +1,125 @@
+"""Ingestion worker: helps with queued ingestion jobs and runs the pipeline.
+
+Run from services/api (the ``ingest-worker`` compose service does this):
+
+    python -m app.worker --processes 2
+
+Each process first takes pending per-source fetch tasks of any running job, and otherwise
+claims a queued job to coordinate. A side thread heartbeats everything the process holds;
+work abandoned by dead workers is handed back to the queue.
+
+Prometheus metrics of all worker processes are served on ``INGEST_WORKER_METRICS_PORT``
+(0 disables); with several processes they are aggregated through prometheus_client's
+multiprocess mode.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import tempfile
+import threading
+
+from prometheus_client import CollectorRegistry, start_http_server
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from app.core.config import settings
+from app.core.db import SessionLocal, engine
+from app.core.query_stats import install_query_hooks
+from app.services.ingest.fetch_tasks import work_fetch_tasks
+from app.services.ingest.jobs import claim_ingestion_job, heartbeat_worker, recover_stale_ingestion_jobs
+from app.services.ingest.parse_pool import shutdown_feed_parse_pool
+from app.services.ingest.pipeline import run_ingestion_job
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _heartbeat(worker_id: str, stop: threading.Event) -> None:
+    while not stop.wait(settings.ingest_job_heartbeat_seconds):
+        db = SessionLocal()
+        try:
+            heartbeat_worker(db, worker_id)
+        except Exception:
+            logger.exception("heartbeat for worker %s failed", worker_id)
+            db.rollback()
+        finally:
+            db.close()
+
+
+def run_next_job(worker_id: str) -> bool:
+    """Help with a running job's fetch tasks, or claim and run a queued job; False when idle."""
+    db = SessionLocal()
+    try:
+        recover_stale_ingestion_jobs(db)
+        if work_fetch_tasks(db, worker_id):
+            return True
+        job = claim_ingestion_job(db, worker_id)
+        if not job:
+            return False
+        job_id = job.id
+        params = (job.cluster_similarity_threshold, job.window_start, job.window_end, job.incremental_clustering)
+    finally:
+        db.close()
+
+    logger.info("worker %s running ingestion job %s", worker_id, job_id)
+    run_ingestion_job(job_id, *params, worker_id=worker_id)
+    return True
+
+
+def work(stop: threading.Event | None = None) -> None:
+    stop = stop or threading.Event()
+    install_query_hooks(engine)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    heartbeat = threading.Thread(target=_heartbeat, args=(worker_id, stop), daemon=True)
+    heartbeat.start()
+    logger.info("ingestion worker %s polling every %ss", worker_id, settings.ingest_worker_poll_seconds)
+    while not stop.is_set():
+        try:
+            ran = run_next_job(worker_id)
+        except Exception:
+            logger.exception("ingestion worker %s poll failed", worker_id)
+            ran = False
+        if not ran:
+            stop.wait(settings.ingest_worker_poll_seconds)
+    shutdown_feed_parse_pool()
+
+
+def _serve_metrics(processes: int) -> None:
+    port = settings.ingest_worker_metrics_port
+    if port <= 0:
+        return
+    if processes <= 1:
+        start_http_server(port)
+        return
+    # Spawned children read this before importing prometheus_client and write their samples there.
+    metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="ingest-metrics-"))
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry, path=metrics_dir)
+    start_http_server(port, registry=registry)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run ingestion worker processes.")
+    parser.add_argument("--processes", type=int, default=settings.ingest_worker_processes)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    _serve_metrics(args.processes)
+
+    if args.processes <= 1:
+        work()
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=work, name=f"ingest-worker-{i}") for i in range(args.processes)]
+    for process in processes:
+        process.start()
+    signal.signal(signal.SIGTERM, lambda *_: [process.terminate() for process in processes])
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
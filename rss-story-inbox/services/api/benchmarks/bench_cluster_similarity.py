@@ -0,0 +1,62 @@
+"""Compare pairwise and batched member similarity for one large syndicated cluster.
+
+Run from services/api:
+
+    python -m benchmarks.bench_cluster_similarity --members 200
+
+Scores every member against every other member (the work canonical selection does) once with
+``similarity_score`` per pair and once with ``similarity_matrix``, checks that both produce the
+same scores and prints the timings.
+"""
+
+import argparse
+import time
+
+from app.services.cluster.clusterer import similarity_score
+from app.services.cluster.similarity import similarity_matrix
+from app.services.ingest.normalize import normalize_title
+from benchmarks.bench_title_blocking import SUFFIXES
+
+
+def make_members(member_count: int) -> list[str]:
+    base = "Central bank holds interest rates steady as inflation cools across the region"
+    words = base.split()
+    titles = []
+    for i in range(member_count):
+        copy = list(words)
+        if i % 3 == 1:
+            copy.pop(i % len(copy))
+        if i % 5 == 2:
+            copy.insert(i % len(copy), "analysts")
+        titles.append(" ".join(copy) + SUFFIXES[i % len(SUFFIXES)])
+    return titles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=-1)
+    args = parser.parse_args()
+
+    titles = make_members(args.members)
+
+    started = time.perf_counter()
+    pairwise = [[similarity_score(left, right) for right in titles] for left in titles]
+    pairwise_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    normalized = [normalize_title(title) for title in titles]
+    batched = similarity_matrix(normalized, normalized, workers=args.workers)
+    batched_seconds = time.perf_counter() - started
+
+    if batched.tolist() != pairwise:
+        raise SystemExit("Batched scores differ from pairwise scores")
+
+    print(f"members={len(titles)} pairs={len(titles) ** 2}")
+    print(f"pairwise: {pairwise_seconds:8.3f}s")
+    print(f"batched:  {batched_seconds:8.3f}s")
+    print(f"speedup:  {pairwise_seconds / batched_seconds:8.1f}x  (scores identical)")
+
+
+if __name__ == "__main__":
+    main()
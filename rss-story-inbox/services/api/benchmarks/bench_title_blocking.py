@@ -0,0 +1,106 @@
+"""Compare greedy title clustering with and without the candidate-blocking index.
+
+Run from services/api:
+
+    python -m benchmarks.bench_title_blocking --articles 5000
+
+Generates syndicated-news-like titles, clusters them by scanning every cluster (the previous
+behaviour) and by scanning only blocking-index candidates, checks that both assignments are
+identical and prints the timings.
+"""
+
+import argparse
+import random
+import time
+
+from app.services.cluster.blocking import TitleBlockingIndex
+from app.services.cluster.clusterer import similarity_score
+from app.services.ingest.normalize import normalize_title
+
+SUFFIXES = ["", "", "", " - Reuters", " | AP News", " (Update)", ": report", "!"]
+
+
+def make_titles(article_count: int, seed: int) -> list[tuple[str, int]]:
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10)))
+        for _ in range(4000)
+    ]
+    common = ["the", "a", "of", "to", "in", "on", "for", "and", "says", "new"]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+
+    titles: list[tuple[str, int]] = []
+    while len(titles) < article_count:
+        words = rng.choices(vocabulary, weights=weights, k=rng.randint(5, 11))
+        for i in range(rng.randint(0, 3)):
+            words.insert(rng.randint(0, len(words)), rng.choice(common))
+        base = " ".join(words).capitalize()
+        for _ in range(min(rng.choice([1, 1, 1, 2, 3, 5, 12]), article_count - len(titles))):
+            copy = base.split()
+            if len(copy) > 4 and rng.random() < 0.3:
+                copy.pop(rng.randrange(len(copy)))
+            if rng.random() < 0.2:
+                copy.insert(rng.randrange(len(copy)), rng.choice(common))
+            titles.append((" ".join(copy) + rng.choice(SUFFIXES), rng.randint(1, 300)))
+    rng.shuffle(titles)
+    return titles
+
+
+def greedy(titles: list[tuple[str, int]], threshold: float, use_index: bool) -> tuple[list[int], int]:
+    normalized = [normalize_title(title) for title, _ in titles]
+    representatives: list[str] = []
+    member_sources: list[set[int]] = []
+    index = TitleBlockingIndex(threshold, corpus=normalized) if use_index else None
+    assignments: list[int] = []
+    comparisons = 0
+
+    for tnorm, (_, source_id) in zip(normalized, titles):
+        candidates = index.candidates(tnorm) if index is not None else range(len(representatives))
+        assigned = None
+        for cid in candidates:
+            if source_id in member_sources[cid]:
+                continue
+            comparisons += 1
+            if similarity_score(tnorm, representatives[cid]) >= threshold:
+                assigned = cid
+                break
+        if assigned is None:
+            assigned = len(representatives)
+            representatives.append(tnorm)
+            member_sources.append(set())
+            if index is not None:
+                index.add(assigned, tnorm)
+        member_sources[assigned].add(source_id)
+        assignments.append(assigned)
+
+    return assignments, comparisons
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--threshold", type=float, default=0.88)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    titles = make_titles(args.articles, args.seed)
+
+    started = time.perf_counter()
+    brute, brute_comparisons = greedy(titles, args.threshold, use_index=False)
+    brute_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    blocked, blocked_comparisons = greedy(titles, args.threshold, use_index=True)
+    blocked_seconds = time.perf_counter() - started
+
+    if brute != blocked:
+        raise SystemExit("Assignments differ between full scan and blocking index")
+
+    print(f"articles={len(titles)} clusters={max(brute) + 1} threshold={args.threshold}")
+    print(f"full scan:      {brute_seconds:8.2f}s  comparisons={brute_comparisons}")
+    print(f"blocking index: {blocked_seconds:8.2f}s  comparisons={blocked_comparisons}")
+    print(f"speedup:        {brute_seconds / blocked_seconds:8.1f}x  (assignments identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.query_stats import install_query_hooks, track_queries
+from app.models.base import Base
+from app.models.ingestion_fetch_task import IngestionFetchTask
+from app.models.ingestion_job import IngestionJob
+
+# Route modules build the app's engine at import; requests below use a session of the test's own.
+with mock.patch.object(settings, "database_url", settings.database_url or "sqlite://"):
+    from app.api.routes import admin_ingest
+    from app.core.db import get_db
+
+
+class IngestStatusRouteTests(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        install_query_hooks(engine)
+        Base.metadata.create_all(engine, tables=[IngestionJob.__table__, IngestionFetchTask.__table__])
+        Session = sessionmaker(bind=engine)
+        self.job_id = uuid4()
+        quiet_since = datetime.now(timezone.utc) - timedelta(seconds=settings.ingest_job_stale_seconds + 60)
+        with Session() as db:
+            db.add(
+                IngestionJob(
+                    id=self.job_id,
+                    status="RUNNING",
+                    claimed_by="worker-a",
+                    claimed_at=quiet_since,
+                    heartbeat_at=quiet_since,
+                    eta_seconds=30,
+                )
+            )
+            db.commit()
+
+        def session():
+            with Session() as db:
+                yield db
+
+        app = FastAPI()
+        app.include_router(admin_ingest.router)
+        app.dependency_overrides[get_db] = session
+        self.client = TestClient(app)
+
+    def test_current_status_only_reads(self):
+        with track_queries() as stats:
+            status = self.client.get("/admin/ingest/status/current").json()
+
+        self.assertTrue(stats.statements)
+        self.assertTrue(all(s.lstrip().upper().startswith("SELECT") for s in stats.statements), stats.statements)
+        # The quiet worker's job is reported as waiting for another worker, without touching it.
+        self.assertEqual((status["job_id"], status["queued"], status["eta_seconds"]), (str(self.job_id), True, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from app.services.cluster.blocking import TitleBlockingIndex
+from app.services.cluster.clusterer import similarity_score
+from app.services.ingest.normalize import normalize_title
+
+
+def _random_titles(rng: random.Random, count: int) -> list[str]:
+    vocabulary = ["".join(rng.choice("abcdefgh") for _ in range(rng.randint(1, 7))) for _ in range(60)]
+    titles = []
+    for _ in range(count):
+        if titles and rng.random() < 0.5:
+            words = rng.choice(titles).split()
+            for _ in range(rng.randint(1, 3)):
+                op = rng.random()
+                if op < 0.4 and len(words) > 1:
+                    words.pop(rng.randrange(len(words)))
+                elif op < 0.7:
+                    words.insert(rng.randrange(len(words) + 1), rng.choice(vocabulary))
+                else:
+                    i = rng.randrange(len(words))
+                    words[i] = words[i][:-1] or rng.choice(vocabulary)
+        else:
+            words = rng.choices(vocabulary, k=rng.randint(1, 10))
+        titles.append(" ".join(words))
+    return [normalize_title(t) for t in titles]
+
+
+class TitleBlockingIndexTests(unittest.TestCase):
+    def test_candidates_include_every_match(self):
+        rng = random.Random(3)
+        for threshold in (0.5, 0.75, 0.88, 0.95):
+            titles = _random_titles(rng, 150)
+            index = TitleBlockingIndex(threshold, corpus=titles)
+            for key, title in enumerate(titles[:100]):
+                index.add(key, title)
+
+            for query in titles[100:]:
+                candidates = index.candidates(query)
+                self.assertEqual(candidates, sorted(candidates))
+                matches = [k for k, t in enumerate(titles[:100]) if similarity_score(query, t) >= threshold]
+                self.assertLessEqual(set(matches), set(candidates), (threshold, query))
+
+    def test_unrelated_titles_are_not_candidates(self):
+        index = TitleBlockingIndex(0.88)
+        index.add("fed", normalize_title("Fed holds interest rates steady as inflation cools"))
+        index.add("storm", normalize_title("Tropical storm makes landfall on the Gulf Coast"))
+
+        self.assertEqual(index.candidates(normalize_title("Fed holds rates steady as inflation cools")), ["fed"])
+        self.assertEqual(index.candidates(normalize_title("Local team wins championship in overtime")), [])
+
+    def test_zero_threshold_returns_everything(self):
+        index = TitleBlockingIndex(0.0)
+        index.add(1, "alpha")
+        index.add(2, "beta")
+        self.assertEqual(index.candidates("gamma"), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.article import Article
+from app.models.base import Base
+from app.models.cluster import Cluster
+from app.models.profile import Profile
+from app.models.source import Source
+from app.models.summary import Summary
+from app.services.cluster.payloads import build_cluster_outs, load_cluster_page
+
+NOW = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class ClusterPayloadTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        tables = [Source.__table__, Cluster.__table__, Article.__table__, Summary.__table__, Profile.__table__]
+        Base.metadata.create_all(self.engine, tables=tables)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add(Profile(audience_text="", tone_text="", include_terms="rates", include_terms_2="", exclude_terms=""))
+        self.db.add_all([Source(id=i, name=f"Source {i}", feed_url=f"https://s{i}.example/feed") for i in range(1, 4)])
+        article_id = 1
+        for cluster_id in range(1, 21):
+            self.db.add(Cluster(id=cluster_id, cluster_title=f"Story {cluster_id}", coverage_count=3, score=float(cluster_id)))
+            for offset in range(3):
+                self.db.add(
+                    Article(
+                        id=article_id,
+                        source_id=offset + 1,
+                        url=f"https://s.example/{article_id}",
+                        title=f"Fed holds rates steady story {cluster_id}",
+                        published_at=NOW - timedelta(hours=offset),
+                        status="KEPT",
+                        cluster_id=cluster_id,
+                    )
+                )
+                article_id += 1
+            self.db.add(Summary(cluster_id=cluster_id, draft_text=f"Draft {cluster_id}"))
+        self.db.commit()
+        self.db.query(Cluster).filter(Cluster.id == 1).update({"canonical_article_id": 2})
+        self.db.commit()
+
+        self.statements = 0
+
+        def count(*_args):
+            self.statements += 1
+
+        event.listen(self.engine, "before_cursor_execute", count)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_page_loads_with_constant_query_count(self):
+        clusters = self.db.query(Cluster).order_by(Cluster.id).all()
+        self.statements = 0
+        page = load_cluster_page(self.db, clusters, with_summaries=True)
+        outs = build_cluster_outs(page, why=lambda c: "why")
+        self.assertLessEqual(self.statements, 5)
+
+        self.assertEqual(len(outs), 20)
+        first = outs[0]
+        self.assertEqual(first.canonical.id, 2)
+        self.assertEqual(first.canonical.source_name, "Source 2")
+        self.assertEqual(first.canonical.match_confidence, 1.0)
+        self.assertEqual([a.id for a in first.coverage], [1, 2, 3])
+        self.assertEqual(first.qualifying_terms, ["rates"])
+        self.assertEqual(page.summaries[1].draft_text, "Draft 1")
+
+    def test_canonical_outside_the_members_is_only_loaded_on_request(self):
+        self.db.query(Cluster).filter(Cluster.id == 2).update({"canonical_article_id": 1})
+        self.db.commit()
+        clusters = self.db.query(Cluster).filter(Cluster.id == 2).all()
+
+        self.statements = 0
+        self.assertEqual(load_cluster_page(self.db, clusters).canonical, {})
+        without = self.statements
+
+        self.statements = 0
+        page = load_cluster_page(self.db, clusters, with_canonical=True)
+        self.assertEqual(page.canonical[2].id, 1)
+        self.assertEqual(self.statements, without + 1)
+
+    def test_without_match_confidence(self):
+        clusters = self.db.query(Cluster).filter(Cluster.id == 2).all()
+        outs = build_cluster_outs(load_cluster_page(self.db, clusters), why=lambda c: "why", match_confidence=False)
+        self.assertIsNone(outs[0].canonical.match_confidence)
+        self.assertTrue(all(a.match_confidence is None for a in outs[0].coverage))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from datetime import datetime, timezone
+
+from app.models.article import Article
+from app.services.cluster.clusterer import _pick_canonical, similarity_score
+from app.services.cluster.similarity import similarity_matrix
+from app.services.ingest.normalize import normalize_title
+
+TITLES = [
+    "Fed holds interest rates steady as inflation cools",
+    "Fed holds rates steady as inflation cools - Reuters",
+    "Inflation cools; Fed holds interest rates steady",
+    "Tropical storm makes landfall on the Gulf Coast",
+    "",
+]
+
+
+class SimilarityMatrixTests(unittest.TestCase):
+    def test_matches_pairwise_scores(self):
+        normalized = [normalize_title(t) for t in TITLES]
+        for workers in (1, 2):
+            matrix = similarity_matrix(normalized, normalized, workers=workers)
+            self.assertEqual(matrix.shape, (len(TITLES), len(TITLES)))
+            expected = [[similarity_score(left, right) for right in TITLES] for left in TITLES]
+            self.assertEqual(matrix.tolist(), expected)
+
+    def test_empty_inputs(self):
+        self.assertEqual(similarity_matrix([], ["a"]).shape, (0, 1))
+        self.assertEqual(similarity_matrix(["a"], []).shape, (1, 0))
+
+    def test_pick_canonical_prefers_most_central_then_earliest(self):
+        members = [
+            Article(id=1, title="Fed holds rates", published_at=datetime(2024, 5, 1, 12, tzinfo=timezone.utc)),
+            Article(id=2, title="Fed holds rates", published_at=datetime(2024, 5, 1, 9, tzinfo=timezone.utc)),
+            Article(id=3, title="Fed keeps rates on hold", published_at=datetime(2024, 5, 1, 8, tzinfo=timezone.utc)),
+        ]
+        normalized = [normalize_title(m.title) for m in members]
+        self.assertEqual(_pick_canonical(members, similarity_matrix(normalized, normalized)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.article import Article
+from app.models.base import Base
+from app.models.cluster import Cluster
+from app.models.source import Source
+from app.models.summary import Summary
+from app.services.cluster.clusterer import cluster_recent
+
+NOW = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+WINDOW = {"start_datetime": NOW - timedelta(days=2), "end_datetime": NOW}
+
+
+class ClusterRecentTests(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        tables = [Source.__table__, Cluster.__table__, Article.__table__, Summary.__table__]
+        Base.metadata.create_all(engine, tables=tables)
+        self.db = sessionmaker(bind=engine)()
+        self.db.add_all([Source(id=i, name=f"Source {i}", feed_url=f"https://s{i}.example/feed") for i in range(1, 6)])
+        self.db.commit()
+        self._next_article_id = 1
+
+    def tearDown(self):
+        self.db.close()
+
+    def _add(self, source_id: int, title: str, hours_ago: float = 1.0) -> Article:
+        article = Article(
+            id=self._next_article_id,
+            source_id=source_id,
+            url=f"https://s{source_id}.example/{self._next_article_id}",
+            title=title,
+            published_at=NOW - timedelta(hours=hours_ago),
+            status="INBOX",
+        )
+        self._next_article_id += 1
+        self.db.add(article)
+        self.db.commit()
+        return article
+
+    def _assignments(self) -> dict[int, int]:
+        return {a.id: a.cluster_id for a in self.db.query(Article).all()}
+
+    def test_full_run_groups_similar_titles_one_article_per_source(self):
+        a1 = self._add(1, "Central bank raises interest rates again", hours_ago=3)
+        a2 = self._add(2, "Central bank raises interest rates again!", hours_ago=2)
+        a3 = self._add(1, "Central bank raises interest rates once again", hours_ago=1)
+        a4 = self._add(3, "Volcano erupts near island village", hours_ago=1)
+
+        cluster_recent(self.db, threshold=0.88, **WINDOW)
+
+        assignments = self._assignments()
+        self.assertEqual(assignments[a2.id], assignments[a3.id])
+        self.assertNotEqual(assignments[a1.id], assignments[a3.id])
+        self.assertNotEqual(assignments[a3.id], assignments[a4.id])
+
+    def test_incremental_run_places_only_new_articles_and_updates_in_place(self):
+        a1 = self._add(1, "Central bank raises interest rates again", hours_ago=3)
+        a2 = self._add(3, "Volcano erupts near island village", hours_ago=2)
+        cluster_recent(self.db, threshold=0.88, **WINDOW)
+        before = self._assignments()
+        cluster_ids_before = {c.id for c in self.db.query(Cluster).all()}
+
+        a3 = self._add(2, "Central bank raises interest rates again!", hours_ago=1)
+        a4 = self._add(4, "New species of frog discovered", hours_ago=1)
+        touched = cluster_recent(self.db, threshold=0.88, incremental=True, **WINDOW)
+
+        after = self._assignments()
+        self.assertEqual(after[a1.id], before[a1.id])
+        self.assertEqual(after[a2.id], before[a2.id])
+        self.assertEqual(after[a3.id], before[a1.id])
+        self.assertNotIn(after[a4.id], cluster_ids_before)
+        self.assertEqual(touched, {before[a1.id], after[a4.id]})
+        self.assertEqual(self.db.get(Cluster, before[a1.id]).coverage_count, 2)
+        self.assertEqual(self.db.query(Cluster).count(), 3)
+
+    def test_incremental_run_without_new_articles_is_a_no_op(self):
+        self._add(1, "Central bank raises interest rates again")
+        cluster_recent(self.db, threshold=0.88, **WINDOW)
+        self.assertEqual(cluster_recent(self.db, threshold=0.88, incremental=True, **WINDOW), set())
+
+    def test_incremental_run_rebuilds_clusters_built_at_another_threshold(self):
+        a1 = self._add(1, "Central bank raises interest rates again", hours_ago=2)
+        a2 = self._add(2, "Central bank raised interest rates again", hours_ago=1)
+        cluster_recent(self.db, threshold=0.99, **WINDOW)
+        self.assertNotEqual(self._assignments()[a1.id], self._assignments()[a2.id])
+
+        touched = cluster_recent(self.db, threshold=0.88, incremental=True, **WINDOW)
+
+        assignments = self._assignments()
+        self.assertEqual(assignments[a1.id], assignments[a2.id])
+        self.assertIn(assignments[a1.id], touched)
+        self.assertEqual({c.created_with_threshold for c in self.db.query(Cluster).all()}, {0.88})
+
+    def test_full_rebuild_deletes_emptied_clusters(self):
+        self._add(1, "Central bank raises interest rates again")
+        self._add(3, "Volcano erupts near island village")
+        cluster_recent(self.db, threshold=0.88, **WINDOW)
+        cluster_recent(self.db, threshold=0.88, **WINDOW)
+        self.assertEqual(self.db.query(Cluster).count(), 2)
+
+    def test_full_rebuild_keeps_emptied_clusters_with_summaries(self):
+        article = self._add(1, "Central bank raises interest rates again")
+        cluster_recent(self.db, threshold=0.88, **WINDOW)
+        self.db.add(Summary(cluster_id=self.db.get(Article, article.id).cluster_id, draft_text="draft"))
+        self.db.commit()
+
+        cluster_recent(self.db, threshold=0.88, **WINDOW)
+        self.assertEqual(self.db.query(Cluster).count(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import multiprocessing
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.services.ingest.fetch_pool import feed_host, fetch_feeds_concurrently
+from app.services.ingest.fetch_rss import FETCH_ERROR, FETCH_OK, FeedFetchResult
+
+FEED_BODY = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Example</title>
+<item><title>Story</title><link>/story</link></item>
+</channel></rss>"""
+
+
+class _ConcurrencyTracker:
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.active_by_host: dict[str, int] = {}
+        self.max_active_by_host: dict[str, int] = {}
+
+    def fetch(self, source: dict, timeout: float, client=None):
+        feed_url = source["feed_url"]
+        host = feed_host(feed_url)
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.active_by_host[host] = self.active_by_host.get(host, 0) + 1
+            self.max_active_by_host[host] = max(self.max_active_by_host.get(host, 0), self.active_by_host[host])
+        try:
+            time.sleep(self.delay)
+            return FeedFetchResult(status=FETCH_OK, items=[{"url": f"{feed_url}/item", "title": "Item"}])
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.active_by_host[host] -= 1
+
+
+def _sources(urls: list[str]) -> list[dict]:
+    return [{"id": i, "feed_url": url} for i, url in enumerate(urls, start=1)]
+
+
+class FetchPoolTests(unittest.TestCase):
+    def test_yields_every_source_once(self):
+        sources = _sources([f"https://host{i % 5}.example/feed{i}" for i in range(23)])
+        tracker = _ConcurrencyTracker(delay=0.0)
+        results = list(fetch_feeds_concurrently(sources, max_concurrency=4, fetch=tracker.fetch))
+        self.assertEqual(sorted(s["id"] for s, _ in results), [s["id"] for s in sources])
+        self.assertTrue(all(len(result.items) == 1 for _, result in results))
+
+    def test_respects_global_and_per_host_limits(self):
+        urls = [f"https://busy.example/feed{i}" for i in range(8)]
+        urls += [f"https://other{i}.example/feed" for i in range(8)]
+        tracker = _ConcurrencyTracker()
+        list(fetch_feeds_concurrently(_sources(urls), max_concurrency=5, per_host_limit=2, fetch=tracker.fetch))
+        self.assertLessEqual(tracker.max_active, 5)
+        self.assertLessEqual(tracker.max_active_by_host["busy.example"], 2)
+
+    def test_slow_host_does_not_block_others(self):
+        slow_started = threading.Event()
+        release = threading.Event()
+
+        def fetch(source: dict, timeout: float, client=None):
+            if "slow" in source["feed_url"]:
+                slow_started.set()
+                release.wait(2)
+            return FeedFetchResult(status=FETCH_OK)
+
+        sources = _sources(["https://slow.example/feed"] + [f"https://fast{i}.example/feed" for i in range(6)])
+        finished = []
+        for source, _ in fetch_feeds_concurrently(sources, max_concurrency=3, fetch=fetch):
+            finished.append(source["feed_url"])
+            if len(finished) == 6:
+                release.set()
+        self.assertTrue(slow_started.is_set())
+        self.assertEqual(finished[-1], "https://slow.example/feed")
+
+    def test_fetch_errors_yield_error_result(self):
+        def fetch(source: dict, timeout: float, client=None):
+            raise RuntimeError("boom")
+
+        results = list(fetch_feeds_concurrently(_sources(["https://a.example/feed"]), fetch=fetch))
+        self.assertEqual(results[0][1].status, FETCH_ERROR)
+        self.assertEqual(results[0][1].items, [])
+
+    def _unparsed_fetch(self, source: dict, timeout: float, client=None, parse: bool = True):
+        self.assertFalse(parse)
+        return FeedFetchResult(status=FETCH_OK, content=FEED_BODY, content_url=source["feed_url"])
+
+    def test_parse_pool_parses_downloaded_bodies(self):
+        sources = _sources([f"https://host{i}.example/feed" for i in range(3)])
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as parse_pool:
+            results = list(fetch_feeds_concurrently(sources, fetch=self._unparsed_fetch, parse_pool=parse_pool))
+
+        self.assertEqual(len(results), 3)
+        for source, result in results:
+            self.assertEqual(result.status, FETCH_OK)
+            self.assertIsNone(result.content)
+            self.assertEqual(result.items[0]["url"], f"https://{feed_host(source['feed_url'])}/story")
+
+    def test_parse_failures_yield_error_result(self):
+        class FailingPool(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                return super().submit(self._fail)
+
+            @staticmethod
+            def _fail():
+                raise ValueError("bad feed")
+
+        with FailingPool(max_workers=1) as parse_pool:
+            results = list(
+                fetch_feeds_concurrently(
+                    _sources(["https://a.example/feed"]), fetch=self._unparsed_fetch, parse_pool=parse_pool
+                )
+            )
+        self.assertEqual((results[0][1].status, results[0][1].error), (FETCH_ERROR, "ValueError"))
+
+    def test_broken_parse_pool_parses_inline(self):
+        class BrokenPool(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                return super().submit(self._die)
+
+            @staticmethod
+            def _die():
+                raise BrokenProcessPool("a parser process died")
+
+        with BrokenPool(max_workers=1) as parse_pool:
+            results = list(
+                fetch_feeds_concurrently(
+                    _sources(["https://a.example/feed"]), fetch=self._unparsed_fetch, parse_pool=parse_pool
+                )
+            )
+        self.assertEqual(results[0][1].status, FETCH_OK)
+        self.assertEqual(results[0][1].items[0]["url"], "https://a.example/story")
+
+    def test_slow_consumer_holds_back_fetching(self):
+        started = []
+
+        def fetch(source: dict, timeout: float, client=None, parse: bool = True):
+            started.append(source["id"])
+            return FeedFetchResult(status=FETCH_OK, content=FEED_BODY, content_url=source["feed_url"])
+
+        sources = _sources([f"https://host{i}.example/feed" for i in range(20)])
+        with ThreadPoolExecutor(max_workers=2) as parse_pool:
+            results = fetch_feeds_concurrently(
+                sources, max_concurrency=2, fetch=fetch, parse_pool=parse_pool, max_buffered=2
+            )
+            next(results)
+            time.sleep(0.1)
+            self.assertLessEqual(len(started), 5)
+            self.assertEqual(len(list(results)), 19)
+        self.assertEqual(len(started), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
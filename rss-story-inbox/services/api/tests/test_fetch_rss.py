@@ -0,0 +1,105 @@
+import hashlib
+import unittest
+
+import httpx
+
+from app.services.ingest.fetch_rss import (
+    FETCH_ERROR,
+    FETCH_NOT_MODIFIED,
+    FETCH_OK,
+    FETCH_UNCHANGED,
+    fetch_feed_conditional,
+    parse_feed,
+)
+
+FEED_BODY = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Example</title>
+<item><title>First story</title><link>/stories/1</link><pubDate>Mon, 01 Jan 2024 08:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def _client(handler) -> httpx.Client:
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+class FetchFeedConditionalTests(unittest.TestCase):
+    def test_full_fetch_parses_items_and_returns_validators(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=FEED_BODY, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 08:00:00 GMT"})
+
+        with _client(handler) as client:
+            result = fetch_feed_conditional("https://example.com/feed", client=client)
+
+        self.assertEqual(result.status, FETCH_OK)
+        self.assertEqual(result.items[0]["url"], "https://example.com/stories/1")
+        self.assertEqual(result.etag, '"v1"')
+        self.assertEqual(result.content_hash, hashlib.sha256(FEED_BODY).hexdigest())
+
+    def test_unparsed_fetch_returns_body_for_parsing_elsewhere(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=FEED_BODY)
+
+        with _client(handler) as client:
+            result = fetch_feed_conditional("https://example.com/feed", client=client, parse=False)
+
+        self.assertEqual((result.status, result.items), (FETCH_OK, []))
+        self.assertEqual(result.content, FEED_BODY)
+        items = parse_feed(result.content, result.content_url, result.response_headers)
+        self.assertEqual(items[0]["url"], "https://example.com/stories/1")
+
+    def test_sends_validators_and_skips_parse_on_304(self):
+        seen_headers = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.update(request.headers)
+            return httpx.Response(304)
+
+        with _client(handler) as client:
+            result = fetch_feed_conditional(
+                "https://example.com/feed",
+                etag='"v1"',
+                last_modified="Mon, 01 Jan 2024 08:00:00 GMT",
+                content_hash="abc",
+                client=client,
+            )
+
+        self.assertEqual(seen_headers["if-none-match"], '"v1"')
+        self.assertEqual(seen_headers["if-modified-since"], "Mon, 01 Jan 2024 08:00:00 GMT")
+        self.assertEqual(result.status, FETCH_NOT_MODIFIED)
+        self.assertEqual(result.items, [])
+        self.assertEqual(result.etag, '"v1"')
+        self.assertEqual(result.content_hash, "abc")
+
+    def test_unchanged_body_hash_skips_parse(self):
+        with _client(lambda request: httpx.Response(200, content=FEED_BODY)) as client:
+            result = fetch_feed_conditional(
+                "https://example.com/feed",
+                content_hash=hashlib.sha256(FEED_BODY).hexdigest(),
+                client=client,
+            )
+
+        self.assertEqual(result.status, FETCH_UNCHANGED)
+        self.assertEqual(result.items, [])
+
+    def test_http_errors_keep_previous_validators(self):
+        with _client(lambda request: httpx.Response(500)) as client:
+            result = fetch_feed_conditional("https://example.com/feed", etag='"v1"', client=client)
+
+        self.assertEqual(result.status, FETCH_ERROR)
+        self.assertEqual(result.etag, '"v1"')
+        self.assertEqual((result.http_status, result.error), (500, "HTTPStatusError"))
+        self.assertIsNotNone(result.elapsed_seconds)
+
+    def test_connection_errors_record_error_class(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectTimeout("timed out", request=request)
+
+        with _client(handler) as client:
+            result = fetch_feed_conditional("https://example.com/feed", client=client)
+
+        self.assertEqual(result.status, FETCH_ERROR)
+        self.assertEqual((result.http_status, result.error), (None, "ConnectTimeout"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from app.services.filtering.matcher import TermMatcher, get_term_matcher, terms_version
+
+
+class TermMatcherTests(unittest.TestCase):
+    def test_hits_cover_all_lists_in_one_scan(self):
+        matcher = TermMatcher(["ai"], ["chip"], ["sports"])
+        self.assertEqual(matcher.hits("ai chips for sports"), {"ai", "chip", "sports"})
+        self.assertEqual(matcher.hits("markets"), set())
+
+    def test_terms_match_as_substrings(self):
+        matcher = TermMatcher(["ai"], [], [])
+        self.assertTrue(matcher.keep_article("Officials said", None))
+        self.assertEqual(matcher.qualifying_terms(["Officials", "said"]), ["ai"])
+
+    def test_terms_match_across_joined_fields(self):
+        matcher = TermMatcher(["policy ai"], [], [])
+        self.assertTrue(matcher.keep_article("New policy", "AI rules"))
+        self.assertEqual(matcher.article_relevance("New policy", "AI rules", None), 0.0)
+
+    def test_relevance_counts_duplicate_terms(self):
+        single = TermMatcher(["ai", "space"], [], []).article_relevance("AI", None, None)
+        repeated = TermMatcher(["ai", "space"], ["ai"], []).article_relevance("AI", None, None)
+        self.assertAlmostEqual(single, 3.0 / 12.0)
+        self.assertAlmostEqual(repeated, 6.0 / 18.0)
+
+    def test_stored_field_hits_reproduce_relevance_and_qualifying_terms(self):
+        matcher = TermMatcher(["ai", "chip"], ["space"], ["sports"])
+        hits = matcher.field_hits("AI chips", "Sports and space", None)
+        self.assertEqual(set(hits), {"title", "excerpt"})
+        self.assertEqual(
+            matcher.relevance_from_hits(hits),
+            matcher.article_relevance("AI chips", "Sports and space", None),
+        )
+        self.assertEqual(matcher.qualifying_terms_from_hits([hits, {}]), ["ai", "chip", "space"])
+
+    def test_matcher_is_cached_per_term_lists(self):
+        self.assertIs(get_term_matcher(["ai"], [], ["x"]), get_term_matcher(["ai"], [], ["x"]))
+        self.assertIsNot(get_term_matcher(["ai"], [], ["x"]), get_term_matcher(["ai"], [], ["y"]))
+
+    def test_version_changes_with_terms(self):
+        self.assertEqual(terms_version(["ai"], [], []), TermMatcher(["ai"], [], []).version)
+        self.assertNotEqual(terms_version(["ai"], [], []), terms_version([], ["ai"], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
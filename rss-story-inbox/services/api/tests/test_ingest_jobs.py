@@ -0,0 +1,191 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from app.models.article import Article
+from app.models.base import Base
+from app.models.ingestion_fetch_task import IngestionFetchTask
+from app.models.ingestion_job import IngestionJob
+from app.models.profile import Profile
+from app.models.source import Source
+from app.models.source_fetch_state import SourceFetchState
+from app.services.ingest import fetch_tasks
+from app.services.ingest.fetch_rss import FETCH_OK, FeedFetchResult
+from app.services.ingest.fetch_tasks import claim_fetch_tasks, fetch_task_progress, run_fetch_tasks
+from app.services.ingest.store import insert_article_batch
+from app.services.ingest.jobs import (
+    claim_ingestion_job,
+    enqueue_ingestion_job,
+    heartbeat_worker,
+    recover_stale_ingestion_jobs,
+)
+
+START = datetime(2024, 5, 1, tzinfo=timezone.utc)
+END = datetime(2024, 5, 2, tzinfo=timezone.utc)
+
+
+class IngestionJobQueueTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        tables = [
+            Source.__table__,
+            SourceFetchState.__table__,
+            Profile.__table__,
+            Article.__table__,
+            IngestionJob.__table__,
+            IngestionFetchTask.__table__,
+        ]
+        Base.metadata.create_all(self.engine, tables=tables)
+        self.db = sessionmaker(bind=self.engine)()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _enqueue(self):
+        return enqueue_ingestion_job(self.db, 0.9, START, END, incremental_clustering=False)
+
+    def test_enqueue_returns_active_job_instead_of_queueing_another(self):
+        job, created = self._enqueue()
+        self.assertTrue(created)
+        self.assertEqual((job.status, job.claimed_at, job.cluster_similarity_threshold), ("RUNNING", None, 0.9))
+
+        again, created = self._enqueue()
+        self.assertFalse(created)
+        self.assertEqual(again.id, job.id)
+
+    def test_full_run_takes_over_a_waiting_due_only_job(self):
+        poll, _ = enqueue_ingestion_job(self.db, 0.9, START, END, incremental_clustering=True, due_only=True)
+        job, created = enqueue_ingestion_job(self.db, 0.8, START, END, incremental_clustering=True)
+        self.assertTrue(created)
+        self.assertEqual(job.id, poll.id)
+        self.assertEqual((job.due_only, job.cluster_similarity_threshold), (False, 0.8))
+
+        again, created = enqueue_ingestion_job(self.db, 0.8, START, END, incremental_clustering=True, due_only=True)
+        self.assertEqual((again.id, created), (job.id, False))
+
+    def test_full_run_queues_behind_a_running_due_only_job(self):
+        poll, _ = enqueue_ingestion_job(self.db, 0.9, START, END, incremental_clustering=True, due_only=True)
+        claim_ingestion_job(self.db, "worker-a")
+
+        job, created = enqueue_ingestion_job(self.db, 0.9, START, END, incremental_clustering=True)
+        self.assertTrue(created)
+        self.assertNotEqual(job.id, poll.id)
+        self.assertFalse(job.due_only)
+        self.assertIsNone(claim_ingestion_job(self.db, "worker-b"))
+
+        poll.status = "COMPLETED"
+        self.db.commit()
+        self.assertEqual(claim_ingestion_job(self.db, "worker-b").id, job.id)
+
+    def test_claim_takes_each_job_once(self):
+        job, _ = self._enqueue()
+        claimed = claim_ingestion_job(self.db, "worker-a")
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual((claimed.claimed_by, claimed.attempts), ("worker-a", 1))
+        self.assertIsNone(claim_ingestion_job(self.db, "worker-b"))
+
+    def test_claim_locks_with_skip_locked(self):
+        statements = []
+        event.listen(self.db, "do_orm_execute", lambda state: statements.append(state.statement))
+        self._enqueue()
+        claim_ingestion_job(self.db, "worker-a")
+
+        compiled = [str(s.compile(dialect=postgresql.dialect())) for s in statements]
+        self.assertTrue(any("FOR UPDATE SKIP LOCKED" in sql for sql in compiled), compiled)
+
+    def test_stale_jobs_are_requeued_then_failed(self):
+        job, _ = self._enqueue()
+        claim_ingestion_job(self.db, "worker-a")
+        self.assertEqual(recover_stale_ingestion_jobs(self.db, stale_after_seconds=60, max_attempts=2), 0)
+
+        job.heartbeat_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        self.db.commit()
+        self.assertEqual(recover_stale_ingestion_jobs(self.db, stale_after_seconds=60, max_attempts=2), 1)
+        self.db.refresh(job)
+        self.assertEqual((job.status, job.claimed_by), ("RUNNING", None))
+
+        claim_ingestion_job(self.db, "worker-b")
+        job.heartbeat_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        self.db.commit()
+        recover_stale_ingestion_jobs(self.db, stale_after_seconds=60, max_attempts=2)
+        self.db.refresh(job)
+        self.assertEqual(job.status, "FAILED")
+        self.assertIn("worker-b", job.error)
+
+    def _add_tasks(self, job, count):
+        for source_id in range(1, count + 1):
+            self.db.add(Source(id=source_id, name=f"S{source_id}", feed_url=f"https://s{source_id}.example/feed"))
+            self.db.add(
+                IngestionFetchTask(job_id=job.id, source_id=source_id, feed_url=f"https://s{source_id}.example/feed")
+            )
+        self.db.commit()
+
+    def test_fetch_tasks_are_shared_between_workers(self):
+        job, _ = self._enqueue()
+        self._add_tasks(job, 5)
+
+        first = claim_fetch_tasks(self.db, "worker-a", limit=3)
+        second = claim_fetch_tasks(self.db, "worker-b", limit=3)
+        self.assertEqual([t.source_id for t in first], [1, 2, 3])
+        self.assertEqual([t.source_id for t in second], [4, 5])
+        self.assertEqual(claim_fetch_tasks(self.db, "worker-c", limit=3), [])
+
+        self.db.query(IngestionFetchTask).filter(IngestionFetchTask.source_id == 1).update(
+            {"status": "DONE", "item_count": 7, "inserted_count": 4, "existing_count": 3}
+        )
+        self.db.commit()
+        progress = fetch_task_progress(self.db, job.id)
+        self.assertEqual((progress.total, progress.done, progress.claimed, progress.item_count), (5, 1, 4, 7))
+        self.assertFalse(progress.finished)
+
+    def test_tasks_of_a_quiet_worker_return_to_pending(self):
+        job, _ = self._enqueue()
+        self._add_tasks(job, 2)
+        claim_fetch_tasks(self.db, "worker-a", limit=1)
+        claim_fetch_tasks(self.db, "worker-b", limit=1)
+
+        self.db.query(IngestionFetchTask).update({"heartbeat_at": datetime.now(timezone.utc) - timedelta(minutes=5)})
+        self.db.commit()
+        heartbeat_worker(self.db, "worker-b")
+        recover_stale_ingestion_jobs(self.db, stale_after_seconds=60)
+
+        statuses = dict(self.db.query(IngestionFetchTask.source_id, IngestionFetchTask.status).all())
+        self.assertEqual(statuses, {1: "PENDING", 2: "CLAIMED"})
+        self.assertEqual([t.source_id for t in claim_fetch_tasks(self.db, "worker-c", limit=5)], [1])
+
+    def test_failed_batch_hands_unfinished_tasks_back(self):
+        job, _ = self._enqueue()
+        self._add_tasks(job, 3)
+
+        def fetch(sources, **kwargs):
+            for source in sources:
+                item = {"url": f"https://s{source['id']}.example/a", "title": "A"}
+                yield source, FeedFetchResult(status=FETCH_OK, items=[item])
+
+        def insert_failing_on_source_2(db, rows):
+            if rows[0]["source_id"] == 2:
+                raise RuntimeError("database went away")
+            return insert_article_batch(db, rows)
+
+        with (
+            mock.patch.object(fetch_tasks, "fetch_feeds_concurrently", fetch),
+            mock.patch.object(fetch_tasks, "feed_parse_pool", lambda: None),
+        ):
+            with mock.patch.object(fetch_tasks, "insert_article_batch", insert_failing_on_source_2):
+                with self.assertRaises(RuntimeError):
+                    run_fetch_tasks(self.db, "helper", claim_fetch_tasks(self.db, "helper", limit=3))
+
+            tasks = {t.source_id: (t.status, t.claimed_by) for t in self.db.query(IngestionFetchTask)}
+            self.assertEqual(tasks, {1: ("DONE", "helper"), 2: ("PENDING", None), 3: ("PENDING", None)})
+
+            retried = claim_fetch_tasks(self.db, "coordinator", limit=3, job_id=job.id)
+            self.assertEqual(run_fetch_tasks(self.db, "coordinator", retried), 2)
+        self.assertTrue(fetch_task_progress(self.db, job.id).finished)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.ingestion_job import IngestionJob
+from app.models.ingestion_job_phase import IngestionJobPhase
+from app.services.ingest.phase_metrics import estimate_eta_seconds, historical_phase_seconds, recent_phase_metrics
+from app.services.ingest.progress import JobProgress
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class JobProgressTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[IngestionJob.__table__, IngestionJobPhase.__table__])
+        self.Session = sessionmaker(bind=self.engine)
+        self.job_id = uuid4()
+        with self.Session() as db:
+            db.add(IngestionJob(id=self.job_id, status="RUNNING"))
+            db.commit()
+
+        self.updates = 0
+
+        def count(_conn, _cursor, statement, *_args):
+            if statement.startswith("UPDATE ingestion_job"):
+                self.updates += 1
+
+        event.listen(self.engine, "before_cursor_execute", count)
+        self.clock = _Clock()
+        self.progress = JobProgress(self.job_id, session_factory=self.Session, flush_seconds=5, clock=self.clock)
+
+    def _row(self):
+        with self.Session() as db:
+            job = db.get(IngestionJob, self.job_id)
+            return job.progress_percent, job.processed_items
+
+    def test_writes_are_throttled_but_snapshot_is_current(self):
+        for done in range(1, 51):
+            self.progress.update("DISCOVERING_FEEDS", done, processed_items=done)
+        self.assertEqual(self.updates, 1)
+        self.assertEqual(self._row(), (1, 1))
+        self.assertEqual(self.progress.snapshot.processed_items, 50)
+
+        self.clock.now = 5
+        self.progress.update("DISCOVERING_FEEDS", 51, processed_items=51)
+        self.assertEqual((self.updates, self._row()), (2, (51, 51)))
+
+    def test_phase_changes_are_written_immediately(self):
+        self.progress.update("DISCOVERING_FEEDS", 10, processed_items=3)
+        self.progress.update("IMPORTING_ITEMS", 90, processed_items=40, total_items=40)
+        self.assertEqual(self.updates, 2)
+        self.assertEqual(self._row(), (90, 40))
+
+    def test_phases_are_timed_and_recorded(self):
+        self.progress.history = {"CLUSTERING": 30.0, "SCORING": 10.0}
+        self.progress.update("DISCOVERING_FEEDS", 0, processed_items=0, total_items=20)
+        self.clock.now = 10
+        self.progress.update("DISCOVERING_FEEDS", 30, processed_items=5, total_items=20, row_count=400)
+        # 15 feeds left at 0.5 feeds/s, then clustering and scoring as long as they usually take.
+        self.assertEqual(self.progress.snapshot.eta_seconds, 30 + 30 + 10)
+
+        self.clock.now = 40
+        self.progress.update("IMPORTING_ITEMS", 90, processed_items=400, total_items=400)
+        self.progress.update("CLUSTERING", 90)
+        self.assertEqual(self.progress.snapshot.eta_seconds, 40)
+        self.clock.now = 52
+        self.progress.finish()
+
+        with self.Session() as db:
+            job = db.get(IngestionJob, self.job_id)
+            self.assertEqual((job.phase, job.eta_seconds), ("CLUSTERING", 0))
+            metrics = recent_phase_metrics(db, job_id=self.job_id)
+        self.assertEqual([m["phase"] for m in metrics], ["DISCOVERING_FEEDS", "CLUSTERING"])
+        fetch = metrics[0]
+        self.assertEqual((fetch["duration_seconds"], fetch["processed_items"], fetch["row_count"]), (40, 5, 400))
+        self.assertEqual((fetch["items_per_second"], fetch["rows_per_second"]), (5 / 40, 10.0))
+        self.assertEqual(metrics[1]["duration_seconds"], 12)
+
+
+class PhaseHistoryTests(unittest.TestCase):
+    def test_history_uses_median_of_recent_completed_runs_of_the_same_kind(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[IngestionJob.__table__, IngestionJobPhase.__table__])
+        db = sessionmaker(bind=engine)()
+        start = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        runs = [
+            ("COMPLETED", False, 10.0),
+            ("COMPLETED", False, 20.0),
+            ("COMPLETED", False, 90.0),
+            ("FAILED", False, 500.0),
+            ("COMPLETED", True, 1.0),
+        ]
+        for n, (status, due_only, seconds) in enumerate(runs):
+            job_id = uuid4()
+            started = start + timedelta(hours=n)
+            db.add(IngestionJob(id=job_id, status=status, due_only=due_only, started_at=started))
+            db.add(
+                IngestionJobPhase(
+                    job_id=job_id,
+                    phase="CLUSTERING",
+                    started_at=started,
+                    finished_at=started + timedelta(seconds=seconds),
+                    duration_seconds=seconds,
+                    processed_items=1,
+                )
+            )
+        db.commit()
+
+        self.assertEqual(historical_phase_seconds(db), {"CLUSTERING": 20.0})
+        self.assertEqual(historical_phase_seconds(db, runs=2), {"CLUSTERING": 55.0})
+        self.assertEqual(historical_phase_seconds(db, due_only=True), {"CLUSTERING": 1.0})
+        db.close()
+
+    def test_eta_is_unknown_without_rate_or_history(self):
+        self.assertIsNone(estimate_eta_seconds("CLUSTERING", 5, 0, None, {}))
+        self.assertEqual(estimate_eta_seconds("SCORING", 50, 0, None, {"SCORING": 20}), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
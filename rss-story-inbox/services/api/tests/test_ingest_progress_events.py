@@ -0,0 +1,44 @@
+import asyncio
+import unittest
+
+from app.services.ingest.progress_events import SUBSCRIBER_QUEUE_SIZE, IngestionEventBroadcaster
+
+
+class IngestionEventBroadcasterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_each_change_is_loaded_once_and_sent_to_every_subscriber(self):
+        loads = []
+
+        def load_status(job_id):
+            loads.append(job_id)
+            return {"job_id": job_id, "status": "RUNNING"}
+
+        broadcaster = IngestionEventBroadcaster("postgresql://unused", load_status)
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        await asyncio.to_thread(broadcaster.dispatch, "job-1")
+
+        self.assertEqual(loads, ["job-1"])
+        for queue in (first, second):
+            self.assertEqual(await asyncio.wait_for(queue.get(), 1), {"job_id": "job-1", "status": "RUNNING"})
+
+        broadcaster.unsubscribe(second)
+        await asyncio.to_thread(broadcaster.dispatch, "job-1")
+        await asyncio.sleep(0)
+        self.assertEqual((first.qsize(), second.qsize()), (1, 0))
+
+    async def test_slow_subscribers_keep_only_the_latest_updates(self):
+        broadcaster = IngestionEventBroadcaster("postgresql://unused", lambda job_id: {"job_id": job_id})
+        queue = broadcaster.subscribe()
+        for n in range(SUBSCRIBER_QUEUE_SIZE + 5):
+            broadcaster.dispatch(str(n))
+        await asyncio.sleep(0)
+
+        self.assertEqual(queue.qsize(), SUBSCRIBER_QUEUE_SIZE)
+        self.assertEqual(queue.get_nowait(), {"job_id": "5"})
+
+    def test_nothing_is_loaded_without_subscribers(self):
+        broadcaster = IngestionEventBroadcaster("postgresql://unused", lambda job_id: self.fail("loaded"))
+        broadcaster.dispatch("job-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
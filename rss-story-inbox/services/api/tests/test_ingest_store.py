@@ -0,0 +1,62 @@
+import unittest
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.ingest.store import insert_article_batch, iter_batches
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class _RecordingSession:
+    """Pretends every URL in ``existing_urls`` is already stored."""
+
+    def __init__(self, existing_urls: set[str]):
+        self.existing_urls = existing_urls
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        urls = [value for key, value in params.items() if key.startswith("url")]
+        return _Result([(i, url) for i, url in enumerate(urls, start=1) if url not in self.existing_urls])
+
+
+def _row(url: str) -> dict:
+    return {"source_id": 1, "url": url, "title": url, "raw_excerpt": None, "published_at": None, "status": "INBOX"}
+
+
+class InsertArticleBatchTests(unittest.TestCase):
+    def test_single_statement_reports_new_and_existing(self):
+        db = _RecordingSession(existing_urls={"https://a.example/2"})
+        result = insert_article_batch(
+            db,
+            [_row("https://a.example/1"), _row("https://a.example/2"), _row("https://a.example/1")],
+        )
+
+        self.assertEqual(len(db.statements), 1)
+        sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+        self.assertIn("ON CONFLICT (url) DO NOTHING", sql)
+        self.assertIn("RETURNING articles.id, articles.url", sql)
+        self.assertEqual(result.inserted_count, 1)
+        self.assertEqual(result.existing_count, 2)
+        self.assertEqual(result.inserted[0][1], "https://a.example/1")
+
+    def test_empty_batch_does_not_hit_database(self):
+        db = _RecordingSession(existing_urls=set())
+        result = insert_article_batch(db, [])
+        self.assertEqual(db.statements, [])
+        self.assertEqual((result.inserted_count, result.existing_count), (0, 0))
+
+    def test_iter_batches_splits_rows(self):
+        rows = [_row(f"https://a.example/{i}") for i in range(5)]
+        self.assertEqual([len(batch) for batch in iter_batches(rows, batch_size=2)], [2, 2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.metrics import DatabasePoolCollector
+from app.services.ingest.fetch_rss import FETCH_OK, FeedFetchResult
+from app.services.ingest.fetch_tasks import _record_fetch_metrics
+
+
+def _sample(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+class MetricsTests(unittest.TestCase):
+    def test_fetch_outcomes_are_counted(self):
+        before = (
+            _sample("rss_feed_fetch_seconds_count", {"status": FETCH_OK}),
+            _sample("rss_feed_fetch_bytes_sum"),
+            _sample("rss_feed_items_parsed_total"),
+            _sample("rss_article_inserts_total", {"result": "inserted"}),
+            _sample("rss_article_inserts_total", {"result": "existing"}),
+        )
+        result = FeedFetchResult(status=FETCH_OK, items=[{}, {}, {}], elapsed_seconds=0.3, body_bytes=2048)
+        _record_fetch_metrics(result, inserted_count=2, existing_count=1)
+
+        after = (
+            _sample("rss_feed_fetch_seconds_count", {"status": FETCH_OK}),
+            _sample("rss_feed_fetch_bytes_sum"),
+            _sample("rss_feed_items_parsed_total"),
+            _sample("rss_article_inserts_total", {"result": "inserted"}),
+            _sample("rss_article_inserts_total", {"result": "existing"}),
+        )
+        self.assertEqual([a - b for a, b in zip(after, before)], [1, 2048, 3, 2, 1])
+
+    def test_pool_collector_reports_checked_out_connections(self):
+        engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=3)
+        registry = CollectorRegistry()
+        registry.register(DatabasePoolCollector(engine))
+        with engine.connect():
+            self.assertEqual(registry.get_sample_value("rss_db_pool_checked_out"), 1)
+            self.assertEqual(registry.get_sample_value("rss_db_pool_size"), 3)
+        self.assertIn(b"rss_db_pool_checked_out 0.0", generate_latest(registry))
+
+    def test_pool_collector_skips_pools_without_queue_stats(self):
+        registry = CollectorRegistry()
+        registry.register(DatabasePoolCollector(create_engine("sqlite://")))
+        self.assertNotIn(b"rss_db_pool", generate_latest(registry))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.base import Base
+from app.models.source import Source
+from app.models.source_fetch_state import SourceFetchState
+from app.services.ingest.poll_schedule import due_source_ids, observed_publish_rate, plan_next_poll
+
+NOW = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class PollScheduleTests(unittest.TestCase):
+    def test_rate_from_new_items_since_last_fetch(self):
+        self.assertEqual(observed_publish_rate([], 6, NOW - timedelta(hours=3), NOW), 2.0)
+
+    def test_first_fetch_rate_from_dated_items(self):
+        items = [{"published_at": NOW - timedelta(hours=h)} for h in (1, 5, 10)]
+        items.append({"published_at": NOW - timedelta(days=30)})
+        items.append({"published_at": None})
+        self.assertAlmostEqual(observed_publish_rate(items, 5, None, NOW), 3 / 10)
+        self.assertIsNone(observed_publish_rate([{"published_at": None}], 1, None, NOW))
+
+    def test_busy_feeds_poll_often_and_quiet_ones_rarely(self):
+        rng = random.Random(7)
+        min_seconds = settings.ingest_poll_min_interval_minutes * 60
+        max_seconds = settings.ingest_poll_max_interval_minutes * 60
+
+        busy = plan_next_poll(None, 100.0, NOW, rng=rng)
+        quiet = plan_next_poll(None, 0.0, NOW, rng=rng)
+        middling = plan_next_poll(None, 1.0, NOW, rng=rng)
+        self.assertEqual(busy.poll_interval_seconds, min_seconds)
+        self.assertEqual(quiet.poll_interval_seconds, max_seconds)
+        self.assertEqual(middling.poll_interval_seconds, int(settings.ingest_poll_target_items * 3600))
+
+        for schedule in (busy, quiet, middling):
+            delay = (schedule.next_due_at - NOW).total_seconds()
+            self.assertGreaterEqual(delay, schedule.poll_interval_seconds * 0.85 - 1)
+            self.assertLessEqual(delay, schedule.poll_interval_seconds * 1.15 + 1)
+
+    def test_rate_is_smoothed_and_kept_without_observation(self):
+        self.assertAlmostEqual(plan_next_poll(10.0, 0.0, NOW).publish_rate_per_hour, 7.0)
+        self.assertEqual(plan_next_poll(4.0, None, NOW).publish_rate_per_hour, 4.0)
+
+    def test_due_sources(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[Source.__table__, SourceFetchState.__table__])
+        db = sessionmaker(bind=engine)()
+        db.add_all([Source(id=i, name=f"S{i}", feed_url=f"https://s{i}.example/feed") for i in (1, 2, 3)])
+        db.add_all(
+            [
+                SourceFetchState(source_id=1, next_due_at=NOW + timedelta(minutes=5)),
+                SourceFetchState(source_id=2, next_due_at=NOW - timedelta(minutes=5)),
+            ]
+        )
+        db.commit()
+        self.assertEqual(due_source_ids(db, [3, 2, 1], now=NOW), [3, 2])
+        db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
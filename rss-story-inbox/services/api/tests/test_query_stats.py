@@ -0,0 +1,134 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateTable
+
+from app.core.config import settings
+from app.core.query_stats import QueryStatsMiddleware, install_query_hooks, max_queries, track_queries
+from app.models.article import Article
+from app.models.base import Base
+from app.models.cluster import Cluster
+from app.models.profile import Profile
+from app.models.review_queue import ReviewQueueEntry
+from app.models.source import Source
+
+# Route modules build the app's engine at import; requests below use a session of the test's own.
+with mock.patch.object(settings, "database_url", settings.database_url or "sqlite://"):
+    from app.api.routes import queue
+    from app.core.db import get_db
+
+
+class QueryStatsTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        install_query_hooks(self.engine)
+        self.saved = (settings.query_stats_headers, settings.slow_query_ms)
+
+    def tearDown(self):
+        settings.query_stats_headers, settings.slow_query_ms = self.saved
+
+    def _run(self, count: int):
+        with self.engine.connect() as conn:
+            for _ in range(count):
+                conn.execute(text("SELECT 1"))
+
+    def test_counts_statements_per_request_and_reports_them_in_headers(self):
+        settings.query_stats_headers = True
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+
+        @app.get("/items/{item_id}")
+        def item(item_id: int):
+            self._run(3)
+            return {"id": item_id}
+
+        response = TestClient(app).get("/items/1")
+        self.assertEqual(response.headers["X-Query-Count"], "3")
+        self.assertRegex(response.headers["Server-Timing"], r'^db;dur=[\d.]+;desc="3 queries"$')
+
+    def test_budget_failure_lists_the_statements(self):
+        with max_queries(2):
+            self._run(2)
+        with self.assertRaises(AssertionError) as raised:
+            with max_queries(2):
+                self._run(3)
+        self.assertIn("ran 3", str(raised.exception))
+        self.assertIn("3. SELECT 1", str(raised.exception))
+
+    def test_slow_statements_are_logged_with_their_route(self):
+        settings.slow_query_ms = 0.000001
+        with self.assertLogs("uvicorn.error", level="WARNING") as logs:
+            with track_queries({"path": "/queue/next"}):
+                self._run(1)
+        self.assertIn("on /queue/next: SELECT 1", logs.output[0])
+
+    def test_outer_budget_sees_statements_of_the_request_tracker(self):
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+
+        @app.get("/items")
+        def items():
+            self._run(5)
+            return []
+
+        with max_queries(100) as stats:
+            TestClient(app).get("/items")
+        self.assertEqual(stats.count, 5)
+
+
+class QueueEndpointQueryBudgetTests(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        install_query_hooks(engine)
+        tables = [Source.__table__, Profile.__table__, Cluster.__table__, Article.__table__]
+        Base.metadata.create_all(engine, tables=tables)
+        # SQLite cannot build the NULLS FIRST order index; the table alone is enough here.
+        with engine.begin() as conn:
+            conn.execute(CreateTable(ReviewQueueEntry.__table__))
+        Session = sessionmaker(bind=engine)
+
+        now = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        with Session() as db:
+            db.add_all([Source(id=i, name=f"S{i}", feed_url=f"https://s{i}.example/feed") for i in (1, 2)])
+            for cluster_id in range(1, 9):
+                db.add(Cluster(id=cluster_id, cluster_title=f"Story {cluster_id}", score=cluster_id))
+                for source_id in (1, 2):
+                    db.add(
+                        Article(
+                            source_id=source_id,
+                            cluster_id=cluster_id,
+                            url=f"https://s{source_id}.example/{cluster_id}",
+                            title=f"Story {cluster_id}",
+                            published_at=now - timedelta(hours=cluster_id),
+                            status="INBOX",
+                        )
+                    )
+                db.add(ReviewQueueEntry(cluster_id=cluster_id, inbox_count=2, score=cluster_id))
+            db.commit()
+
+        def session():
+            with Session() as db:
+                yield db
+
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+        app.include_router(queue.router)
+        app.dependency_overrides[get_db] = session
+        self.client = TestClient(app)
+
+    def test_queue_page_runs_a_fixed_number_of_statements(self):
+        for limit in (1, 8):
+            # The page, its members, their source names and the profile, whatever the page size.
+            with max_queries(4):
+                response = self.client.get(f"/queue/page?limit={limit}")
+            self.assertEqual(len(response.json()["items"]), limit)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,16 @@
 import unittest
+from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.article import Article
+from app.models.base import Base
+from app.models.cluster import Cluster
+from app.models.profile import Profile
+from app.models.source import Source
 from app.services.rank.relevance import cluster_relevance_from_articles
+from app.services.rank.scorer import score_clusters
 
 
 class RankScorerTests(unittest.TestCase):
@@ -15,5 +25,46 @@ class RankScorerTests(unittest.TestCase):
         self.assertLess(with_negative, mostly_positive)
 
 
+class ScoreClustersTests(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        tables = [Source.__table__, Cluster.__table__, Article.__table__, Profile.__table__]
+        Base.metadata.create_all(engine, tables=tables)
+        self.db = sessionmaker(bind=engine)()
+        self.now = datetime.now(timezone.utc)
+        self.db.add(Profile(audience_text="", tone_text="", include_terms="", include_terms_2="", exclude_terms=""))
+        self.db.add_all(
+            [
+                Cluster(id=1, cluster_title="Fresh", coverage_count=3, latest_published_at=self.now, score=-1.0),
+                Cluster(id=2, cluster_title="Old", coverage_count=2, latest_published_at=self.now - timedelta(days=9), score=-1.0),
+                Cluster(id=3, cluster_title="Touched", coverage_count=1, latest_published_at=None, score=-1.0),
+            ]
+        )
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _scores(self) -> dict[int, float]:
+        return {c.id: c.score for c in self.db.query(Cluster).all()}
+
+    def test_scores_only_touched_and_window_clusters(self):
+        scored = score_clusters(
+            self.db,
+            cluster_ids={3},
+            start_datetime=self.now - timedelta(days=2),
+            end_datetime=self.now + timedelta(minutes=1),
+        )
+        scores = self._scores()
+        self.assertEqual(sorted(scored), [1, 3])
+        self.assertAlmostEqual(scores[1], 35.0, places=2)
+        self.assertEqual(scores[2], -1.0)
+        self.assertEqual(scores[3], 10.0)
+
+    def test_without_scope_scores_everything(self):
+        self.assertEqual(sorted(score_clusters(self.db)), [1, 2, 3])
+        self.assertEqual(self._scores()[2], 20.0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from app.models.base import Base
+from app.models.article import Article
+from app.models.cluster import Cluster
+from app.models.review_queue import ReviewQueueEntry
+from app.models.source import Source
+from app.services import review_queue
+from app.services.review_queue import QueueCursor, queued_cluster_page, refresh_review_queue
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+
+
+class RefreshReviewQueueTests(unittest.TestCase):
+    def test_upserts_counts_then_drops_clusters_without_inbox(self):
+        db = _RecordingSession()
+        refresh_review_queue(db, [3, None, 1, 3])
+
+        upsert, prune = db.statements
+        self.assertIn("INSERT INTO review_queue (cluster_id, inbox_count, score, latest_published_at)", upsert)
+        self.assertIn("count(*)", upsert)
+        self.assertIn("articles.status = %(status_1)s", upsert)
+        self.assertIn("ON CONFLICT (cluster_id) DO UPDATE", upsert)
+        self.assertIn("DELETE FROM review_queue", prune)
+        self.assertIn("NOT (EXISTS", prune)
+
+    def test_no_ids_is_a_no_op(self):
+        db = _RecordingSession()
+        refresh_review_queue(db, [])
+        self.assertEqual(db.statements, [])
+
+    def test_large_refreshes_are_batched(self):
+        db = _RecordingSession()
+        original = review_queue.REVIEW_QUEUE_REFRESH_BATCH_SIZE
+        review_queue.REVIEW_QUEUE_REFRESH_BATCH_SIZE = 2
+        try:
+            refresh_review_queue(db, range(1, 6))
+        finally:
+            review_queue.REVIEW_QUEUE_REFRESH_BATCH_SIZE = original
+        self.assertEqual(len(db.statements), 6)
+
+
+class QueuedClusterPageTests(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[Source.__table__, Cluster.__table__, Article.__table__])
+        # SQLite cannot build the NULLS FIRST order index; the table alone is enough here.
+        with engine.begin() as conn:
+            conn.execute(CreateTable(ReviewQueueEntry.__table__))
+        self.db = sessionmaker(bind=engine)()
+        keys = [
+            (1, 5.0, datetime(2024, 5, 1, 9)),
+            (2, 5.0, datetime(2024, 5, 1, 9)),
+            (3, 5.0, None),
+            (4, 7.0, None),
+            (5, 5.0, datetime(2024, 5, 1, 12)),
+            (6, 1.0, datetime(2024, 5, 2, 0)),
+            (7, 5.0, None),
+        ]
+        for cluster_id, score, latest in keys:
+            self.db.add(Cluster(id=cluster_id, cluster_title=f"c{cluster_id}", score=score))
+            self.db.add(
+                ReviewQueueEntry(cluster_id=cluster_id, inbox_count=1, score=score, latest_published_at=latest)
+            )
+        self.db.commit()
+
+    def _walk(self, limit):
+        seen, cursor = [], None
+        while True:
+            clusters, cursor = queued_cluster_page(self.db, limit=limit, after=cursor)
+            seen.extend(c.id for c in clusters)
+            if cursor is None:
+                return seen
+            cursor = QueueCursor.decode(cursor.encode())
+
+    def test_pages_follow_review_order(self):
+        expected = [4, 7, 3, 5, 2, 1, 6]
+        for limit in (1, 2, 3, 7, 10):
+            self.assertEqual(self._walk(limit), expected)
+
+    def test_cursor_survives_removal_of_earlier_clusters(self):
+        first, cursor = queued_cluster_page(self.db, limit=3)
+        self.assertEqual([c.id for c in first], [4, 7, 3])
+        self.db.query(ReviewQueueEntry).filter(ReviewQueueEntry.cluster_id.in_([4, 3])).delete()
+        self.db.commit()
+
+        rest, cursor = queued_cluster_page(self.db, limit=3, after=cursor)
+        self.assertEqual([c.id for c in rest], [5, 2, 1])
+        rest, cursor = queued_cluster_page(self.db, limit=3, after=cursor)
+        self.assertEqual([c.id for c in rest], [6])
+        self.assertIsNone(cursor)
+
+    def test_rejects_malformed_cursor(self):
+        for raw in ("", "not-a-cursor", QueueCursor(1.0, None, 1).encode()[:-4]):
+            with self.assertRaises(ValueError):
+                QueueCursor.decode(raw)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.base import Base
+from app.models.source import Source
+from app.models.source_fetch_state import SourceFetchState
+from app.services.ingest.fetch_rss import FETCH_ERROR, FETCH_NOT_MODIFIED, FeedFetchResult
+from app.services.ingest.source_health import (
+    backoff_delay,
+    blocked_source_ids,
+    fetch_outcome_values,
+    list_source_health,
+    reset_source_health,
+)
+
+NOW = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class SourceHealthTests(unittest.TestCase):
+    def test_backoff_doubles_up_to_the_cap(self):
+        base = settings.ingest_source_backoff_base_minutes
+        self.assertEqual(backoff_delay(1), timedelta(minutes=base))
+        self.assertEqual(backoff_delay(3), timedelta(minutes=base * 4))
+        self.assertEqual(backoff_delay(40), timedelta(minutes=settings.ingest_source_backoff_max_minutes))
+
+    def test_failures_back_off_then_open_the_circuit(self):
+        failure = FeedFetchResult(status=FETCH_ERROR, http_status=503, error="HTTPStatusError", elapsed_seconds=0.25)
+        values = fetch_outcome_values(failure, previous_failures=1, now=NOW)
+        self.assertEqual(values["consecutive_failures"], 2)
+        self.assertEqual(values["backoff_until"], NOW + backoff_delay(2))
+        self.assertEqual((values["last_http_status"], values["last_latency_ms"]), (503, 250))
+        self.assertNotIn("disabled_at", values)
+
+        limit = settings.ingest_source_disable_after_failures
+        self.assertEqual(fetch_outcome_values(failure, previous_failures=limit - 1, now=NOW)["disabled_at"], NOW)
+
+    def test_success_clears_the_streak(self):
+        values = fetch_outcome_values(FeedFetchResult(status=FETCH_NOT_MODIFIED), previous_failures=4, now=NOW)
+        self.assertEqual((values["consecutive_failures"], values["backoff_until"]), (0, None))
+        self.assertEqual(values["last_success_at"], NOW)
+
+    def test_blocked_sources_and_health_listing(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[Source.__table__, SourceFetchState.__table__])
+        db = sessionmaker(bind=engine)()
+        db.add_all([Source(id=i, name=f"S{i}", feed_url=f"https://s{i}.example/feed") for i in (1, 2, 3, 4)])
+        future = datetime.now(timezone.utc) + timedelta(hours=1)
+        db.add_all(
+            [
+                SourceFetchState(source_id=1, last_status="OK", consecutive_failures=0),
+                SourceFetchState(source_id=2, last_status=FETCH_ERROR, consecutive_failures=2, backoff_until=future),
+                SourceFetchState(source_id=3, last_status=FETCH_ERROR, consecutive_failures=10, disabled_at=NOW),
+            ]
+        )
+        db.commit()
+
+        self.assertEqual(blocked_source_ids(db, [1, 2, 3, 4]), {2, 3})
+        health = {row["source_id"]: row["health"] for row in list_source_health(db)}
+        self.assertEqual(health, {1: "HEALTHY", 2: "BACKING_OFF", 3: "DISABLED", 4: "UNKNOWN"})
+
+        self.assertTrue(reset_source_health(db, 3))
+        db.commit()
+        self.assertEqual(blocked_source_ids(db, [1, 2, 3, 4]), {2})
+        db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
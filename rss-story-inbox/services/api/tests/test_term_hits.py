@@ -0,0 +1,93 @@
+import unittest
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.article import Article
+from app.models.base import Base
+from app.models.cluster import Cluster
+from app.models.profile import Profile
+from app.models.source import Source
+from app.services.filtering.term_hits import (
+    article_term_hits,
+    cluster_qualifying_terms,
+    current_term_matcher,
+    refresh_stale_term_hits,
+    snapshot_qualifying_terms,
+    term_hit_values,
+)
+from app.services.rank.scorer import score_clusters
+
+
+class TermHitsTests(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        tables = [Source.__table__, Cluster.__table__, Article.__table__, Profile.__table__]
+        Base.metadata.create_all(engine, tables=tables)
+        self.db = sessionmaker(bind=engine)()
+        self.profile = Profile(audience_text="", tone_text="", include_terms="ai", include_terms_2="", exclude_terms="")
+        self.db.add_all([Source(id=1, name="S", feed_url="https://s.example/feed"), self.profile])
+        self.db.add_all([Cluster(id=1, cluster_title="AI", coverage_count=1), Cluster(id=2, cluster_title="X")])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _add(self, article_id: int, cluster_id: int, title: str, content: str | None = None) -> Article:
+        matcher = current_term_matcher(self.db)
+        article = Article(
+            id=article_id,
+            source_id=1,
+            url=f"https://s.example/{article_id}",
+            title=title,
+            content_text=content,
+            published_at=datetime.now(timezone.utc),
+            cluster_id=cluster_id,
+            **term_hit_values(matcher, title, None, content),
+        )
+        self.db.add(article)
+        self.db.commit()
+        return article
+
+    def test_scoring_uses_stored_hits(self):
+        self._add(1, 1, "AI update")
+        self._add(2, 2, "Markets")
+        score_clusters(self.db)
+        scores = {c.id: c.score for c in self.db.query(Cluster).all()}
+        self.assertGreater(scores[1], scores[2])
+
+    def test_profile_change_refreshes_stale_hits(self):
+        article = self._add(1, 2, "Space launch", content="A long body about space")
+        matcher = current_term_matcher(self.db)
+        self.assertEqual(cluster_qualifying_terms(matcher, [article]), [])
+
+        self.profile.include_terms = "space"
+        self.db.commit()
+        matcher = current_term_matcher(self.db)
+        self.assertNotEqual(article.term_hits_version, matcher.version)
+        # Stale rows still answer correctly, computed from text.
+        self.assertEqual(cluster_qualifying_terms(matcher, [article]), ["space"])
+
+        self.assertEqual(refresh_stale_term_hits(self.db, matcher), 1)
+        self.db.commit()
+        self.db.refresh(article)
+        self.assertEqual(article.term_hits_version, matcher.version)
+        self.assertEqual(article_term_hits(matcher, article), {"title": [0], "content": [0]})
+        self.assertEqual(refresh_stale_term_hits(self.db, matcher), 0)
+
+    def test_snapshots_only_clusters_without_one(self):
+        self._add(1, 1, "AI update")
+        self._add(2, 2, "Markets")
+        self.db.query(Cluster).filter(Cluster.id == 2).update({"qualifying_terms_snapshot": '["kept"]'})
+        self.db.commit()
+
+        self.assertEqual(snapshot_qualifying_terms(self.db, [1, 2, 1]), 1)
+        self.db.commit()
+        snapshots = dict(self.db.query(Cluster.id, Cluster.qualifying_terms_snapshot).all())
+        self.assertEqual(snapshots, {1: '["ai"]', 2: '["kept"]'})
+        self.assertEqual(snapshot_qualifying_terms(self.db, [1, 2]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.article import Article
+from app.models.base import Base
+from app.models.cluster import Cluster
+from app.models.source import Source
+from app.services.workflow.cluster_status import transition_cluster, transition_clusters
+from app.services.workflow.transitions import promote_to_shortlist
+
+STATUSES = ["KEPT", "KEPT", "INBOX", "REJECTED", "KEPT"]
+
+
+class TransitionClusterTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[Source.__table__, Cluster.__table__, Article.__table__])
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add(Source(id=1, name="Source", feed_url="https://s.example/feed"))
+        self.db.add_all([Cluster(id=1, cluster_title="One"), Cluster(id=2, cluster_title="Two")])
+        for article_id, status in enumerate(STATUSES, start=1):
+            self.db.add(
+                Article(id=article_id, source_id=1, url=f"https://s.example/{article_id}", title="t", status=status, cluster_id=1)
+            )
+        self.db.add(Article(id=10, source_id=1, url="https://s.example/10", title="t", status="KEPT", cluster_id=2))
+        self.db.commit()
+
+        self.statements = 0
+
+        def count(*_args):
+            self.statements += 1
+
+        event.listen(self.engine, "before_cursor_execute", count)
+
+    def tearDown(self):
+        self.db.close()
+
+    def _statuses(self):
+        return dict(self.db.query(Article.id, Article.status).all())
+
+    def test_moves_only_rows_in_from_status_with_one_statement(self):
+        changed = transition_cluster(self.db, 1, "KEPT", promote_to_shortlist("KEPT"))
+        self.assertEqual(self.statements, 1)
+        self.db.commit()
+
+        self.assertEqual(changed, [1, 2, 5])
+        statuses = self._statuses()
+        self.assertEqual([statuses[i] for i in range(1, 6)], ["SHORTLIST", "SHORTLIST", "INBOX", "REJECTED", "SHORTLIST"])
+        self.assertEqual(statuses[10], "KEPT")
+
+        self.assertEqual(transition_cluster(self.db, 1, "KEPT", "SHORTLIST"), [])
+
+    def test_article_ids_narrow_the_update(self):
+        changed = transition_cluster(self.db, 1, ("KEPT", "REJECTED"), "INBOX", article_ids=[2, 3, 4, 10])
+        self.db.commit()
+        self.assertEqual(changed, [2, 4])
+        self.assertEqual(self._statuses()[10], "KEPT")
+
+    def test_moves_many_clusters_in_one_statement(self):
+        changed = transition_clusters(self.db, [2, 1, 3, 2], "KEPT", "REJECTED")
+        self.assertEqual(self.statements, 1)
+        self.assertEqual(changed, {2: [10], 1: [1, 2, 5], 3: []})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import Link from "next/link";
 import { useRouter } from "next/router";
 import { useEffect, useState } from "react";
-import { apiGet } from "../lib/api";
+import { apiEventSource, apiGet } from "../lib/api";
 
 type IngestionJob = {
   job_id: string;
@@ -70,13 +70,27 @@ export default function Layout({ children }: { children: React.ReactNode }) {
     };
 
     void syncIngestionStatus();
-    const interval = window.setInterval(() => {
+    let interval: number | undefined;
+    const events = apiEventSource("/admin/ingest/events", () => {
+      // Fall back to polling when the event stream stays unavailable.
+      interval = window.setInterval(() => {
+        void syncIngestionStatus();
+      }, 4000);
+    });
+    events.onmessage = (event) => {
+      const status = JSON.parse(event.data) as IngestionJob | null;
+      if (status?.status === "RUNNING") {
+        window.sessionStorage.setItem(LAST_RUNNING_JOB_STORAGE_KEY, status.job_id);
+        setCompletedJobId(null);
+        return;
+      }
       void syncIngestionStatus();
-    }, 4000);
+    };
 
     return () => {
       mounted = false;
-      window.clearInterval(interval);
+      events.close();
+      if (interval !== undefined) window.clearInterval(interval);
     };
   }, []);
 
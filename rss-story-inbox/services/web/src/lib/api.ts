@@ -44,6 +44,27 @@ export async function apiGet(path: string) {
   return fetchJson(`${API_BASE}${path}`);
 }
 
+const EVENT_STREAM_MAX_FAILURES = 3;
+
+// The browser reconnects the stream by itself after a dropped connection or an API restart.
+// `onUnavailable` runs once, after the stream is closed, when the server refuses the stream
+// or it fails several times in a row, so callers can fall back to polling.
+export function apiEventSource(path: string, onUnavailable: () => void) {
+  const events = new EventSource(`${API_BASE}${path}`);
+  let failures = 0;
+  events.addEventListener("open", () => {
+    failures = 0;
+  });
+  events.addEventListener("error", () => {
+    failures += 1;
+    if (events.readyState === EventSource.CLOSED || failures >= EVENT_STREAM_MAX_FAILURES) {
+      events.close();
+      onUnavailable();
+    }
+  });
+  return events;
+}
+
 export async function apiPost(path: string, body?: any) {
   return fetchJson(`${API_BASE}${path}`, {
     method: "POST",
@@ -1,5 +1,5 @@
 import { useEffect, useRef, useState } from "react";
-import { apiGet, apiPost } from "../lib/api";
+import { apiEventSource, apiGet, apiPost } from "../lib/api";
 import { Cluster } from "../lib/types";
 import StoryCard from "../components/StoryCard";
 import ActionButtons from "../components/ActionButtons";
@@ -345,11 +345,28 @@ export default function QueuePage() {
   useEffect(() => {
     if (!running || !ingestionJob?.job_id) return;
 
-    const interval = window.setInterval(() => {
-      void syncCurrentIngestionStatus({ jobId: ingestionJob.job_id });
-    }, 4000);
+    const jobId = ingestionJob.job_id;
+    let interval: number | undefined;
+    const events = apiEventSource(`/admin/ingest/events?job_id=${encodeURIComponent(jobId)}`, () => {
+      // Fall back to polling when the event stream stays unavailable.
+      interval = window.setInterval(() => {
+        void syncCurrentIngestionStatus({ jobId });
+      }, 4000);
+    });
+    events.onmessage = (event) => {
+      const status = JSON.parse(event.data) as IngestionJob | null;
+      if (!status) return;
+      setIngestionJob(status);
+      if (status.status !== "RUNNING") {
+        events.close();
+        void handleTerminalIngestionStatus(status);
+      }
+    };
 
-    return () => window.clearInterval(interval);
+    return () => {
+      events.close();
+      if (interval !== undefined) window.clearInterval(interval);
+    };
   }, [ingestionJob?.job_id, running]);
 
   useEffect(() => {
@@ -6,13 +6,18 @@ from apscheduler.schedulers.blocking import BlockingScheduler
 
 API_BASE = os.getenv("API_BASE_URL", "http://api:8000")
 
-def run_ingest():
+def run_ingest(due_only: bool = False):
     try:
-        r = requests.post(f"{API_BASE}/admin/ingest", timeout=300)
+        payload = {"due_only": True} if due_only else None
+        r = requests.post(f"{API_BASE}/admin/ingest", json=payload, timeout=300)
         print(datetime.utcnow().isoformat(), "ingest:", r.status_code, r.text[:300])
     except Exception as e:
         print("ingest failed:", e)
 
+def run_poll():
+    # Each tick only fetches the sources whose adaptive schedule is due.
+    run_ingest(due_only=True)
+
 def main():
     cmd = sys.argv[1] if len(sys.argv) > 1 else "run"
 
@@ -20,12 +25,11 @@ def main():
         run_ingest()
         return
 
-    hour = int(os.getenv("INGEST_HOUR_LOCAL", "2"))
-    minute = int(os.getenv("INGEST_MINUTE_LOCAL", "0"))
+    poll_minutes = int(os.getenv("INGEST_POLL_MINUTES", "5"))
 
     sched = BlockingScheduler()
-    sched.add_job(run_ingest, "cron", hour=hour, minute=minute)
-    print(f"Worker scheduler running. Ingest daily at {hour:02d}:{minute:02d}. API={API_BASE}")
+    sched.add_job(run_poll, "interval", minutes=poll_minutes, next_run_time=datetime.now())
+    print(f"Worker scheduler running. Polling due sources every {poll_minutes} minutes. API={API_BASE}")
     sched.start()
 
 if __name__ == "__main__":